@@ -0,0 +1,107 @@
+"""
+Logging module for Gold Jewelry Business Management System
+Configures leveled, queue-backed logging so log calls never block the UI thread on console I/O
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+
+# Overall level, e.g. GOLDAPP_LOG_LEVEL=DEBUG
+LOG_LEVEL_ENV = 'GOLDAPP_LOG_LEVEL'
+# Per-module overrides, e.g. GOLDAPP_LOG_LEVELS="multiple_sales=DEBUG,database=WARNING"
+MODULE_LEVELS_ENV = 'GOLDAPP_LOG_LEVELS'
+# Debug output is off unless asked for
+DEFAULT_LOG_LEVEL = logging.INFO
+LOG_FORMAT = '%(asctime)s %(levelname)-7s %(name)s: %(message)s'
+
+_listener = None
+_file_handlers = {}
+
+
+def get_logger(name):
+    """Logger for a module; pass __name__ (main.py run as a script logs as 'main')"""
+    return logging.getLogger('main' if name == '__main__' else name)
+
+
+def _parse_level(value, default=None):
+    if value is None or value == '':
+        return default
+    if isinstance(value, int):
+        return value
+    level = logging.getLevelName(str(value).strip().upper())
+    return level if isinstance(level, int) else default
+
+
+def parse_module_levels(spec):
+    """Parse "module=LEVEL,other=LEVEL" into {module: level}; unknown levels are ignored"""
+    levels = {}
+    for part in (spec or '').split(','):
+        name, _, value = part.partition('=')
+        level = _parse_level(value)
+        if name.strip() and level is not None:
+            levels[name.strip()] = level
+    return levels
+
+
+def configure_logging(level=None, module_levels=None, stream=None):
+    """Route all logging through a queue drained by a background listener thread.
+    level and module_levels default to the GOLDAPP_LOG_LEVEL / GOLDAPP_LOG_LEVELS
+    environment variables. Calling it again reconfigures. Returns the listener.
+    """
+    global _listener
+    shutdown_logging()
+
+    root = logging.getLogger()
+    root.setLevel(_parse_level(level, _parse_level(os.environ.get(LOG_LEVEL_ENV), DEFAULT_LOG_LEVEL)))
+    levels = parse_module_levels(os.environ.get(MODULE_LEVELS_ENV))
+    levels.update(module_levels or {})
+    for name, module_level in levels.items():
+        logging.getLogger(name).setLevel(module_level)
+
+    console = logging.StreamHandler(stream or sys.stderr)
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root.handlers = [h for h in root.handlers if not isinstance(h, logging.handlers.QueueHandler)]
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def add_rotating_file_handler(name, path, max_bytes, backup_count):
+    """Send a logger's records to a size-rotated file instead of the console.
+    The file is only created once something is logged. Idempotent per path.
+    """
+    path = os.path.abspath(path)
+    handler = _file_handlers.get(path)
+    if handler is None:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                       encoding='utf-8', delay=True)
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        _file_handlers[path] = handler
+        target = logging.getLogger(name)
+        target.addHandler(handler)
+        target.propagate = False
+    return handler
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            try:
+                handler.flush()
+            except Exception:
+                pass
+        _listener = None
+
+
+atexit.register(shutdown_logging)
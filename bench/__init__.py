@@ -0,0 +1,4 @@
+"""
+Benchmark suite for the Gold Jewelry Business Management System
+Synthetic datasets plus timed, memory-traced runs of the headless data paths (see `python -m bench --help`)
+"""
@@ -0,0 +1,56 @@
+"""
+Benchmark command line for the Gold Jewelry Business Management System
+
+    python -m bench --scale medium --save       # record a baseline
+    python -m bench --scale medium --compare    # measure against it
+"""
+
+import argparse
+import sys
+
+from app_logging import configure_logging
+from bench.datagen import DEFAULT_SEED, SCALES
+from bench.runner import DEFAULT_REPEATS, REGRESSION_THRESHOLD, compare, load_baseline, run_suite, save_baseline
+from bench.workloads import WORKLOADS
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bench', description='Run the headless data path benchmarks')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--repeats', type=int, default=DEFAULT_REPEATS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--only', action='append', choices=[name for name, _, _ in WORKLOADS],
+                        help='run just this workload (may be repeated)')
+    parser.add_argument('--save', action='store_true', help='write the results as the baseline for this scale')
+    parser.add_argument('--compare', action='store_true', help='compare the results with the saved baseline')
+    parser.add_argument('--baseline', help='baseline file (default: bench/baselines/baseline_<scale>.json)')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='slowdown reported as a regression (default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    configure_logging('WARNING')
+    print(f"Benchmarking scale '{args.scale}' ({args.repeats} runs per workload)")
+    report = run_suite(args.scale, args.repeats, args.seed, args.only)
+
+    regressed = False
+    if args.compare:
+        try:
+            baseline = load_baseline(args.scale, args.baseline)
+        except (OSError, ValueError) as e:
+            print(f"No baseline to compare with: {e}")
+            return 2
+        print(f"Compared with baseline recorded {baseline.get('recorded_at')}:")
+        for name, row in compare(report, baseline, args.threshold).items():
+            if row['baseline_ms'] is None:
+                print(f"  {name:<26}{row['median_ms']:>10.2f} ms  (new)")
+                continue
+            flag = '  REGRESSION' if row['regressed'] else ''
+            print(f"  {name:<26}{row['baseline_ms']:>10.2f} -> {row['median_ms']:.2f} ms ({row['change']:+.1%}){flag}")
+            regressed = regressed or row['regressed']
+    if args.save:
+        print(f"Baseline written to: {save_baseline(report, args.baseline)}")
+    return 1 if regressed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
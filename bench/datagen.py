@@ -0,0 +1,194 @@
+"""
+Synthetic data module for the Gold Jewelry Business Management System benchmarks
+Builds reproducible databases of realistic shape (items, suppliers, S/P ref_id groups,
+karigar and raini orders, work orders) at several scales
+"""
+
+import os
+import random
+from datetime import datetime, timedelta
+
+from database import DatabaseManager
+from services import RainiService
+
+# Row counts per scale. Lines per day are spread over a random number of S/P ref_id groups.
+SCALES = {
+    'small': {'items': 60, 'suppliers': 25, 'karigars': 8, 'days': 365, 'groups_per_day': 6,
+              'karigar_orders': 300, 'raini_orders': 200, 'work_orders': 300, 'inventory': 400},
+    'medium': {'items': 300, 'suppliers': 120, 'karigars': 25, 'days': 3 * 365, 'groups_per_day': 15,
+               'karigar_orders': 3000, 'raini_orders': 1500, 'work_orders': 2000, 'inventory': 3000},
+    'large': {'items': 1500, 'suppliers': 500, 'karigars': 60, 'days': 5 * 365, 'groups_per_day': 40,
+              'karigar_orders': 20000, 'raini_orders': 8000, 'work_orders': 10000, 'inventory': 15000},
+}
+DEFAULT_SEED = 20240101
+# Lines per S/P ref_id group (weights favour small groups, as in real use)
+GROUP_SIZES = (1, 1, 1, 2, 2, 3, 4, 6, 10)
+KARIGAR_LINES = (1, 2, 3, 5)
+FORMS = ('Chain', 'Saman', 'Sona')
+PURITIES = (75.0, 83.3, 91.6, 99.9)
+ITEM_WORDS = ('Ring', 'Chain', 'Bangle', 'Necklace', 'Earring', 'Pendant', 'Bracelet', 'Anklet', 'Nosepin', 'Coin')
+
+
+def _weights(rng):
+    """Gross, less, net, tunch %, wastage %, fine gold for one sale/purchase line"""
+    gross = round(rng.uniform(1.0, 80.0), 3)
+    less = round(gross * rng.uniform(0.0, 0.08), 3)
+    net = gross - less
+    tunch = rng.choice(PURITIES)
+    wastage = round(rng.uniform(0.5, 6.0), 2)
+    fine = (net / 100 * tunch) + (net / 100 * wastage)
+    return gross, less, net, tunch, wastage, fine
+
+
+def generate_dataset(db_path, scale='small', seed=DEFAULT_SEED, end_date=None):
+    """Create a database at db_path filled with synthetic data. The same scale, seed and
+    end_date always produce the same rows. Returns {table: rows inserted}.
+    """
+    spec = SCALES[scale]
+    rng = random.Random(seed)
+    end_date = end_date or datetime.now().replace(hour=18, minute=0, second=0, microsecond=0)
+    start_date = end_date - timedelta(days=spec['days'] - 1)
+    if os.path.exists(db_path):
+        os.remove(db_path)
+
+    db = DatabaseManager(db_path, slow_query_ms=0)
+    counts = {}
+    try:
+        with db.transaction() as conn:
+            items = [(f"{rng.choice(ITEM_WORDS)} {n:04d}", f"IT{n:05d}",
+                      'raini' if n % 25 == 0 else rng.choice(('gold', 'silver', 'ornament')), None)
+                     for n in range(1, spec['items'] + 1)]
+            conn.executemany("INSERT INTO items (item_name, item_code, category, description) VALUES (?, ?, ?, ?)", items)
+            item_ids = [row[0] for row in conn.execute("SELECT item_id FROM items ORDER BY item_id")]
+
+            suppliers = [f"Supplier {n:04d}" for n in range(1, spec['suppliers'] + 1)]
+            conn.executemany("INSERT INTO suppliers (supplier_name, phone, is_active, balance) VALUES (?, ?, 1, 0)",
+                             [(name, f"98{n:08d}") for n, name in enumerate(suppliers)])
+
+            karigars = [f"Karigar {n:03d}" for n in range(1, spec['karigars'] + 1)]
+            conn.executemany("INSERT INTO freelancers (full_name, phone, joined_date) VALUES (?, ?, ?)",
+                             [(name, f"99{n:08d}", start_date.strftime('%Y-%m-%d')) for n, name in enumerate(karigars)])
+            karigar_ids = [row[0] for row in conn.execute("SELECT freelancer_id FROM freelancers ORDER BY freelancer_id")]
+
+            # Sale / purchase lines, grouped under S/P ref_ids numbered per day like the app does
+            lines = []
+            stock = {}      # item_id -> [fine, net]
+            balances = {}   # supplier -> grams
+            for day in range(spec['days']):
+                date = start_date + timedelta(days=day)
+                date_str = date.strftime('%d%m%y')
+                seq = {'S': 0, 'P': 0}
+                for _ in range(max(1, int(rng.gauss(spec['groups_per_day'], spec['groups_per_day'] / 4)))):
+                    prefix = 'P' if rng.random() < 0.45 else 'S'
+                    seq[prefix] += 1
+                    ref_id = f"{prefix}{date_str}/{seq[prefix]:03d}"
+                    supplier = rng.choice(suppliers)
+                    stamp = (date + timedelta(minutes=rng.randint(0, 600) - 480)).strftime('%Y-%m-%d %H:%M:%S')
+                    sign = 1 if prefix == 'P' else -1
+                    for _ in range(rng.choice(GROUP_SIZES)):
+                        item_id = rng.choice(item_ids)
+                        gross, less, net, tunch, wastage, fine = _weights(rng)
+                        lines.append((ref_id, supplier, item_id, gross, less, net, tunch, wastage, fine, stamp))
+                        item_stock = stock.setdefault(item_id, [0.0, 0.0])
+                        item_stock[0] += sign * fine
+                        item_stock[1] += sign * net
+                        balances[supplier] = balances.get(supplier, 0.0) - sign * fine
+            conn.executemany('''
+                INSERT INTO sales (ref_id, supplier_name, item_id, gross_weight, less_weight,
+                                   net_weight, tunch_percentage, wastage_percentage, fine_gold, sale_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', lines)
+            # Keep the stored running totals consistent with the lines, as the app maintains them
+            conn.executemany("UPDATE items SET fine_weight = ?, net_weight = ? WHERE item_id = ?",
+                             [(fine, net, item_id) for item_id, (fine, net) in stock.items()])
+            conn.executemany("UPDATE suppliers SET balance = ? WHERE supplier_name = ?",
+                             [(grams, name) for name, grams in balances.items()])
+            counts['sales'] = len(lines)
+
+            # Karigar orders with issued / received detail lines
+            order_rows = 0
+            detail_rows = []
+            for n in range(spec['karigar_orders']):
+                created = start_date + timedelta(days=rng.randrange(spec['days']), minutes=rng.randrange(600))
+                karigar = rng.randrange(len(karigars))
+                issued = [(rng.choice(item_ids), round(rng.uniform(5, 120), 3)) for _ in range(rng.choice(KARIGAR_LINES))]
+                received = [(item_id, round(weight * rng.uniform(0.6, 1.0), 3))
+                            for item_id, weight in issued if rng.random() < 0.7]
+                issued_total = sum(w for _, w in issued)
+                received_total = sum(w for _, w in received)
+                status = 'in progress' if created > end_date - timedelta(days=90) and rng.random() < 0.6 else 'completed'
+                cursor = conn.execute('''
+                    INSERT INTO karigar_orders (ref_id, karigar_id, karigar_name, issued_total, received_total,
+                                                balance_total, status, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (f"KO{created.strftime('%d%m%y')}/{n % 1000 + 1:03d}", karigar_ids[karigar], karigars[karigar],
+                      issued_total, received_total, issued_total - received_total, status,
+                      created.strftime('%Y-%m-%d %H:%M:%S')))
+                order_rows += 1
+                stamp = created.strftime('%Y-%m-%d %H:%M:%S')
+                for direction, rows in (('issued', issued), ('received', received)):
+                    detail_rows.extend((cursor.lastrowid, item_id, f"Item {item_id}", direction, weight, stamp)
+                                       for item_id, weight in rows)
+            conn.executemany('''
+                INSERT INTO karigar_order_items (order_id, item_id, item_name, direction, weight, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', detail_rows)
+            counts['karigar_orders'] = order_rows
+            counts['karigar_order_items'] = len(detail_rows)
+
+            # Raini orders, the recent ones still pending
+            raini_rows = []
+            for _ in range(spec['raini_orders']):
+                created = start_date + timedelta(days=rng.randrange(spec['days']))
+                purity = rng.choice(PURITIES)
+                pure = round(rng.uniform(10, 500), 3)
+                total = pure / (purity / 100)
+                impurities = total - pure
+                copper_pct = rng.choice((0, 50, 70, 100))
+                silver_pct = 100 - copper_pct
+                pending = created > end_date - timedelta(days=30)
+                raini_rows.append((purity, pure, impurities, total, copper_pct, impurities * copper_pct / 100,
+                                   silver_pct, impurities * silver_pct / 100, created.strftime('%Y-%m-%d %H:%M:%S'),
+                                   'Pending' if pending else 'Completed', 0 if pending else round(total * rng.uniform(0.97, 1.0), 3)))
+            conn.executemany('''
+                INSERT INTO raini_orders (purity_percentage, pure_gold_weight, impurities_weight, total_weight,
+                                          copper_percentage, copper_weight, silver_percentage, silver_weight,
+                                          created_date, status, actual_weight)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', raini_rows)
+            # Written around RainiService, so its running totals are recomputed
+            RainiService(db).rebuild_totals(conn)
+            counts['raini_orders'] = len(raini_rows)
+
+            # Work orders and gold inventory (read by the reports)
+            work_rows = []
+            for _ in range(spec['work_orders']):
+                issued_on = start_date + timedelta(days=rng.randrange(spec['days']))
+                issued = round(rng.uniform(5, 200), 3)
+                completed = issued_on < end_date - timedelta(days=20) and rng.random() < 0.85
+                wastage = round(issued * rng.uniform(0.005, 0.04), 3) if completed else 0
+                work_rows.append((rng.choice(karigar_ids), rng.randint(1, 4), f"Design {rng.randint(1, 400)}", issued, issued,
+                                  issued * 0.97, issued_on.strftime('%Y-%m-%d'), 'completed' if completed else 'issued',
+                                  wastage, issued - wastage if completed else 0,
+                                  (issued_on + timedelta(days=rng.randint(3, 20))).strftime('%Y-%m-%d') if completed else None))
+            conn.executemany('''
+                INSERT INTO work_orders (freelancer_id, gold_type_id, jewelry_design, original_metal_weight,
+                                         gold_weight_issued, expected_final_weight, issue_date, status,
+                                         wastage_weight, final_jewelry_weight, completion_date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', work_rows)
+            counts['work_orders'] = len(work_rows)
+
+            inventory_rows = [(rng.randint(1, 4), round(rng.uniform(1, 250), 3), rng.choice(PURITIES), rng.choice(FORMS),
+                               (start_date + timedelta(days=rng.randrange(spec['days']))).strftime('%Y-%m-%d'),
+                               rng.choice(suppliers))
+                              for _ in range(spec['inventory'])]
+            conn.executemany('''
+                INSERT INTO gold_inventory (gold_type_id, weight_grams, purity_percentage, form, received_date, supplier_info)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', inventory_rows)
+            counts['gold_inventory'] = len(inventory_rows)
+        counts.update(items=len(items), suppliers=len(suppliers), freelancers=len(karigars))
+    finally:
+        db.close_connection()
+    return counts
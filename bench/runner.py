@@ -0,0 +1,133 @@
+"""
+Benchmark runner module for the Gold Jewelry Business Management System
+Times each workload (wall time and tracemalloc peak) and saves / compares JSON baselines
+"""
+
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from database import DatabaseManager
+from bench.datagen import DEFAULT_SEED, generate_dataset
+from bench.workloads import WORKLOADS, BenchContext
+
+# Timed runs per workload (after one traced warm-up run that measures peak memory)
+DEFAULT_REPEATS = 5
+# Baselines live next to this package unless a path is given
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+# Slowdown (median vs. baseline median) reported as a regression
+REGRESSION_THRESHOLD = 0.15
+
+
+def _time_workload(db_path, func, repeats, seed, fresh_copy):
+    """Run func(db, ctx) once under tracemalloc (warm-up and peak memory) and then `repeats`
+    untraced times; returns the timings in ms, the peak memory and the rows the workload touched."""
+    timings, peak, rows = [], 0, 0
+    for run in range(repeats + 1):
+        path = db_path
+        if fresh_copy:
+            path = f"{db_path}.run{run}.db"
+            shutil.copyfile(db_path, path)
+        db = DatabaseManager(path, slow_query_ms=0)
+        try:
+            ctx = BenchContext(db, seed)
+            if run == 0:
+                tracemalloc.start()
+                rows = func(db, ctx)
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+            else:
+                start = time.perf_counter()
+                func(db, ctx)
+                timings.append((time.perf_counter() - start) * 1000)
+        finally:
+            db.close_connection()
+            if fresh_copy:
+                for suffix in ('', '-wal', '-shm'):
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+    return {
+        'runs': repeats,
+        'median_ms': round(statistics.median(timings), 3),
+        'min_ms': round(min(timings), 3),
+        'max_ms': round(max(timings), 3),
+        'peak_kib': round(peak / 1024, 1),
+        'rows': rows,
+    }
+
+
+def run_suite(scale='small', repeats=DEFAULT_REPEATS, seed=DEFAULT_SEED, only=None, workdir=None):
+    """Generate a dataset at the given scale and time every workload (or those named in only).
+    Returns the results as a JSON-ready dict."""
+    own_dir = workdir is None
+    workdir = workdir or tempfile.mkdtemp(prefix='goldapp-bench-')
+    db_path = os.path.join(workdir, f"bench_{scale}.db")
+    try:
+        started = time.perf_counter()
+        counts = generate_dataset(db_path, scale, seed)
+        generate_ms = (time.perf_counter() - started) * 1000
+        results = {}
+        for name, writes, func in WORKLOADS:
+            if only and name not in only:
+                continue
+            results[name] = _time_workload(db_path, func, repeats, seed, fresh_copy=writes)
+            print(f"  {name:<26}{results[name]['median_ms']:>10.2f} ms  {results[name]['peak_kib']:>9.1f} KiB")
+    finally:
+        if own_dir:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        'scale': scale,
+        'seed': seed,
+        'python': sys.version.split()[0],
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'dataset': dict(counts, generate_ms=round(generate_ms, 1)),
+        'workloads': results,
+    }
+
+
+def baseline_path(scale, path=None):
+    return path or os.path.join(BASELINE_DIR, f"baseline_{scale}.json")
+
+
+def save_baseline(report, path=None):
+    path = baseline_path(report['scale'], path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    return path
+
+
+def load_baseline(scale, path=None):
+    with open(baseline_path(scale, path), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(report, baseline, threshold=REGRESSION_THRESHOLD):
+    """Per-workload change in median time and peak memory against a baseline.
+    Returns {name: {...}}; 'regressed' is set when the median slowed down by more than threshold."""
+    comparison = {}
+    for name, current in report['workloads'].items():
+        previous = baseline.get('workloads', {}).get(name)
+        if not previous:
+            comparison[name] = {'median_ms': current['median_ms'], 'baseline_ms': None, 'change': None, 'regressed': False}
+            continue
+        change = (current['median_ms'] - previous['median_ms']) / previous['median_ms'] if previous['median_ms'] else 0.0
+        comparison[name] = {
+            'median_ms': current['median_ms'],
+            'baseline_ms': previous['median_ms'],
+            'change': round(change, 4),
+            'peak_kib': current['peak_kib'],
+            'baseline_peak_kib': previous['peak_kib'],
+            'regressed': change > threshold,
+        }
+    return comparison
@@ -0,0 +1,134 @@
+"""
+Benchmark workloads module for the Gold Jewelry Business Management System
+The headless data paths behind the main views, saves, deletes, ref_id generation and reports
+"""
+
+import random
+from datetime import datetime, timedelta
+
+from services import ExposureService, HomeService, ItemsService, PurchasesService, ReportsService, SalesService
+
+# Lines in the sale group written (and then deleted) by the save/delete workloads
+SAVE_GROUP_LINES = 10
+# Groups removed per delete workload
+DELETE_GROUPS = 20
+# Ref ids generated per ref_id workload
+REF_IDS_GENERATED = 50
+# Report rounds per warm-cache workload (the first one loads the analytics cache)
+WARM_REPORT_ROUNDS = 20
+# Home tab refreshes per home workload (the first one loads the day)
+HOME_REFRESH_ROUNDS = 20
+# Exposure refreshes per karigar workload (the first one computes it)
+EXPOSURE_REFRESH_ROUNDS = 20
+
+
+class BenchContext:
+    """Reference data a workload picks its inputs from, read once per dataset"""
+
+    def __init__(self, db, seed):
+        self.rng = random.Random(seed)
+        self.item_ids = [row[0] for row in db.execute_query("SELECT item_id FROM items")]
+        self.suppliers = [row[0] for row in db.execute_query("SELECT supplier_name FROM suppliers")]
+        latest = db.execute_query("SELECT MAX(sale_date) FROM sales")[0][0]
+        self.latest = datetime.strptime(latest, '%Y-%m-%d %H:%M:%S') if latest else datetime.now()
+        self.month = self.latest.strftime('%Y-%m')
+
+
+def load_items(db, ctx):
+    """Stock summary behind load_items_data"""
+    with db.read_pool.connection() as conn:
+        return len(ItemsService(db).stock_summary(conn))
+
+
+def _unified(db, supplier=None, from_date=None, to_date=None):
+    with db.read_pool.connection() as conn:
+        groups = SalesService(db).unified_groups(conn, supplier, from_date, to_date)
+    return sum(len(lines) for _ref_id, lines in groups)
+
+
+def load_unified(db, ctx):
+    """Unfiltered sale + purchase groups behind load_unified_data"""
+    return _unified(db)
+
+
+def load_unified_filtered(db, ctx):
+    """load_unified_data filtered to one supplier over the last 30 days"""
+    to_date = ctx.latest.strftime('%Y-%m-%d')
+    from_date = (ctx.latest - timedelta(days=30)).strftime('%Y-%m-%d')
+    return _unified(db, ctx.rng.choice(ctx.suppliers), from_date, to_date)
+
+
+def generate_ref_ids(db, ctx):
+    """Next S and P ref_ids as handed out to the multi-line sale and purchase editors"""
+    sales, purchases = SalesService(db), PurchasesService(db)
+    sales_counter = purchases_counter = 0
+    for _ in range(REF_IDS_GENERATED // 2):
+        _ref_id, sales_counter = sales.next_ref_id(sales_counter)
+        _ref_id, purchases_counter = purchases.next_ref_id(purchases_counter)
+    return REF_IDS_GENERATED
+
+
+def save_sale_group(db, ctx):
+    """save_all_sales for one group of lines"""
+    service = SalesService(db)
+    ref_id, _num = service.next_ref_id()
+    lines = []
+    for _ in range(SAVE_GROUP_LINES):
+        gross = round(ctx.rng.uniform(1, 80), 3)
+        lines.append((ctx.rng.choice(ctx.item_ids), gross, round(gross * 0.05, 3), 91.6, 2.5))
+    return service.save_group(ref_id, ctx.rng.choice(ctx.suppliers), lines)
+
+
+def delete_groups(db, ctx):
+    """delete_unified_records for the newest sale groups"""
+    ref_ids = [row[0] for row in db.execute_query(
+        "SELECT DISTINCT ref_id FROM sales WHERE ref_id LIKE 'S%' ORDER BY sale_id DESC LIMIT ?", (DELETE_GROUPS,))]
+    return SalesService(db).delete_groups(ref_ids)
+
+
+def run_reports(db, ctx, service=None):
+    """Every report, in the order of the report buttons, on a cold analytics cache"""
+    service = service or ReportsService(db)
+    with db.read_pool.connection() as conn:
+        rows = (len(service.inventory(conn)) + len(service.work_orders(conn)) + len(service.freelancers(conn))
+                + len(service.detailed_work_orders(conn)))
+        service.wastage(conn)
+        service.monthly(ctx.month, conn)
+    return rows + 4
+
+
+def run_reports_warm(db, ctx):
+    """Every report WARM_REPORT_ROUNDS times on one service, as the app runs them after the first load"""
+    service = ReportsService(db)
+    return sum(run_reports(db, ctx, service) for _ in range(WARM_REPORT_ROUNDS))
+
+
+def refresh_home(db, ctx):
+    """load_home_data HOME_REFRESH_ROUNDS times on the dataset's latest day, as on repeated Home tab switches"""
+    service = HomeService(db)
+    for _ in range(HOME_REFRESH_ROUNDS):
+        service.refresh(ctx.latest)
+    return len(service.today_lines()) + len(service.pending_orders())
+
+
+def refresh_exposure(db, ctx):
+    """load_karigar_exposure EXPOSURE_REFRESH_ROUNDS times, as on repeated Karigar Orders tab refreshes"""
+    service = ExposureService(db)
+    for _ in range(EXPOSURE_REFRESH_ROUNDS):
+        service.refresh(ctx.latest)
+    return sum(len(row.items) for row in service.by_karigar())
+
+
+# (name, writes to the database, workload). Writing workloads get their own copy of the dataset.
+WORKLOADS = [
+    ('items.load', False, load_items),
+    ('unified.load', False, load_unified),
+    ('unified.load_filtered', False, load_unified_filtered),
+    ('ref_id.generate', False, generate_ref_ids),
+    ('reports.all', False, run_reports),
+    ('reports.warm', False, run_reports_warm),
+    ('home.refresh', False, refresh_home),
+    ('karigar.exposure', False, refresh_exposure),
+    ('sales.save_group', True, save_sale_group),
+    ('sales.delete_groups', True, delete_groups),
+]
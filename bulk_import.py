@@ -0,0 +1,432 @@
+"""
+Bulk import module for Gold Jewelry Business Management System
+Streams historical sales/purchase lines, items and suppliers from CSV or JSONL files
+"""
+
+import csv
+import json
+import os
+from datetime import datetime
+from database import QUERIES
+from app_logging import configure_logging, get_logger
+
+logger = get_logger(__name__)
+
+# Rows validated and inserted per executemany() batch
+IMPORT_CHUNK_SIZE = 5000
+# Number of row errors kept for the summary (the rest are only counted)
+MAX_REPORTED_ERRORS = 50
+
+IMPORT_KINDS = ('sales', 'purchases', 'items', 'suppliers')
+REF_PREFIXES = {'sales': 'S', 'purchases': 'P'}
+
+# Accepted date formats for sale_date / date columns in line files
+DATE_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+
+
+class ImportResult:
+    def __init__(self, kind, path):
+        self.kind = kind
+        self.path = path
+        self.rows_read = 0
+        self.rows_imported = 0
+        self.rows_skipped = 0
+        self.ref_ids_allocated = 0
+        self.items_created = 0
+        self.suppliers_created = 0
+        self.errors = []
+
+    def add_error(self, line_no, message):
+        self.rows_skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Row {line_no}: {message}")
+
+    def summary(self):
+        parts = [f"Imported {self.rows_imported} of {self.rows_read} {self.kind} rows"]
+        if self.ref_ids_allocated:
+            parts.append(f"{self.ref_ids_allocated} new Ref IDs")
+        if self.items_created:
+            parts.append(f"{self.items_created} new items")
+        if self.suppliers_created:
+            parts.append(f"{self.suppliers_created} new suppliers")
+        if self.rows_skipped:
+            parts.append(f"{self.rows_skipped} skipped")
+        return ", ".join(parts)
+
+
+class BulkImportManager:
+    def __init__(self, db_manager):
+        """Initialize bulk import manager with database connection"""
+        self.db = db_manager
+
+    # -------------------------
+    # File streaming
+    # -------------------------
+    @staticmethod
+    def iter_records(path):
+        """Yield (line_no, dict) pairs from a CSV or JSONL file without loading it into memory."""
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line_no, line in enumerate(f, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError as e:
+                        yield line_no, e
+                        continue
+                    if not isinstance(record, dict):
+                        yield line_no, ValueError("expected a JSON object")
+                        continue
+                    yield line_no, {str(k).strip().lower(): v for k, v in record.items()}
+        else:
+            with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+                reader = csv.DictReader(f)
+                # Header is line 1, first data row is line 2
+                for line_no, record in enumerate(reader, start=2):
+                    yield line_no, {(k or '').strip().lower(): v for k, v in record.items()}
+
+    @staticmethod
+    def iter_chunks(records, size=IMPORT_CHUNK_SIZE):
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    # -------------------------
+    # Value parsing
+    # -------------------------
+    @staticmethod
+    def _text(record, *keys):
+        for key in keys:
+            value = record.get(key)
+            if value is not None and str(value).strip() != '':
+                return str(value).strip()
+        return ''
+
+    @staticmethod
+    def _number(record, key, default=None):
+        value = record.get(key)
+        if value is None or str(value).strip() == '':
+            if default is None:
+                raise ValueError(f"missing {key}")
+            return default
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid {key} '{value}'")
+
+    @staticmethod
+    def _parse_date(text):
+        if not text:
+            return datetime.now()
+        try:
+            # Fast path for ISO dates, which is what our own exports contain
+            return datetime.fromisoformat(text)
+        except ValueError:
+            pass
+        for fmt in DATE_FORMATS:
+            try:
+                return datetime.strptime(text, fmt)
+            except ValueError:
+                continue
+        raise ValueError(f"invalid date '{text}'")
+
+    # -------------------------
+    # Cached lookups
+    # -------------------------
+    def _load_item_ids(self, conn):
+        return {str(name).strip().lower(): item_id
+                for item_id, name in conn.execute("SELECT item_id, item_name FROM items")}
+
+    def _load_supplier_names(self, conn):
+        return {str(name).strip().lower(): name
+                for (name,) in conn.execute("SELECT supplier_name FROM suppliers")}
+
+    def _load_ref_counters(self, conn, prefix):
+        """Highest used sequence number per Ref ID date stem (e.g. 'S010125'), in one query."""
+        rows = conn.execute(
+            "SELECT substr(ref_id, 1, 7), MAX(CAST(substr(ref_id, 9) AS INTEGER)) "
+            "FROM sales WHERE ref_id LIKE ? GROUP BY substr(ref_id, 1, 7)",
+            (f"{prefix}______/%",)
+        ).fetchall()
+        return {stem: (num or 0) for stem, num in rows}
+
+    def _load_ref_ids(self, conn):
+        """Every Ref ID already in the sales table (sales and purchases alike)."""
+        return {ref_id for (ref_id,) in conn.execute("SELECT DISTINCT ref_id FROM sales")}
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def import_file(self, kind, path, create_missing=True, progress_callback=None, conn=None):
+        """Import a CSV/JSONL file of the given kind. Returns an ImportResult.
+
+        The whole import runs in one transaction: either every valid row lands or none do.
+        With conn the rows are written there and the caller commits or rolls back; otherwise
+        the import is its own transaction on the writer connection.
+        progress_callback(rows_read) is called after each chunk.
+        """
+        if kind not in IMPORT_KINDS:
+            raise ValueError(f"Unknown import kind '{kind}'")
+        if not path or not os.path.exists(path):
+            raise FileNotFoundError("Import file not found")
+        result = ImportResult(kind, path)
+        if conn is None:
+            with self.db.transaction() as conn:
+                self._import(conn, kind, path, result, create_missing, progress_callback)
+        else:
+            self._import(conn, kind, path, result, create_missing, progress_callback)
+        logger.info("Bulk import finished: %s", result.summary())
+        return result
+
+    def submit_import(self, kind, path, create_missing=True, tk_root=None, callback=None,
+                      error_callback=None, progress_callback=None):
+        """Run import_file in a worker thread (see DatabaseManager.submit_write). Returns a Future.
+        callback(ImportResult) or error_callback(exc), and progress_callback(rows_read) while it
+        runs, are called on the Tk thread.
+        """
+        rows_read = [0]
+
+        def job(conn):
+            def track(count):
+                rows_read[0] = count
+            return self.import_file(kind, path, create_missing, track, conn=conn)
+
+        on_poll = (lambda: progress_callback(rows_read[0])) if progress_callback else None
+        return self.db.submit_write(job, tk_root=tk_root, callback=callback, error_callback=error_callback,
+                                    on_poll=on_poll)
+
+    def _import(self, conn, kind, path, result, create_missing, progress_callback):
+        if kind == 'items':
+            self._import_items(conn, path, result, progress_callback)
+        elif kind == 'suppliers':
+            self._import_suppliers(conn, path, result, progress_callback)
+        else:
+            self._import_lines(conn, kind, path, result, create_missing, progress_callback)
+
+    def _import_items(self, conn, path, result, progress_callback):
+        known = self._load_item_ids(conn)
+        for chunk in self.iter_chunks(self.iter_records(path)):
+            batch = []
+            for line_no, record in chunk:
+                result.rows_read += 1
+                if isinstance(record, Exception):
+                    result.add_error(line_no, record)
+                    continue
+                name = self._text(record, 'item_name', 'name', 'item')
+                if not name:
+                    result.add_error(line_no, "missing item_name")
+                    continue
+                if name.lower() in known:
+                    result.add_error(line_no, f"item '{name}' already exists")
+                    continue
+                known[name.lower()] = None
+                batch.append((name, self._text(record, 'item_code') or None,
+                              self._text(record, 'category'), self._text(record, 'description')))
+            conn.executemany(
+                "INSERT INTO items (item_name, item_code, category, description) VALUES (?, ?, ?, ?)",
+                batch
+            )
+            result.rows_imported += len(batch)
+            if progress_callback:
+                progress_callback(result.rows_read)
+
+    def _import_suppliers(self, conn, path, result, progress_callback):
+        known = self._load_supplier_names(conn)
+        for chunk in self.iter_chunks(self.iter_records(path)):
+            batch = []
+            for line_no, record in chunk:
+                result.rows_read += 1
+                if isinstance(record, Exception):
+                    result.add_error(line_no, record)
+                    continue
+                name = self._text(record, 'supplier_name', 'name', 'supplier')
+                if not name:
+                    result.add_error(line_no, "missing supplier_name")
+                    continue
+                if name.lower() in known:
+                    result.add_error(line_no, f"supplier '{name}' already exists")
+                    continue
+                try:
+                    balance = self._number(record, 'balance', 0.0)
+                except ValueError as e:
+                    result.add_error(line_no, e)
+                    continue
+                known[name.lower()] = name
+                batch.append((name, self._text(record, 'contact_person'), self._text(record, 'phone'),
+                              self._text(record, 'email'), self._text(record, 'address'),
+                              self._text(record, 'gst_number'), balance))
+            conn.executemany(
+                """
+                INSERT INTO suppliers (supplier_name, contact_person, phone, email, address, gst_number, is_active, balance)
+                VALUES (?, ?, ?, ?, ?, ?, 1, ?)
+                """,
+                batch
+            )
+            result.rows_imported += len(batch)
+            if progress_callback:
+                progress_callback(result.rows_read)
+
+    def _import_lines(self, conn, kind, path, result, create_missing, progress_callback):
+        """Import sale or purchase lines into the sales table.
+
+        Lines sharing a ref_id (or, when absent, the same 'group'/'invoice' value, else the same
+        supplier and day) become one transaction group with a freshly allocated Ref ID.
+        A supplied ref_id must carry the kind's prefix and must not name an existing group; it
+        also moves the allocation counter for its date past it.
+        Item stock and supplier balances are adjusted once at the end from aggregated deltas.
+        """
+        prefix = REF_PREFIXES[kind]
+        item_ids = self._load_item_ids(conn)
+        supplier_names = self._load_supplier_names(conn)
+        ref_counters = self._load_ref_counters(conn, prefix)
+        allocated_refs = {}
+        existing_refs = None  # loaded on the first supplied ref_id
+        supplied_refs = set()
+        allocated_ids = set()
+        item_deltas = {}      # item_id -> [fine, net]
+        supplier_deltas = {}  # supplier_name -> fine grams
+        # Sales take weight out of stock and add to what the supplier owes; purchases the reverse
+        stock_sign = -1.0 if kind == 'sales' else 1.0
+        balance_sign = 1.0 if kind == 'sales' else -1.0
+
+        insert_sql = QUERIES['sales.insert_line_with_notes']
+
+        for chunk in self.iter_chunks(self.iter_records(path)):
+            batch = []
+            new_items = []
+            new_suppliers = []
+            for line_no, record in chunk:
+                result.rows_read += 1
+                if isinstance(record, Exception):
+                    result.add_error(line_no, record)
+                    continue
+                try:
+                    supplier = self._text(record, 'supplier_name', 'supplier')
+                    if not supplier:
+                        raise ValueError("missing supplier_name")
+                    item_name = self._text(record, 'item_name', 'item')
+                    if not item_name:
+                        raise ValueError("missing item_name")
+                    gross = self._number(record, 'gross_weight')
+                    less = self._number(record, 'less_weight', 0.0)
+                    tunch = self._number(record, 'tunch_percentage')
+                    wastage = self._number(record, 'wastage_percentage', 0.0)
+                    when = self._parse_date(self._text(record, 'sale_date', 'date'))
+                except ValueError as e:
+                    result.add_error(line_no, e)
+                    continue
+
+                # Checked before anything is created for the line
+                ref_id = self._text(record, 'ref_id')
+                if ref_id and ref_id not in supplied_refs:
+                    if existing_refs is None:
+                        existing_refs = self._load_ref_ids(conn)
+                    if not ref_id.startswith(prefix):
+                        result.add_error(line_no, f"ref_id '{ref_id}' does not start with '{prefix}'")
+                        continue
+                    if ref_id in existing_refs or ref_id in allocated_ids:
+                        result.add_error(line_no, f"ref_id '{ref_id}' already exists")
+                        continue
+                    supplied_refs.add(ref_id)
+                    stem, sep, number = ref_id[:7], ref_id[7:8], ref_id[8:]
+                    if sep == '/' and number.isdigit():
+                        ref_counters[stem] = max(ref_counters.get(stem, 0), int(number))
+
+                supplier_key = supplier.lower()
+                if supplier_key not in supplier_names:
+                    if not create_missing:
+                        result.add_error(line_no, f"unknown supplier '{supplier}'")
+                        continue
+                    supplier_names[supplier_key] = supplier
+                    new_suppliers.append((supplier,))
+                supplier = supplier_names[supplier_key]
+
+                item_key = item_name.lower()
+                if item_key not in item_ids:
+                    if not create_missing:
+                        result.add_error(line_no, f"unknown item '{item_name}'")
+                        continue
+                    # Real id is filled in after the batch insert below
+                    item_ids[item_key] = None
+                    new_items.append((item_name,))
+
+                if not ref_id:
+                    group_key = (self._text(record, 'group', 'invoice', 'invoice_number')
+                                 or (supplier_key, when.strftime('%Y-%m-%d')))
+                    ref_id = allocated_refs.get(group_key)
+                    if ref_id is None:
+                        stem = f"{prefix}{when.strftime('%d%m%y')}"
+                        ref_counters[stem] = ref_counters.get(stem, 0) + 1
+                        ref_id = f"{stem}/{ref_counters[stem]:03d}"
+                        allocated_refs[group_key] = ref_id
+                        allocated_ids.add(ref_id)
+                        result.ref_ids_allocated += 1
+
+                net = gross - less
+                fine = (net / 100 * tunch) + (net / 100 * wastage)
+                batch.append([ref_id, supplier, item_key, gross, less, net, tunch, wastage, fine,
+                              when.strftime('%Y-%m-%d %H:%M:%S'), self._text(record, 'notes') or None])
+
+            if new_suppliers:
+                conn.executemany("INSERT INTO suppliers (supplier_name, is_active, balance) VALUES (?, 1, 0)", new_suppliers)
+                result.suppliers_created += len(new_suppliers)
+            if new_items:
+                conn.executemany("INSERT INTO items (item_name, category) VALUES (?, '')", new_items)
+                result.items_created += len(new_items)
+                item_ids = self._load_item_ids(conn)
+
+            for row in batch:
+                item_id = item_ids[row[2]]
+                row[2] = item_id
+                fine, net = row[8], row[5]
+                delta = item_deltas.setdefault(item_id, [0.0, 0.0])
+                delta[0] += stock_sign * fine
+                delta[1] += stock_sign * net
+                supplier_deltas[row[1]] = supplier_deltas.get(row[1], 0.0) + balance_sign * fine
+            conn.executemany(insert_sql, batch)
+            result.rows_imported += len(batch)
+            if progress_callback:
+                progress_callback(result.rows_read)
+
+        # Apply stock and balance changes once for the whole file
+        conn.executemany(
+            QUERIES['items.adjust_weights'],
+            [(fine, net, item_id) for item_id, (fine, net) in item_deltas.items()]
+        )
+        conn.executemany(
+            QUERIES['suppliers.adjust_balance'],
+            [(amount, name) for name, amount in supplier_deltas.items()]
+        )
+
+
+def main():
+    """Command-line entry point: python bulk_import.py <kind> <file> [--db path]"""
+    import argparse
+    from database import DatabaseManager
+
+    parser = argparse.ArgumentParser(description="Bulk import sales/purchase lines, items or suppliers")
+    parser.add_argument('kind', choices=IMPORT_KINDS)
+    parser.add_argument('path', help="CSV or JSONL file")
+    parser.add_argument('--db', default='gold_jewelry.db', help="Database file (default: gold_jewelry.db)")
+    parser.add_argument('--no-create', action='store_true', help="Reject lines with unknown items/suppliers")
+    args = parser.parse_args()
+
+    configure_logging()
+    db = DatabaseManager(args.db)
+    try:
+        result = BulkImportManager(db).import_file(args.kind, args.path, create_missing=not args.no_create)
+        for error in result.errors:
+            print(error)
+    finally:
+        db.close_connection()
+
+
+if __name__ == "__main__":
+    main()
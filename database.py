@@ -7,412 +7,745 @@ import sqlite3
 import os
 import shutil
 import csv
+import gzip
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from urllib.parse import quote
+from migrations import migrate
+from instrumentation import metrics, sql_metric_name
+from app_logging import add_rotating_file_handler, get_logger
+
+logger = get_logger(__name__)
+# Statements over the slow-query threshold, with their query plans, go to their own file
+slow_query_logger = get_logger('database.slow_queries')
+
+# Tables written by export_all_to_dir, in the order they are reported
+EXPORT_TABLES = ['suppliers', 'items', 'sales', 'purchases', 'karigar_orders', 'karigar_order_items', 'raini_orders']
+# Rows pulled from the cursor per fetchmany() call while exporting
+EXPORT_CHUNK_SIZE = 2000
+# Read-only connections (and worker threads) available for background queries
+READ_POOL_SIZE = 3
+# Number of tables exported concurrently, each on a read pool connection; one is left for view loads
+EXPORT_MAX_WORKERS = READ_POOL_SIZE - 1
+# How often the Tk thread checks whether a background query has finished
+TK_POLL_INTERVAL_MS = 15
+# Seconds a background write connection waits for the write lock before failing
+BACKGROUND_WRITE_TIMEOUT = 30
+# Rows fetched per round trip by iter_query
+ITER_CHUNK_SIZE = 500
+# Compiled statements kept per connection (sqlite3's default is 128)
+STATEMENT_CACHE_SIZE = 256
+# Statements slower than this are written to the slow-query log; <= 0 turns it off.
+# Override with e.g. GOLDAPP_SLOW_QUERY_MS=50
+SLOW_QUERY_MS_ENV = 'GOLDAPP_SLOW_QUERY_MS'
+DEFAULT_SLOW_QUERY_MS = 200
+# Slow-query log written next to the database, rotated by size
+SLOW_QUERY_LOG_NAME = 'slow_queries.log'
+SLOW_QUERY_LOG_MAX_BYTES = 1024 * 1024
+SLOW_QUERY_LOG_BACKUPS = 3
+# Longest parameter repr written per slow-query entry
+SLOW_QUERY_PARAMS_LENGTH = 500
+
+# Named, parameterized statements shared by the UI, managers and importer. Running the
+# same SQL text every time lets sqlite3's per-connection statement cache reuse the
+# compiled statement instead of parsing it again; values always go in as parameters.
+QUERIES = {
+    # Highest ref_id matching a pattern such as 'S190925/%'
+    'sales.last_ref_like': "SELECT ref_id FROM sales WHERE ref_id LIKE ? ORDER BY ref_id DESC LIMIT 1",
+    'sales.ref_count': "SELECT COUNT(*) FROM sales WHERE ref_id = ?",
+    'sales.insert_line': '''
+        INSERT INTO sales (ref_id, supplier_name, item_id, gross_weight, less_weight,
+                           net_weight, tunch_percentage, wastage_percentage, fine_gold, sale_date)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    'sales.insert_line_with_notes': '''
+        INSERT INTO sales (ref_id, supplier_name, item_id, gross_weight, less_weight,
+                           net_weight, tunch_percentage, wastage_percentage, fine_gold, sale_date, notes)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''',
+    # Every line of one ref_id for the editors, keyed by sale_id
+    'sales.group_lines': '''
+        SELECT s.sale_id, s.supplier_name, s.item_id, s.gross_weight, s.less_weight, s.net_weight,
+               s.tunch_percentage, s.wastage_percentage, s.fine_gold, s.sale_date, i.item_name
+        FROM sales s
+        LEFT JOIN items i ON s.item_id = i.item_id
+        WHERE s.ref_id = ?
+        ORDER BY s.sale_id
+    ''',
+    'sales.update_line': '''
+        UPDATE sales
+        SET supplier_name = ?, item_id = ?, gross_weight = ?, less_weight = ?, net_weight = ?,
+            tunch_percentage = ?, wastage_percentage = ?, fine_gold = ?
+        WHERE sale_id = ?
+    ''',
+    'sales.delete_line': "DELETE FROM sales WHERE sale_id = ?",
+    # Sale or purchase lines for the unified view; the active filters of UNIFIED_LINE_FILTERS are
+    # ANDed onto the WHERE clause (see SalesService.unified_groups)
+    'sales.unified_lines': '''
+        SELECT
+            :record_type as type,
+            s.ref_id,
+            s.supplier_name,
+            i.item_name,
+            s.gross_weight,
+            s.less_weight,
+            s.net_weight,
+            s.tunch_percentage,
+            s.wastage_percentage,
+            s.fine_gold,
+            s.sale_date,
+            s.sale_id
+        FROM sales s
+        LEFT JOIN items i ON s.item_id = i.item_id
+        WHERE s.ref_id LIKE :ref_pattern
+    ''',
+    # Signed deltas: positive adds stock / balance, negative removes it
+    'items.adjust_weights': '''
+        UPDATE items
+        SET fine_weight = COALESCE(fine_weight, 0) + ?,
+            net_weight = COALESCE(net_weight, 0) + ?
+        WHERE item_id = ?
+    ''',
+    'suppliers.adjust_balance': "UPDATE suppliers SET balance = COALESCE(balance, 0) + ? WHERE supplier_name = ?",
+    'suppliers.balance': "SELECT COALESCE(balance, 0) FROM suppliers WHERE supplier_name = ?",
+    # Per-item totals of a supplier's lines, signed as stock moved when they were saved
+    # (purchases added, sales removed), plus how many lines of each kind there are
+    'suppliers.line_totals': '''
+        SELECT item_id,
+               SUM(CASE WHEN ref_id LIKE 'P%' THEN fine_gold ELSE -fine_gold END),
+               SUM(CASE WHEN ref_id LIKE 'P%' THEN net_weight ELSE -net_weight END),
+               SUM(ref_id LIKE 'S%'),
+               SUM(ref_id LIKE 'P%')
+        FROM sales
+        WHERE supplier_name = ?
+        GROUP BY item_id
+    ''',
+    'suppliers.line_counts': "SELECT COUNT(CASE WHEN ref_id LIKE 'S%' THEN 1 END), COUNT(CASE WHEN ref_id LIKE 'P%' THEN 1 END) FROM sales WHERE supplier_name = ?",
+    'suppliers.delete_lines': "DELETE FROM sales WHERE supplier_name = ?",
+    'suppliers.delete': "DELETE FROM suppliers WHERE supplier_id = ?",
+    'suppliers.list': '''
+        SELECT
+            supplier_id,
+            supplier_name,
+            contact_person,
+            phone,
+            email,
+            address,
+            gst_number,
+            CASE WHEN is_active = 1 THEN 'Active' ELSE 'Inactive' END as status
+        FROM suppliers
+        ORDER BY supplier_name
+    ''',
+    # Stock per item derived from purchase minus sale lines (raini items keep their stored weight)
+    'items.stock_summary': '''
+        WITH 
+        p AS (
+            SELECT item_id,
+                   SUM(gross_weight) AS g,
+                   SUM(less_weight)  AS l,
+                   SUM(net_weight)   AS n,
+                   SUM(wastage_percentage * net_weight) AS wsum
+            FROM sales
+            WHERE ref_id LIKE 'P%'
+            GROUP BY item_id
+        ),
+        s AS (
+            SELECT item_id,
+                   SUM(gross_weight) AS g,
+                   SUM(less_weight)  AS l,
+                   SUM(net_weight)   AS n,
+                   SUM(wastage_percentage * net_weight) AS wsum
+            FROM sales
+            WHERE ref_id LIKE 'S%'
+            GROUP BY item_id
+        )
+        SELECT 
+            i.item_id,
+            i.item_name,
+            CASE WHEN LOWER(COALESCE(i.category,'')) = 'raini'
+                 THEN COALESCE(i.net_weight, 0)
+                 ELSE COALESCE(p.g,0) - COALESCE(s.g,0)
+            END AS gross_weight,
+            CASE WHEN LOWER(COALESCE(i.category,'')) = 'raini'
+                 THEN 0
+                 ELSE COALESCE(p.l,0) - COALESCE(s.l,0)
+            END AS less_weight,
+            CASE WHEN LOWER(COALESCE(i.category,'')) = 'raini'
+                 THEN COALESCE(i.net_weight, 0)
+                 ELSE COALESCE(p.n,0) - COALESCE(s.n,0)
+            END AS net_weight,
+            CASE 
+                WHEN LOWER(COALESCE(i.category,'')) = 'raini' THEN 0
+                WHEN (COALESCE(p.n,0) - COALESCE(s.n,0)) <> 0 
+                    THEN (COALESCE(p.wsum,0) - COALESCE(s.wsum,0)) / (COALESCE(p.n,0) - COALESCE(s.n,0))
+                ELSE 0
+            END AS wastage_percentage
+        FROM items i
+        LEFT JOIN p ON p.item_id = i.item_id
+        LEFT JOIN s ON s.item_id = i.item_id
+        ORDER BY i.item_id DESC
+    ''',
+    'items.id_by_name': "SELECT item_id FROM items WHERE item_name = ? LIMIT 1",
+    # Open karigar orders for the Karigar Orders tab
+    # status_code: see statuses.py (1 = in progress, 0 = pending, 2 = completed). Each open-row
+    # filter is served by a partial index with the same WHERE
+    'karigar.open_orders': '''
+        SELECT order_id, karigar_name, issued_total, received_total, balance_total, status, created_at
+        FROM karigar_orders
+        WHERE status_code = 1
+        ORDER BY order_id DESC
+    ''',
+    # Open orders' karigar, outstanding balance and age, for the exposure ageing buckets
+    'karigar.open_order_balances': '''
+        SELECT COALESCE(karigar_name, ''), COALESCE(issued_total, 0) - COALESCE(received_total, 0), created_at
+        FROM karigar_orders
+        WHERE status_code = 1
+    ''',
+    # Open orders' detail rows summed per (karigar, item); CROSS JOIN keeps the open orders as the
+    # outer loop so only their detail rows are read
+    'karigar.open_item_exposure': '''
+        SELECT COALESCE(o.karigar_name, ''), COALESCE(i.item_id, 0), MAX(i.item_name),
+               COALESCE(SUM(CASE WHEN i.direction = 'issued' THEN i.weight END), 0),
+               COALESCE(SUM(CASE WHEN i.direction = 'received' THEN i.weight END), 0)
+        FROM karigar_orders o
+        CROSS JOIN karigar_order_items i ON i.order_id = o.order_id
+        WHERE o.status_code = 1
+        GROUP BY 1, 2
+    ''',
+    'karigar.last_ref_like': "SELECT ref_id FROM karigar_orders WHERE ref_id LIKE ? ORDER BY ref_id DESC LIMIT 1",
+    'karigar.insert_order': '''
+        INSERT INTO karigar_orders (ref_id, karigar_id, karigar_name, issued_total, received_total, balance_total,
+                                    status, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, 'in progress', ?)
+    ''',
+    'karigar.insert_item': '''
+        INSERT INTO karigar_order_items (order_id, item_id, item_name, direction, weight, created_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''',
+    # Detail rows of one order, served by idx_karigar_order_items_order
+    'karigar.order_items': "SELECT item_name, direction, weight FROM karigar_order_items WHERE order_id = ? ORDER BY id",
+    'karigar.delete_items': "DELETE FROM karigar_order_items WHERE order_id = ?",
+    'karigar.delete_order': "DELETE FROM karigar_orders WHERE order_id = ?",
+    'karigar.set_totals': '''
+        UPDATE karigar_orders SET issued_total = ?, received_total = ?, balance_total = ? WHERE order_id = ?
+    ''',
+    # Each order's stored totals next to its detail rows, summed in one grouped pass over the
+    # (order_id, direction, weight) index
+    'karigar.reconcile_orders': '''
+        SELECT o.order_id, o.issued_total, o.received_total, o.balance_total,
+               COALESCE(d.issued, 0), COALESCE(d.received, 0)
+        FROM karigar_orders o
+        LEFT JOIN (
+            SELECT order_id,
+                   SUM(CASE WHEN direction = 'issued' THEN weight ELSE 0 END) AS issued,
+                   SUM(CASE WHEN direction = 'received' THEN weight ELSE 0 END) AS received
+            FROM karigar_order_items
+            GROUP BY order_id
+        ) d ON d.order_id = o.order_id
+    ''',
+    'karigar.orphan_items': '''
+        SELECT COUNT(*) FROM karigar_order_items
+        WHERE order_id IS NULL OR order_id NOT IN (SELECT order_id FROM karigar_orders)
+    ''',
+    # Per-karigar / per-item balances maintained by the migration 7 triggers, and the same
+    # grouped straight from the detail rows
+    'karigar.item_balances': "SELECT karigar_name, item_id, item_name, issued, received FROM karigar_item_balances",
+    'karigar.item_balances_actual': '''
+        SELECT COALESCE(o.karigar_name, ''), COALESCE(i.item_id, 0), MAX(i.item_name),
+               COALESCE(SUM(CASE WHEN i.direction = 'issued' THEN i.weight END), 0),
+               COALESCE(SUM(CASE WHEN i.direction = 'received' THEN i.weight END), 0)
+        FROM karigar_order_items i
+        JOIN karigar_orders o ON o.order_id = i.order_id
+        GROUP BY 1, 2
+    ''',
+    'karigar.balances': "SELECT karigar_name, issued, received, outstanding FROM karigar_balances ORDER BY outstanding DESC",
+    # Signed additions to an order's running totals
+    'karigar.add_totals': '''
+        UPDATE karigar_orders
+        SET issued_total = COALESCE(issued_total, 0) + ?,
+            received_total = COALESCE(received_total, 0) + ?,
+            balance_total = COALESCE(balance_total, 0) + ?
+        WHERE order_id = ?
+    ''',
+    'raini.orders': '''
+        SELECT raini_id, purity_percentage, pure_gold_weight, impurities_weight, copper_weight,
+               silver_weight, total_weight, actual_weight, created_date, status
+        FROM raini_orders
+        ORDER BY created_date DESC
+    ''',
+    # Running totals (migration 9): (completed actual weight, pending count, pending total weight)
+    'raini.totals': "SELECT completed_weight, pending_count, pending_weight FROM raini_totals WHERE id = 1",
+    'raini.add_totals': '''
+        UPDATE raini_totals
+        SET completed_weight = completed_weight + ?, pending_count = pending_count + ?, pending_weight = pending_weight + ?
+        WHERE id = 1
+    ''',
+    'raini.order_state': "SELECT status_code, total_weight FROM raini_orders WHERE raini_id = ?",
+    # Oldest pending orders first, for the Home tab
+    'raini.pending_list': '''
+        SELECT raini_id, total_weight
+        FROM raini_orders
+        WHERE status_code = 0
+        ORDER BY created_date ASC
+        LIMIT ?
+    ''',
+    'raini.insert': '''
+        INSERT INTO raini_orders
+        (purity_percentage, pure_gold_weight, impurities_weight, total_weight,
+         copper_percentage, copper_weight, silver_percentage, silver_weight,
+         created_date, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), 'Pending')
+    ''',
+    'raini.complete': "UPDATE raini_orders SET status = 'Completed', actual_weight = ? WHERE raini_id = ?",
+    'items.insert_raini': '''
+        INSERT INTO items (item_name, item_code, category, description, fine_weight, net_weight, is_active, created_date)
+        VALUES (?, NULL, 'Raini', ?, ?, ?, 1, ?)
+    ''',
+    # Inventory pivot: one row per (form, purity), served by idx_gold_inventory_form_purity
+    'inventory.breakdown': '''
+        SELECT form, purity_percentage, COUNT(*), SUM(weight_grams)
+        FROM gold_inventory
+        GROUP BY form, purity_percentage
+        ORDER BY form, purity_percentage
+    ''',
+    # One day's lines for the Home tab, past a sale_id; the half-open sale_date range uses idx_sales_sale_date
+    'home.day_lines': '''
+        SELECT
+            s.sale_id,
+            s.ref_id,
+            CASE
+                WHEN s.ref_id LIKE 'S%' THEN 'Sale'
+                WHEN s.ref_id LIKE 'P%' THEN 'Purchase'
+                ELSE 'Unknown'
+            END as type,
+            s.supplier_name,
+            COALESCE(i.item_name, 'N/A') as item_name,
+            s.gross_weight,
+            s.less_weight,
+            s.net_weight,
+            s.tunch_percentage,
+            s.wastage_percentage,
+            s.fine_gold,
+            strftime('%H:%M', s.sale_date) as time,
+            s.sale_date
+        FROM sales s
+        LEFT JOIN items i ON s.item_id = i.item_id
+        WHERE s.sale_date >= ? AND s.sale_date < ? AND s.sale_id > ?
+    ''',
+    # Write counters maintained by triggers (see migrations.create_change_counter)
+    'changes.table': "SELECT inserts, rewrites FROM table_changes WHERE table_name = ?",
+    'changes.all': "SELECT table_name, inserts, rewrites FROM table_changes",
+    # Fact table rows past a given id, as loaded by the analytics cache (column order matches
+    # services.analytics.FACT_TABLES)
+    'analytics.sales': '''
+        SELECT sale_id, substr(ref_id, 1, 1), supplier_name, item_id, substr(sale_date, 1, 7),
+               gross_weight, net_weight, fine_gold
+        FROM sales WHERE sale_id > ? ORDER BY sale_id
+    ''',
+    'analytics.karigar_order_items': '''
+        SELECT id, order_id, item_name, LOWER(COALESCE(direction, '')), substr(created_at, 1, 7), weight
+        FROM karigar_order_items WHERE id > ? ORDER BY id
+    ''',
+    'analytics.work_orders': '''
+        SELECT work_order_id, freelancer_id, status, substr(issue_date, 1, 7),
+               gold_weight_issued, final_jewelry_weight, wastage_weight
+        FROM work_orders WHERE work_order_id > ? ORDER BY work_order_id
+    ''',
+    'analytics.gold_inventory': '''
+        SELECT inventory_id, gold_type_id, form, purity_percentage, substr(received_date, 1, 7), weight_grams
+        FROM gold_inventory WHERE inventory_id > ? ORDER BY inventory_id
+    ''',
+    'analytics.freelancers': "SELECT freelancer_id, full_name, is_active FROM freelancers ORDER BY freelancer_id",
+    'analytics.gold_types': "SELECT gold_type_id, name FROM gold_types ORDER BY gold_type_id",
+    # Report queries (see ReportsManager); the month_* ones take a 'YYYY-MM' parameter. The summary
+    # reports are served by services.analytics, which must return the same rows;
+    # these stay as the reference definitions
+    'reports.inventory': '''
+        SELECT gt.name, SUM(i.weight_grams) as total_weight, 
+               COUNT(*) as total_items, SUM(i.weight_grams) as available_weight
+        FROM gold_inventory i
+        JOIN gold_types gt ON i.gold_type_id = gt.gold_type_id
+        GROUP BY gt.gold_type_id, gt.name
+    ''',
+    'reports.work_orders': '''
+        SELECT wo.status, COUNT(*) as count, SUM(wo.gold_weight_issued) as total_gold_issued
+        FROM work_orders wo
+        GROUP BY wo.status
+    ''',
+    'reports.freelancers': '''
+        SELECT f.full_name, COUNT(wo.work_order_id) as total_orders,
+               SUM(wo.gold_weight_issued) as total_gold_issued,
+               SUM(wo.final_jewelry_weight) as total_completed,
+               SUM(wo.wastage_weight) as total_wastage
+        FROM freelancers f
+        LEFT JOIN work_orders wo ON f.freelancer_id = wo.freelancer_id
+        WHERE f.is_active = 1
+        GROUP BY f.freelancer_id, f.full_name
+    ''',
+    'reports.wastage': '''
+        SELECT SUM(wo.gold_weight_issued) as total_issued,
+               SUM(wo.final_jewelry_weight) as total_completed,
+               SUM(wo.wastage_weight) as total_wastage
+        FROM work_orders wo
+        WHERE wo.status = 'completed'
+    ''',
+    'reports.month_work_orders': '''
+        SELECT COUNT(*) as total_orders, 
+               SUM(gold_weight_issued) as total_gold_issued,
+               SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) as completed_orders
+        FROM work_orders 
+        WHERE strftime('%Y-%m', issue_date) = ?
+    ''',
+    'reports.month_inventory': '''
+        SELECT COUNT(*) as new_items, SUM(weight_grams) as total_added
+        FROM gold_inventory 
+        WHERE strftime('%Y-%m', received_date) = ?
+    ''',
+    'reports.month_freelancers': '''
+        SELECT COUNT(DISTINCT f.freelancer_id) as active_freelancers
+        FROM freelancers f
+        JOIN work_orders wo ON f.freelancer_id = wo.freelancer_id
+        WHERE strftime('%Y-%m', wo.issue_date) = ? AND f.is_active = 1
+    ''',
+    'reports.detailed_work_orders': '''
+        SELECT wo.work_order_id, f.full_name, wo.jewelry_design, 
+               wo.gold_weight_issued, wo.expected_final_weight, wo.final_jewelry_weight,
+               wo.wastage_weight, wo.status, wo.issue_date, wo.completion_date
+        FROM work_orders wo
+        JOIN freelancers f ON wo.freelancer_id = f.freelancer_id
+        ORDER BY wo.issue_date DESC
+    ''',
+}
+
+# Optional filters of 'sales.unified_lines', keyed by parameter; only the given ones are added.
+# sale_date is compared as stored (not through DATE()) so idx_sales_sale_date can serve the range.
+UNIFIED_LINE_FILTERS = {
+    'supplier': "s.supplier_name = :supplier",
+    'from_date': "s.sale_date >= :from_date",
+    'to_date_next': "s.sale_date < :to_date_next",
+}
+
+
+class ReadConnectionPool:
+    """Small pool of read-only connections to the database file.
+
+    Connections are opened lazily (up to size) and may be used from any thread, but only by
+    one thread at a time: borrow one with `with pool.connection() as conn:`.
+    """
+
+    def __init__(self, db_path, size=READ_POOL_SIZE):
+        self.db_path = db_path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._opened = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        # Built by hand rather than with urllib.request.pathname2url, whose import
+        # (http.client, email.*) is a large share of startup time
+        path = os.path.abspath(self.db_path).replace(os.sep, '/')
+        if not path.startswith('/'):
+            path = '/' + path
+        uri = f"file:{quote(path, safe='/:')}?mode=ro"
+        return sqlite3.connect(uri, uri=True, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+
+    @contextmanager
+    def connection(self):
+        conn = None
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                if len(self._opened) < self.size:
+                    conn = self._connect()
+                    self._opened.append(conn)
+            if conn is None:
+                conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._opened:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+            self._opened = []
+            self._idle = queue.LifoQueue()
+
 
 class DatabaseManager:
-    def __init__(self, db_path='gold_jewelry.db'):
+    def __init__(self, db_path='gold_jewelry.db', slow_query_ms=None):
         """Initialize database connection"""
         self.db_path = db_path
+        if slow_query_ms is None:
+            try:
+                slow_query_ms = float(os.environ.get(SLOW_QUERY_MS_ENV, DEFAULT_SLOW_QUERY_MS))
+            except ValueError:
+                slow_query_ms = DEFAULT_SLOW_QUERY_MS
+        self.slow_query_ms = slow_query_ms if slow_query_ms > 0 else None
+        if self.slow_query_ms is not None:
+            add_rotating_file_handler(slow_query_logger.name,
+                                      os.path.join(os.path.dirname(os.path.abspath(db_path)), SLOW_QUERY_LOG_NAME),
+                                      SLOW_QUERY_LOG_MAX_BYTES, SLOW_QUERY_LOG_BACKUPS)
         self.conn = None
         self.cursor = None
+        self.schema_version = 0
+        self.read_pool = ReadConnectionPool(db_path)
+        self._query_executor = None
         self.init_database()
     
     def init_database(self):
         """Initialize SQLite database and create tables"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, cached_statements=STATEMENT_CACHE_SIZE)
             self.cursor = self.conn.cursor()
-            print("Database connected successfully")
+            # WAL lets the background read connections run while this connection writes
+            self.cursor.execute("PRAGMA journal_mode=WAL")
+            logger.debug("Database connected successfully")
             
             # Test database connection
             self.cursor.execute("SELECT 1")
             test_result = self.cursor.fetchone()
-            print(f"Database test query result: {test_result}")
+            logger.debug("Database test query result: %s", test_result)
             
         except sqlite3.Error as e:
-            print(f"Database connection error: {e}")
+            logger.error("Database connection error: %s", e)
             raise e
         
-        # Create tables
-        self.create_tables()
-        
-        # Migrate existing data if needed
-        self.migrate_database()
-        
-        # Insert default data
-        self.insert_default_data()
-        
-        # Commit all changes
-        self.conn.commit()
-        print("Database initialization completed successfully")
+        # Bring the schema up to date; a current database only pays one PRAGMA read
+        self.schema_version = migrate(self.conn)
+        # Bumped whenever the file is (re)opened, e.g. by restore_from; anything cached against
+        # the table_changes counters must compare this too, since a restored file has its own counters
+        self.generation = getattr(self, 'generation', 0) + 1
+        logger.info("Database initialization completed successfully")
     
-    def create_tables(self):
-        """Create all database tables"""
-        # Gold Types table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gold_types (
-                gold_type_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                purity_percentage REAL NOT NULL,
-                description TEXT
-            )
-        ''')
-        
-        # Gold Inventory table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gold_inventory (
-                inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                gold_type_id INTEGER,
-                weight_grams REAL NOT NULL,
-                purity_percentage REAL NOT NULL,
-                form TEXT NOT NULL,
-                description TEXT,
-                received_date TEXT NOT NULL,
-                supplier_info TEXT,
-                FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
-            )
-        ''')
-        
-        # Check if is_available column exists and drop it if it does
-        self.cursor.execute("PRAGMA table_info(gold_inventory)")
-        columns = [column[1] for column in self.cursor.fetchall()]
-        if 'is_available' in columns:
-            # SQLite doesn't support DROP COLUMN directly, so we need to recreate the table
-            self.cursor.execute('''
-                CREATE TABLE gold_inventory_new (
-                    inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    gold_type_id INTEGER,
-                    weight_grams REAL NOT NULL,
-                    purity_percentage REAL NOT NULL,
-                    form TEXT NOT NULL,
-                    description TEXT,
-                    received_date TEXT NOT NULL,
-                    supplier_info TEXT,
-                    FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
-                )
-            ''')
-            
-            # Copy data from old table to new table (excluding is_available column)
-            self.cursor.execute('''
-                INSERT INTO gold_inventory_new 
-                (inventory_id, gold_type_id, weight_grams, purity_percentage, form, description, received_date, supplier_info)
-                SELECT inventory_id, gold_type_id, weight_grams, purity_percentage, form, description, received_date, supplier_info
-                FROM gold_inventory
-            ''')
-            
-            # Drop old table and rename new table
-            self.cursor.execute('DROP TABLE gold_inventory')
-            self.cursor.execute('ALTER TABLE gold_inventory_new RENAME TO gold_inventory')
-        
-        # Freelancers table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS freelancers (
-                freelancer_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                full_name TEXT NOT NULL,
-                specialization TEXT,
-                phone TEXT,
-                address TEXT,
-                bank_details TEXT,
-                joined_date TEXT NOT NULL,
-                is_active BOOLEAN DEFAULT 1
-            )
-        ''')
-        
-        # Designs table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS designs (
-                design_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                design_name TEXT NOT NULL,
-                design_code TEXT UNIQUE,
-                category TEXT NOT NULL,
-                complexity_level TEXT NOT NULL,
-                estimated_gold_weight REAL NOT NULL,
-                design_specifications TEXT,
-                is_active BOOLEAN DEFAULT 1
-            )
-        ''')
-        
-        # Work Orders table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS work_orders (
-                work_order_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                freelancer_id INTEGER,
-                gold_type_id INTEGER,
-                jewelry_design TEXT NOT NULL,
-                original_metal_weight REAL NOT NULL,
-                gold_weight_issued REAL NOT NULL,
-                expected_final_weight REAL NOT NULL,
-                issue_date TEXT NOT NULL,
-                expected_completion_date TEXT,
-                status TEXT DEFAULT 'issued',
-                special_instructions TEXT,
-                wastage_weight REAL DEFAULT 0,
-                final_jewelry_weight REAL DEFAULT 0,
-                completion_date TEXT,
-                notes TEXT,
-                FOREIGN KEY (freelancer_id) REFERENCES freelancers (freelancer_id),
-                FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
-            )
-        ''')
-        
-        # Check if original_metal_weight column exists and add it if it doesn't
-        self.cursor.execute("PRAGMA table_info(work_orders)")
-        columns = [column[1] for column in self.cursor.fetchall()]
-        if 'original_metal_weight' not in columns:
-            # Add the new column to existing table
-            self.cursor.execute('ALTER TABLE work_orders ADD COLUMN original_metal_weight REAL DEFAULT 0')
-            print("Added original_metal_weight column to work_orders table")
-        
-        # Suppliers table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS suppliers (
-                supplier_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                supplier_name TEXT NOT NULL,
-                contact_person TEXT,
-                phone TEXT,
-                email TEXT,
-                address TEXT,
-                gst_number TEXT,
-                is_active BOOLEAN DEFAULT 1,
-                balance REAL DEFAULT 0.0
-            )
-        ''')
-        
-        # Gold Purchases table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS gold_purchases (
-                purchase_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                supplier_id INTEGER,
-                gold_type_id INTEGER,
-                weight_grams REAL NOT NULL,
-                purity_percentage REAL NOT NULL,
-                purchase_date TEXT NOT NULL,
-                invoice_number TEXT,
-                notes TEXT,
-                FOREIGN KEY (supplier_id) REFERENCES suppliers (supplier_id),
-                FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
-            )
-        ''')
-        
-        # Raini Orders table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS raini_orders (
-                raini_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                purity_percentage REAL NOT NULL,
-                pure_gold_weight REAL NOT NULL,
-                impurities_weight REAL NOT NULL,
-                total_weight REAL NOT NULL,
-                created_date TEXT NOT NULL,
-                status TEXT DEFAULT 'Active',
-                notes TEXT
-            )
-        ''')
-        
-        # Check if copper_percentage column exists and add it if it doesn't
-        self.cursor.execute("PRAGMA table_info(raini_orders)")
-        columns = [column[1] for column in self.cursor.fetchall()]
-        
-        if 'copper_percentage' not in columns:
-            print("Adding copper and silver columns to raini_orders table...")
-            self.cursor.execute('ALTER TABLE raini_orders ADD COLUMN copper_percentage REAL DEFAULT 0')
-            self.cursor.execute('ALTER TABLE raini_orders ADD COLUMN copper_weight REAL DEFAULT 0')
-            self.cursor.execute('ALTER TABLE raini_orders ADD COLUMN silver_percentage REAL DEFAULT 0')
-            self.cursor.execute('ALTER TABLE raini_orders ADD COLUMN silver_weight REAL DEFAULT 0')
-            print("Successfully added copper and silver columns")
-        
-        # Check if actual_weight column exists and add it if it doesn't
-        self.cursor.execute("PRAGMA table_info(raini_orders)")
-        columns = [column[1] for column in self.cursor.fetchall()]
-        
-        if 'actual_weight' not in columns:
-            print("Adding actual_weight column to raini_orders table...")
-            self.cursor.execute('ALTER TABLE raini_orders ADD COLUMN actual_weight REAL DEFAULT 0')
-            print("Successfully added actual_weight column")
-        
-        # Check and add inventory columns to items table
+    def _execute(self, query, params=None):
+        """Run a statement on a fresh cursor of the writer connection.
+        Each call owns its cursor, so an interleaved call (e.g. a Tk callback firing
+        while a caller is still reading results) can't replace another call's result set.
+        """
+        return self.conn.execute(query, params or ())
+
+    def _record_statement(self, conn, query, params, started, rows):
+        """Add a finished statement to the metrics and log it if it ran over the slow-query threshold"""
+        elapsed = time.perf_counter() - started
+        metrics.record(sql_metric_name(query), elapsed, rows)
+        if self.slow_query_ms is not None and elapsed * 1000 >= self.slow_query_ms:
+            self._log_slow_query(conn, query, params, elapsed, rows)
+
+    def _log_slow_query(self, conn, query, params, elapsed, rows):
         try:
-            # Check if items table exists and get its columns
-            self.cursor.execute("PRAGMA table_info(items)")
-            items_columns = [column[1] for column in self.cursor.fetchall()]
-            
-            if 'fine_weight' not in items_columns:
-                print("Adding fine_weight column to items table...")
-                self.cursor.execute('ALTER TABLE items ADD COLUMN fine_weight REAL DEFAULT 0.0')
-                print("Successfully added fine_weight column to items")
-            
-            if 'net_weight' not in items_columns:
-                print("Adding net_weight column to items table...")
-                self.cursor.execute('ALTER TABLE items ADD COLUMN net_weight REAL DEFAULT 0.0')
-                print("Successfully added net_weight column to items")
-        except sqlite3.OperationalError as e:
-            print(f"Error checking items table columns: {e}")
-        
-        # Check and add balance column to suppliers table
+            plan_rows = conn.execute('EXPLAIN QUERY PLAN ' + query, params or ()).fetchall()
+            depth = {0: -1}
+            plan = []
+            for node_id, parent, _, detail in plan_rows:
+                depth[node_id] = depth.get(parent, -1) + 1
+                plan.append('    ' + '  ' * depth[node_id] + detail)
+            plan = '\n'.join(plan)
+        except sqlite3.Error as e:
+            plan = f"    (plan unavailable: {e})"
+        slow_query_logger.warning("%.1f ms, %s rows\n  sql: %s\n  params: %s\n  plan:\n%s",
+                                  elapsed * 1000, rows, ' '.join(query.split()),
+                                  repr(params)[:SLOW_QUERY_PARAMS_LENGTH], plan)
+
+    def read_all(self, conn, query, params=None, row_factory=None):
+        """fetchall() of a query on the given (usually pooled read) connection, timed like execute_query.
+        row_factory(cursor, row), if given, builds each row as it is fetched (see sqlite3.Cursor.row_factory).
+        """
+        start = time.perf_counter()
+        cursor = conn.execute(query, params or ())
+        if row_factory is not None:
+            cursor.row_factory = row_factory
         try:
-            # Check if suppliers table exists and get its columns
-            self.cursor.execute("PRAGMA table_info(suppliers)")
-            suppliers_columns = [column[1] for column in self.cursor.fetchall()]
-            
-            if 'balance' not in suppliers_columns:
-                print("Adding balance column to suppliers table...")
-                self.cursor.execute('ALTER TABLE suppliers ADD COLUMN balance REAL DEFAULT 0.0')
-                print("Successfully added balance column to suppliers")
-        except sqlite3.OperationalError as e:
-            print(f"Error checking suppliers table columns: {e}")
-        
-        # Add gold price per gram setting (global setting)
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        self._record_statement(conn, query, params, start, len(rows))
+        return rows
+
+    def read_one(self, conn, query, params=None):
+        """fetchone() counterpart of read_all"""
+        start = time.perf_counter()
+        cursor = conn.execute(query, params or ())
         try:
-            # Check if settings table exists
-            self.cursor.execute("PRAGMA table_info(settings)")
-            settings_columns = [column[1] for column in self.cursor.fetchall()]
-            
-            if not settings_columns:  # Table doesn't exist
-                print("Creating settings table...")
-                self.cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS settings (
-                        setting_key TEXT PRIMARY KEY,
-                        setting_value TEXT
-                    )
-                ''')
-                print("Settings table created")
-            
-            # Check if gold_price_per_gram setting exists
-            self.cursor.execute("SELECT setting_value FROM settings WHERE setting_key = 'gold_price_per_gram'")
-            if not self.cursor.fetchone():
-                print("Adding default gold price per gram setting...")
-                self.cursor.execute("INSERT INTO settings (setting_key, setting_value) VALUES ('gold_price_per_gram', '5000')")
-                print("Default gold price set to ₹5000 per gram")
-        except sqlite3.OperationalError as e:
-            print(f"Error setting up gold price: {e}")
-        
-        # Items table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS items (
-                item_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                item_name TEXT NOT NULL,
-                item_code TEXT UNIQUE,
-                description TEXT,
-                category TEXT,
-                is_active BOOLEAN DEFAULT 1,
-                fine_weight REAL DEFAULT 0.0,
-                net_weight REAL DEFAULT 0.0,
-                created_date TEXT DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Sales table
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sales (
-                sale_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                ref_id TEXT NOT NULL,
-                supplier_name TEXT NOT NULL,
-                item_id INTEGER,
-                gross_weight REAL NOT NULL,
-                less_weight REAL NOT NULL,
-                net_weight REAL NOT NULL,
-                tunch_percentage REAL NOT NULL,
-                wastage_percentage REAL NOT NULL,
-                fine_gold REAL NOT NULL,
-                sale_date TEXT NOT NULL,
-                notes TEXT,
-                FOREIGN KEY (item_id) REFERENCES items (item_id)
-            )
-        ''')
-        
-    def migrate_database(self):
-        """Migrate existing database schema if needed"""
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+        self._record_statement(conn, query, params, start, 0 if row is None else 1)
+        return row
+
+    def execute_named(self, name, params=None, row_factory=None):
+        """Execute a registered query (see QUERIES) and return its rows"""
+        return self.execute_query(QUERIES[name], params, row_factory)
+
+    def update_named(self, name, params=None):
+        """Execute a registered write statement (see QUERIES) and commit"""
+        return self.execute_update(QUERIES[name], params)
+
+    def execute_query(self, query, params=None, row_factory=None):
+        """Execute a query and return results"""
+        start = time.perf_counter()
         try:
-            # Check if ref_id column has UNIQUE constraint
-            cursor = self.cursor.execute("PRAGMA table_info(sales)")
-            columns = cursor.fetchall()
-            
-            # Check if we need to recreate the sales table to remove UNIQUE constraint
-            cursor = self.cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='sales'")
-            table_sql = cursor.fetchone()
-            
-            if table_sql and 'ref_id TEXT UNIQUE' in table_sql[0]:
-                print("Migrating sales table to remove UNIQUE constraint from ref_id...")
-                
-                # Create new table without UNIQUE constraint
-                self.cursor.execute('''
-                    CREATE TABLE sales_new (
-                        sale_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        ref_id TEXT NOT NULL,
-                        supplier_name TEXT NOT NULL,
-                        item_id INTEGER,
-                        gross_weight REAL NOT NULL,
-                        less_weight REAL NOT NULL,
-                        net_weight REAL NOT NULL,
-                        tunch_percentage REAL NOT NULL,
-                        wastage_percentage REAL NOT NULL,
-                        fine_gold REAL NOT NULL,
-                        sale_date TEXT NOT NULL,
-                        notes TEXT,
-                        FOREIGN KEY (item_id) REFERENCES items (item_id)
-                    )
-                ''')
-                
-                # Copy data from old table to new table
-                self.cursor.execute('''
-                    INSERT INTO sales_new 
-                    SELECT * FROM sales
-                ''')
-                
-                # Drop old table
-                self.cursor.execute('DROP TABLE sales')
-                
-                # Rename new table
-                self.cursor.execute('ALTER TABLE sales_new RENAME TO sales')
-                
-                print("Sales table migration completed successfully")
-                
-        except Exception as e:
-            print(f"Database migration error: {e}")
-            # Continue execution even if migration fails
-    
-    def insert_default_data(self):
-        """Insert default data into tables"""
-        # Insert default gold types if not exists
-        self.cursor.execute('''
-            INSERT OR IGNORE INTO gold_types (name, purity_percentage, description)
-            VALUES 
-                ('24K', 99.9, 'Pure gold'),
-                ('22K', 91.7, '22 karat gold'),
-                ('18K', 75.0, '18 karat gold'),
-                ('14K', 58.3, '14 karat gold')
-        ''')
+            cursor = self._execute(query, params)
+            if row_factory is not None:
+                cursor.row_factory = row_factory
+            try:
+                rows = cursor.fetchall()
+            finally:
+                cursor.close()
+            self._record_statement(self.conn, query, params, start, len(rows))
+            return rows
+        except sqlite3.Error as e:
+            logger.error("Query execution error: %s", e)
+            raise e
     
-    def execute_query(self, query, params=None):
-        """Execute a query and return results"""
+    def iter_query(self, query, params=None, chunk_size=ITER_CHUNK_SIZE, conn=None):
+        """Yield a query's rows lazily, fetching chunk_size rows at a time.
+        Runs on its own cursor (of conn, or the writer connection) which is closed
+        when the generator is exhausted or closed early.
+        """
         try:
-            if params:
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
-            return self.cursor.fetchall()
+            cursor = (conn or self.conn).execute(query, params or ())
         except sqlite3.Error as e:
-            print(f"Query execution error: {e}")
+            logger.error("Query execution error: %s", e)
             raise e
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+
+    def iter_read(self, query, params=None, chunk_size=ITER_CHUNK_SIZE):
+        """iter_query on a read_pool connection, held until the generator is exhausted or closed.
+        For streaming a listing across event-loop ticks without keeping a cursor open on the writer;
+        only committed rows are seen.
+        """
+        with self.read_pool.connection() as conn:
+            yield from self.iter_query(query, params, chunk_size, conn)
     
     def execute_update(self, query, params=None):
         """Execute an update query"""
+        start = time.perf_counter()
         try:
-            if params:
-                self.cursor.execute(query, params)
-            else:
-                self.cursor.execute(query)
+            cursor = self._execute(query, params)
             self.conn.commit()
-            return self.cursor.rowcount
+            rowcount = cursor.rowcount
+            cursor.close()
+            self._record_statement(self.conn, query, params, start, max(rowcount, 0))
+            return rowcount
         except sqlite3.Error as e:
-            print(f"Update execution error: {e}")
+            logger.error("Update execution error: %s", e)
             self.conn.rollback()
             raise e
     
+    @contextmanager
+    def transaction(self):
+        """Run a block of writes as a single transaction on the writer connection.
+        Commits when the block succeeds and rolls back if it raises. Use the yielded
+        connection (not execute_update, which commits per call) inside the block.
+        """
+        try:
+            yield self.conn
+            self.conn.commit()
+        except Exception:
+            self.conn.rollback()
+            raise
+
+    # -------------------------
+    # Background (off UI thread) reads
+    # -------------------------
+    def _get_query_executor(self):
+        if self._query_executor is None:
+            self._query_executor = ThreadPoolExecutor(max_workers=self.read_pool.size, thread_name_prefix='db-read')
+        return self._query_executor
+
+    def submit_read(self, job, *args, tk_root=None, callback=None, error_callback=None):
+        """Run job(conn, *args) on a pooled read-only connection in a worker thread. Returns a Future.
+
+        When tk_root and callback are given, callback(result) (or error_callback(exc)) is invoked
+        on the Tk thread via tk_root.after once the job finishes. Must then be called from the Tk thread.
+        """
+        def run():
+            with self.read_pool.connection() as conn:
+                return job(conn, *args)
+
+        future = self._get_query_executor().submit(run)
+        if tk_root is not None and (callback or error_callback):
+            self.deliver_to_tk(tk_root, future, callback, error_callback)
+        return future
+
+    def submit_write(self, job, *args, tk_root=None, callback=None, error_callback=None, on_poll=None):
+        """Run job(conn, *args) as one transaction in a worker thread. Returns a Future.
+
+        The writer connection belongs to the Tk thread, so the job gets a read-write connection of
+        its own, committed when job returns and rolled back if it raises. Call from the Tk thread:
+        pending writes are committed first so the worker can take the write lock. Writes on the
+        writer connection wait (up to its busy timeout) while the job holds that lock.
+        Callbacks are delivered as for submit_read; on_poll() also runs on the Tk thread while it waits.
+        """
+        self.commit_pending()
+
+        def run():
+            conn = sqlite3.connect(self.db_path, timeout=BACKGROUND_WRITE_TIMEOUT)
+            try:
+                with conn:
+                    return job(conn, *args)
+            finally:
+                conn.close()
+
+        future = self._get_query_executor().submit(run)
+        if tk_root is not None and (callback or error_callback or on_poll):
+            self.deliver_to_tk(tk_root, future, callback, error_callback, on_poll=on_poll)
+        return future
+
+    def submit_query(self, query, params=None, tk_root=None, callback=None, error_callback=None):
+        """Run a read query in the background. Returns a Future resolving to the fetched rows."""
+        return self.submit_read(self.read_all, query, params, tk_root=tk_root, callback=callback, error_callback=error_callback)
+
+    @staticmethod
+    def deliver_to_tk(tk_root, future, callback=None, error_callback=None, poll_ms=TK_POLL_INTERVAL_MS,
+                      on_poll=None):
+        """Poll future from the Tk event loop and hand its outcome to the callbacks on the Tk thread.
+        on_poll(), if given, is called at each poll while the future is still running (e.g. to show progress).
+        """
+        def poll():
+            if not future.done():
+                if on_poll:
+                    on_poll()
+                tk_root.after(poll_ms, poll)
+                return
+            error = future.exception()
+            if error is not None:
+                if error_callback:
+                    error_callback(error)
+                else:
+                    logger.error("Background query error: %s", error)
+            elif callback:
+                callback(future.result())
+
+        tk_root.after(poll_ms, poll)
+
     def close_connection(self):
         """Close database connection"""
+        if self._query_executor is not None:
+            self._query_executor.shutdown(wait=True)
+            self._query_executor = None
+        self.read_pool.close_all()
         if self.conn:
             self.conn.close()
-            print("Database connection closed")
+            logger.info("Database connection closed")
 
     # -------------------------
     # Backup/Restore/Export APIs
@@ -424,6 +757,11 @@ class DatabaseManager:
         except Exception:
             return self.db_path
 
+    def commit_pending(self):
+        """Commit any open transaction on the writer connection, so other connections see it.
+        The writer belongs to the thread that opened it; call this from there."""
+        self.conn.commit()
+
     def backup_to(self, dest_file_path: str) -> str:
         """Create a copy of the database file at dest_file_path. Returns the path written."""
         if not dest_file_path:
@@ -435,96 +773,174 @@ class DatabaseManager:
             self.conn.commit()
         except Exception:
             pass
-        src = self.get_db_path()
-        shutil.copy2(src, dest_file_path)
-        print(f"Database backed up to: {dest_file_path}")
+        # Online backup includes pages still held in the WAL file, unlike a plain file copy
+        dest_conn = sqlite3.connect(dest_file_path)
+        try:
+            self.conn.backup(dest_conn)
+        finally:
+            dest_conn.close()
+        logger.info("Database backed up to: %s", dest_file_path)
         return dest_file_path
 
     def restore_from(self, source_file_path: str) -> None:
         """Restore database from source_file_path. Closes and reopens the connection."""
         if not source_file_path or not os.path.exists(source_file_path):
             raise FileNotFoundError("Backup file not found")
-        # Close current connection
+        # Close current connections (background readers first, so the writer checkpoints the WAL)
+        self.read_pool.close_all()
         if self.conn:
             try:
                 self.conn.close()
             except Exception:
                 pass
-        # Replace the db file
+        # Replace the db file, dropping any WAL/shared-memory files that belong to the old one
         dest = self.get_db_path()
         os.makedirs(os.path.dirname(dest) or '.', exist_ok=True)
+        for suffix in ('-wal', '-shm'):
+            if os.path.exists(dest + suffix):
+                os.remove(dest + suffix)
         shutil.copy2(source_file_path, dest)
         # Reopen
         self.init_database()
-        print(f"Database restored from: {source_file_path}")
+        logger.info("Database restored from: %s", source_file_path)
 
-    def table_exists(self, table_name: str) -> bool:
+    def table_exists(self, table_name: str, conn=None) -> bool:
+        if conn is not None:
+            row = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,)).fetchone()
+            return bool(row)
         row = self.execute_query("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
         return bool(row)
 
-    def export_table_to_csv(self, table_name: str, csv_file_path: str) -> str:
-        """Export a single table to CSV. Returns the file path written."""
-        if not self.table_exists(table_name):
-            print(f"Table '{table_name}' does not exist, skipping export")
-            return ''
-        # Fetch column names
-        cols = self.execute_query(f"PRAGMA table_info({table_name})")
-        headers = [c[1] for c in cols]
-        rows = self.execute_query(f"SELECT * FROM {table_name}")
-        os.makedirs(os.path.dirname(csv_file_path), exist_ok=True)
-        with open(csv_file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
+    def change_version(self, tables, conn=None):
+        """Snapshot of the write counters of tables (see migrations.create_change_counter). Two equal
+        snapshots mean none of the tables was written in between, from any connection; reopening or
+        restoring the database changes the snapshot too. Tables without a counter read as None.
+        """
+        if conn is None:
+            rows = self.execute_named('changes.all')
+        else:
+            rows = self.read_all(conn, QUERIES['changes.all'])
+        counters = {table_name: (inserts, rewrites) for table_name, inserts, rewrites in rows}
+        return (self.generation,) + tuple(counters.get(table_name) for table_name in tables)
+
+    @staticmethod
+    def _open_export_file(csv_file_path: str, compress: bool):
+        """Open an export target for text writing, gzip-compressed when requested."""
+        os.makedirs(os.path.dirname(csv_file_path) or '.', exist_ok=True)
+        if compress:
+            return gzip.open(csv_file_path, 'wt', newline='', encoding='utf-8')
+        return open(csv_file_path, 'w', newline='', encoding='utf-8')
+
+    @staticmethod
+    def _write_cursor_to_csv(cursor, f, chunk_size, on_rows=None) -> int:
+        """Stream a cursor's result set into an open file in fetchmany() chunks. Returns rows written."""
+        writer = csv.writer(f)
+        writer.writerow([d[0] for d in cursor.description])
+        written = 0
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
             writer.writerows(rows)
-        print(f"Exported table '{table_name}' to {csv_file_path}")
+            written += len(rows)
+            if on_rows:
+                on_rows(written)
+        return written
+
+    def export_table_to_csv(self, table_name: str, csv_file_path: str, compress: bool = False,
+                            chunk_size: int = EXPORT_CHUNK_SIZE, conn=None, progress_callback=None) -> str:
+        """Export a single table to CSV (optionally gzip). Returns the file path written.
+        Rows are streamed from the cursor so memory use does not grow with table size.
+        progress_callback(table_name, rows_written) is called after every chunk.
+        """
+        conn = conn or self.conn
+        if not self.table_exists(table_name, conn):
+            logger.debug("Table '%s' does not exist, skipping export", table_name)
+            return ''
+        if compress and not csv_file_path.endswith('.gz'):
+            csv_file_path += '.gz'
+        on_rows = (lambda n: progress_callback(table_name, n)) if progress_callback else None
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f'SELECT * FROM "{table_name}"')
+            with self._open_export_file(csv_file_path, compress) as f:
+                written = self._write_cursor_to_csv(cursor, f, chunk_size, on_rows)
+        finally:
+            cursor.close()
+        logger.info("Exported table '%s' (%s rows) to %s", table_name, written, csv_file_path)
         return csv_file_path
 
-    def export_supplier_ledger_csv(self, csv_file_path: str) -> str:
+    def export_supplier_ledger_csv(self, csv_file_path: str, compress: bool = False,
+                                   chunk_size: int = EXPORT_CHUNK_SIZE, conn=None, progress_callback=None) -> str:
         """Export a derived supplier ledger: +fine_gold for Sales, -fine_gold for Purchases."""
+        conn = conn or self.conn
         parts = []
-        if self.table_exists('sales'):
+        if self.table_exists('sales', conn):
             parts.append(
                 "SELECT sale_date as date, ref_id, supplier_name, fine_gold as delta_fine_gold, 'Sale' as type FROM sales"
             )
-        if self.table_exists('purchases'):
+        if self.table_exists('purchases', conn):
             parts.append(
                 "SELECT purchase_date as date, ref_id, supplier_name, -fine_gold as delta_fine_gold, 'Purchase' as type FROM purchases"
             )
         if not parts:
-            print("No sales/purchases tables present; skipping supplier ledger export")
+            logger.debug("No sales/purchases tables present; skipping supplier ledger export")
             return ''
+        if compress and not csv_file_path.endswith('.gz'):
+            csv_file_path += '.gz'
         union_sql = " UNION ALL ".join(parts) + " ORDER BY date ASC"
-        rows = self.execute_query(union_sql)
-        headers = ['date', 'ref_id', 'supplier_name', 'delta_fine_gold', 'type']
-        os.makedirs(os.path.dirname(csv_file_path), exist_ok=True)
-        with open(csv_file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(headers)
-            for r in rows:
-                writer.writerow(r)
-        print(f"Exported supplier ledger to {csv_file_path}")
+        on_rows = (lambda n: progress_callback('supplier_ledger', n)) if progress_callback else None
+        cursor = conn.cursor()
+        try:
+            cursor.execute(union_sql)
+            with self._open_export_file(csv_file_path, compress) as f:
+                self._write_cursor_to_csv(cursor, f, chunk_size, on_rows)
+        finally:
+            cursor.close()
+        logger.info("Exported supplier ledger to %s", csv_file_path)
         return csv_file_path
 
-    def export_all_to_dir(self, export_dir: str) -> dict:
-        """Export key tables and derived ledgers to CSV files in export_dir. Returns dict of names to paths."""
+    def export_targets(self) -> list:
+        """Names produced by export_all_to_dir: the core tables plus the derived ledger."""
+        return EXPORT_TABLES + ['supplier_ledger']
+
+    def export_all_to_dir(self, export_dir: str, compress: bool = False, progress_callback=None,
+                          max_workers: int = EXPORT_MAX_WORKERS) -> dict:
+        """Export key tables and derived ledgers to CSV files in export_dir. Returns dict of names to paths.
+
+        Tables are exported concurrently on read-only pool connections, so this is safe to run
+        from a background thread; call commit_pending() on the owning thread first. The exports see
+        committed data only. progress_callback(name, rows_written, finished) is invoked from the
+        worker threads; UI callers must marshal it back onto the Tk thread themselves.
+        """
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         os.makedirs(export_dir, exist_ok=True)
-        out = {}
+
         def p(name):
             return os.path.join(export_dir, f"{name}_{timestamp}.csv")
-        # Core tables
-        for table in ['suppliers', 'items', 'sales', 'purchases', 'karigar_orders', 'karigar_order_items', 'raini_orders']:
-            try:
-                path = self.export_table_to_csv(table, p(table))
-                if path:
-                    out[table] = path
-            except Exception as e:
-                print(f"Error exporting {table}: {e}")
-        # Ledgers (derived)
-        try:
-            ledger_path = self.export_supplier_ledger_csv(p('supplier_ledger'))
-            if ledger_path:
-                out['supplier_ledger'] = ledger_path
-        except Exception as e:
-            print(f"Error exporting supplier_ledger: {e}")
+
+        def on_rows(name, rows_written):
+            if progress_callback:
+                progress_callback(name, rows_written, False)
+
+        def run_export(name):
+            with self.read_pool.connection() as conn:
+                if name == 'supplier_ledger':
+                    return self.export_supplier_ledger_csv(p(name), compress, conn=conn, progress_callback=on_rows)
+                return self.export_table_to_csv(name, p(name), compress, conn=conn, progress_callback=on_rows)
+
+        out = {}
+        names = self.export_targets()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='csv-export') as pool:
+            futures = {pool.submit(run_export, name): name for name in names}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    path = future.result()
+                    if path:
+                        out[name] = path
+                except Exception as e:
+                    logger.error("Error exporting %s: %s", name, e)
+                if progress_callback:
+                    progress_callback(name, None, True)
         return out
@@ -7,6 +7,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from database import DatabaseManager
+from app_logging import get_logger
+
+logger = get_logger(__name__)
 
 class FreelancerManager:
     def __init__(self, db_manager, toast_callback=None):
@@ -36,7 +39,7 @@ class FreelancerManager:
                 ORDER BY full_name
             '''
             rows = self.db.execute_query(query)
-            print(f"Loaded {len(rows)} freelancers from database")
+            logger.debug("Loaded %s freelancers from database", len(rows))
             
             for row in rows:
                 active = "Yes" if row[6] else "No"
@@ -53,7 +56,7 @@ class FreelancerManager:
                 self.freelancers_tree.insert('', 'end', values=values)
                 
         except Exception as e:
-            print(f"Error loading freelancers: {e}")
+            logger.error("Error loading freelancers: %s", e)
             messagebox.showerror("Database Error", f"Error loading freelancers: {str(e)}")
     
     def add_freelancer(self, parent_window):
@@ -121,7 +124,7 @@ class FreelancerManager:
             phone = phone_entry.get().strip()
             address = address_entry.get().strip()
             
-            print(f"Attempting to save freelancer: {full_name}")
+            logger.debug("Attempting to save freelancer: %s", full_name)
             
             # Validation - only name is required
             if not full_name:
@@ -136,23 +139,23 @@ class FreelancerManager:
                     VALUES (?, ?, ?, ?)
                 '''
                 self.db.execute_update(query, (full_name, phone, address, datetime.now().strftime("%Y-%m-%d")))
-                print(f"Freelancer '{full_name}' saved to database successfully")
+                logger.info("Freelancer '%s' saved to database successfully", full_name)
                 
                 # Show success message using toast callback if available
                 if self.toast_callback:
                     self.toast_callback(f"Freelancer '{full_name}' added successfully!", success=True)
                 else:
-                    print(f"Freelancer '{full_name}' added successfully!")
+                    logger.info("Freelancer '%s' added successfully!", full_name)
 
                 # Refresh the freelancers list
-                print("Refreshing freelancers list...")
+                logger.debug("Refreshing freelancers list...")
                 self.load_freelancers()
                 
                 # Close the window
                 add_window.destroy()
                 
             except Exception as e:
-                print(f"Database error saving freelancer: {e}")
+                logger.error("Database error saving freelancer: %s", e)
                 messagebox.showerror("Database Error", f"Error saving freelancer: {str(e)}")
         
         def cancel():
@@ -331,7 +334,7 @@ class FreelancerManager:
                 if self.toast_callback:
                     self.toast_callback(f"Freelancer '{full_name}' updated successfully!", success=True)
                 else:
-                    print(f"Freelancer '{full_name}' updated successfully!")
+                    logger.info("Freelancer '%s' updated successfully!", full_name)
                 
                 # Refresh the freelancers list
                 self.load_freelancers()
@@ -363,7 +366,7 @@ class FreelancerManager:
                     if self.toast_callback:
                         self.toast_callback(f"Freelancer '{freelancer_data[0]}' deleted successfully!", success=True)
                     else:
-                        print(f"Freelancer '{freelancer_data[0]}' deleted successfully!")
+                        logger.info("Freelancer '%s' deleted successfully!", freelancer_data[0])
                     
                     # Refresh the freelancers list
                     self.load_freelancers()
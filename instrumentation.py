@@ -0,0 +1,145 @@
+"""
+Instrumentation module for Gold Jewelry Business Management System
+Collects in-memory latency histograms (count, p50/p95/p99, rows) for hot paths and SQL statements
+"""
+
+import functools
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Most recent samples kept per metric for percentiles (count/total/max cover every call)
+SAMPLE_WINDOW = 2048
+# SQL metric names are the statement text, whitespace-collapsed and cut to this length
+SQL_NAME_LENGTH = 120
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class Histogram:
+    """Latency samples and row counts for one metric"""
+
+    __slots__ = ('count', 'total', 'max', 'rows', 'samples')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rows = 0
+        self.samples = deque(maxlen=SAMPLE_WINDOW)
+
+    def add(self, seconds, rows=None):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        if rows:
+            self.rows += rows
+        self.samples.append(seconds)
+
+    @staticmethod
+    def _percentile(ordered, pct):
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered) + 0.5)) - 1))
+        return ordered[index]
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_ms': round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            'p50_ms': round(self._percentile(ordered, 50) * 1000, 3),
+            'p95_ms': round(self._percentile(ordered, 95) * 1000, 3),
+            'p99_ms': round(self._percentile(ordered, 99) * 1000, 3),
+            'max_ms': round(self.max * 1000, 3),
+            'rows': self.rows,
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe collection of named histograms"""
+
+    def __init__(self):
+        self._histograms = {}
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+
+    def record(self, name, seconds, rows=None):
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.add(seconds, rows)
+
+    def snapshot(self):
+        """{name: summary} for every metric, slowest total first"""
+        with self._lock:
+            items = [(name, h.summary()) for name, h in self._histograms.items()]
+        items.sort(key=lambda kv: kv[1]['total_ms'], reverse=True)
+        return dict(items)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self.started_at = datetime.now()
+
+    def dump_json(self, path, extra=None):
+        """Write the current snapshot (plus any extra sections) to a JSON file"""
+        report = {
+            'collected_since': self.started_at.isoformat(timespec='seconds'),
+            'written_at': datetime.now().isoformat(timespec='seconds'),
+            'metrics': self.snapshot(),
+        }
+        report.update(extra or {})
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        return path
+
+
+metrics = MetricsRegistry()
+
+
+class _Timing:
+    """Handle yielded by timer(); set .rows to attach a row count to the sample"""
+
+    __slots__ = ('rows',)
+
+    def __init__(self):
+        self.rows = None
+
+
+@contextmanager
+def timer(name):
+    """Time the enclosed block as one sample of the named metric"""
+    timing = _Timing()
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        metrics.record(name, time.perf_counter() - start, timing.rows)
+
+
+def timed(name):
+    """Decorator recording each call's duration under the given metric name"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.record(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+@functools.lru_cache(maxsize=512)
+def sql_metric_name(query):
+    """Metric name for a SQL statement: 'sql: ' plus its normalized, truncated text"""
+    return 'sql: ' + _WHITESPACE.sub(' ', query).strip()[:SQL_NAME_LENGTH]
@@ -7,12 +7,17 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from database import DatabaseManager
+from app_logging import get_logger
+from services import InventoryService
+
+logger = get_logger(__name__)
 
 class InventoryManager:
     def __init__(self, db_manager, main_app=None):
         """Initialize inventory manager with database connection and optional main app reference"""
         self.db = db_manager
         self.main_app = main_app
+        self.service = InventoryService(db_manager)
         self.inventory_tree = None
     
     def set_inventory_tree(self, tree):
@@ -44,7 +49,7 @@ class InventoryManager:
                     f"{row[2]:.1f}", row[3], row[4], row[5]
                 ))
         except Exception as e:
-            print(f"Error loading inventory: {e}")
+            logger.error("Error loading inventory: %s", e)
             messagebox.showerror("Database Error", f"Error loading inventory: {str(e)}")
     
     def get_total_gold_available(self):
@@ -58,7 +63,7 @@ class InventoryManager:
             total_weight = result[0][0] if result and result[0][0] is not None else 0
             return total_weight
         except Exception as e:
-            print(f"Error calculating total gold: {e}")
+            logger.error("Error calculating total gold: %s", e)
             return 0
     
     def add_gold(self, parent_window):
@@ -213,7 +218,7 @@ class InventoryManager:
                 if self.main_app:
                     self.main_app.show_toast(f"Gold added to inventory successfully! • Weight: {weight:.2f}g • Purity: {gold_percentage:.1f}% • Date: {received_date}", success=True)
                 else:
-                    print(f"Gold added to inventory successfully! Weight: {weight:.2f} grams, Purity: {gold_percentage:.1f}%, Date: {received_date}")
+                    logger.info("Gold added to inventory successfully! Weight: %.2f grams, Purity: %.1f%%, Date: %s", weight, gold_percentage, received_date)
                 
                 # Refresh data
                 self.load_inventory()
@@ -475,7 +480,7 @@ class InventoryManager:
                 if self.main_app:
                     self.main_app.show_toast(f"Gold purchase recorded successfully! • Supplier: {supplier_name} • Weight: {weight:.2f}g • Purity: {gold_purity}% • Form: {gold_form}", success=True)
                 else:
-                    print(f"Gold purchase recorded successfully! Supplier: {supplier_name}, Weight: {weight:.2f} grams, Purity: {gold_purity}%, Form: {gold_form}")
+                    logger.info("Gold purchase recorded successfully! Supplier: %s, Weight: %.2f grams, Purity: %s%%, Form: %s", supplier_name, weight, gold_purity, gold_form)
                 
                 # Refresh data
                 self.load_inventory()
@@ -529,7 +534,7 @@ class InventoryManager:
             if self.main_app:
                 self.main_app.show_toast("Form cleared! Ready for new purchase", success=True)
             else:
-                print("Form cleared! Ready for new purchase")
+                logger.debug("Form cleared! Ready for new purchase")
         
         # Create the new purchase button with more prominent styling
         new_purchase_btn = tk.Button(new_purchase_frame, text="🔄 CREATE NEW PURCHASE", command=create_new_purchase,
@@ -549,10 +554,10 @@ class InventoryManager:
         new_purchase_btn.bind("<Leave>", on_leave_new_purchase)
         
         # Debug: Print button info
-        print(f"New purchase button created: {new_purchase_btn}")
-        print(f"Button frame children: {len(new_purchase_frame.winfo_children())}")
-        print(f"Button text: {new_purchase_btn['text']}")
-        print(f"Button geometry: {new_purchase_btn.winfo_geometry()}")
+        logger.debug("New purchase button created: %s", new_purchase_btn)
+        logger.debug("Button frame children: %s", len(new_purchase_frame.winfo_children()))
+        logger.debug("Button text: %s", new_purchase_btn['text'])
+        logger.debug("Button geometry: %s", new_purchase_btn.winfo_geometry())
         
         # Add hover effects
         def on_enter_save(e):
@@ -575,8 +580,8 @@ class InventoryManager:
         purchase_window.focus_force()
         
         # Debug: Print window info
-        print(f"Purchase window geometry: {purchase_window.geometry()}")
-        print(f"Main frame children count: {len(main_frame.winfo_children())}")
+        logger.debug("Purchase window geometry: %s", purchase_window.geometry())
+        logger.debug("Main frame children count: %s", len(main_frame.winfo_children()))
         
         # Set focus and bind keys
         supplier_combo.focus()
@@ -702,7 +707,7 @@ class InventoryManager:
                 if self.main_app:
                     self.main_app.show_toast(f"Inventory item updated successfully! • New Weight: {new_weight:.2f}g", success=True)
                 else:
-                    print(f"Inventory item updated successfully! New Weight: {new_weight:.2f} grams")
+                    logger.info("Inventory item updated successfully! New Weight: %.2f grams", new_weight)
                 
                 # Refresh data
                 self.load_inventory()
@@ -741,7 +746,7 @@ class InventoryManager:
                     if self.main_app:
                         self.main_app.show_toast("Inventory item deleted successfully!", success=True)
                     else:
-                        print("Inventory item deleted successfully!")
+                        logger.info("Inventory item deleted successfully!")
                     
                     # Refresh data
                     self.load_inventory()
@@ -824,9 +829,9 @@ class InventoryManager:
         
         # Create breakdown data
         try:
-            # Get inventory breakdown data from actual database
-            breakdown_data = self.get_inventory_breakdown()
-            print(f"Debug: Retrieved breakdown data: {breakdown_data}")
+            # Count and weight for every form x purity pair, from one query
+            forms, purities, cells = self.get_inventory_breakdown()
+            logger.debug("Debug: Retrieved breakdown data: %s", cells)
             
             # Create summary frame
             summary_frame = tk.Frame(main_frame, bg='white', relief='raised', bd=2)
@@ -842,8 +847,8 @@ class InventoryManager:
             summary_content = tk.Frame(summary_frame, bg='white')
             summary_content.pack(padx=20, pady=(0, 20))
             
-            total_items = sum(sum(category.values()) for category in breakdown_data.values())
-            total_weight = self.get_total_gold_available()
+            total_items = sum(count for (form, _purity), (count, _weight) in cells.items() if form)
+            total_weight = sum(weight for _count, weight in cells.values())
             
             tk.Label(summary_content, text=f"Total Items: {total_items}", 
                     font=("Segoe UI", 12, "bold"), fg='#27ae60', bg='white').pack(anchor='w')
@@ -878,30 +883,22 @@ class InventoryManager:
             breakdown_text = "GOLD INVENTORY BREAKDOWN\n"
             breakdown_text += "=" * 50 + "\n\n"
             
-            for form in ["Chain", "Saman", "Sona"]:
-                purities = breakdown_data.get(form, {})
-                
-                # Calculate total weight for this form
-                total_weight = 0
-                total_count = 0
-                
-                for purity in ["75", "83.3", "91.6", "99.9"]:
-                    weight = self.get_weight_by_form_purity(form, purity)
-                    count = purities.get(purity, 0)
-                    total_weight += weight
-                    total_count += count
+            if not forms:
+                breakdown_text += "No inventory recorded yet.\n"
+
+            for form in forms:
+                # Calculate totals for this form
+                form_cells = [cells.get((form, purity), (0, 0.0)) for purity in purities]
+                total_weight = sum(weight for _count, weight in form_cells)
+                total_count = sum(count for count, _weight in form_cells)
                 
                 # Display form header with total weight
                 breakdown_text += f"📦 {form}: ({total_weight:.2f} grams)\n"
                 breakdown_text += "-" * 40 + "\n"
                 
                 # Display each purity with count
-                for purity in ["75", "83.3", "91.6", "99.9"]:
-                    count = purities.get(purity, 0)
-                    if count > 0:
-                        breakdown_text += f"  {purity}%: {count} {form.lower()}\n"
-                    else:
-                        breakdown_text += f"  {purity}%: 0 {form.lower()}\n"
+                for purity, (count, _weight) in zip(purities, form_cells):
+                    breakdown_text += f"  {purity}%: {count} {form.lower()}\n"
                 
                 # Display total count for this form
                 breakdown_text += f"Total no of {form.lower()}: {total_count}\n"
@@ -931,62 +928,10 @@ class InventoryManager:
         close_btn.bind('<Leave>', on_leave_close)
     
     def get_inventory_breakdown(self):
-        """Get inventory breakdown by form and purity from actual database"""
+        """Get inventory breakdown by form and purity: (forms, purity labels, {(form, purity): [count, weight]})"""
         try:
-            # Query to get actual inventory data grouped by form and purity
-            query = '''
-                SELECT form, purity_percentage, COUNT(*) as count
-                FROM gold_inventory
-                WHERE form IS NOT NULL AND form != ''
-                GROUP BY form, purity_percentage
-                ORDER BY form, purity_percentage
-            '''
-            rows = self.db.execute_query(query)
-            
-            # Initialize breakdown structure
-            breakdown = {
-                'Chain': {'75': 0, '83.3': 0, '91.6': 0, '99.9': 0},
-                'Saman': {'75': 0, '83.3': 0, '91.6': 0, '99.9': 0},
-                'Sona': {'75': 0, '83.3': 0, '91.6': 0, '99.9': 0}
-            }
-            
-            # Populate breakdown with actual data from database
-            for row in rows:
-                form, purity, count = row
-                # Convert purity to string for comparison
-                purity_str = str(purity)
-                
-                # Only include forms we're tracking and valid purities
-                if form in breakdown and purity_str in breakdown[form]:
-                    breakdown[form][purity_str] = count
-                elif form not in ['Chain', 'Saman', 'Sona']:
-                    # Handle other forms that might exist in database
-                    print(f"Found form '{form}' with purity {purity}% and count {count} - not in standard breakdown")
-            
-            return breakdown
-            
+            return self.service.breakdown()
         except Exception as e:
-            print(f"Error getting inventory breakdown: {e}")
+            logger.error("Error getting inventory breakdown: %s", e)
             # Return empty breakdown on error
-            return {
-                'Chain': {'75': 0, '83.3': 0, '91.6': 0, '99.9': 0},
-                'Saman': {'75': 0, '83.3': 0, '91.6': 0, '99.9': 0},
-                'Sona': {'75': 0, '83.3': 0, '91.6': 0, '99.9': 0}
-            }
-    
-    def get_weight_by_form_purity(self, form, purity):
-        """Get total weight for a specific form and purity from actual database"""
-        try:
-            query = '''
-                SELECT SUM(weight_grams) as total_weight
-                FROM gold_inventory
-                WHERE form = ? AND purity_percentage = ?
-            '''
-            result = self.db.execute_query(query, (form, float(purity)))
-            total_weight = result[0][0] if result and result[0][0] is not None else 0.0
-            print(f"Debug: {form} {purity}% = {total_weight} grams")
-            return total_weight
-            
-        except Exception as e:
-            print(f"Error getting weight for {form} {purity}%: {e}")
-            return 0.0
+            return [], [], {}
@@ -1,16 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+from app_logging import get_logger
+from services import KarigarService
+
+logger = get_logger(__name__)
 
 class KarigarOrdersManager:
     def __init__(self, root_window, main_app, db_manager, colors, fonts):
         self.root_window = root_window
         self.main_app = main_app
         self.db = db_manager
+        self.service = KarigarService(db_manager)
         self.COLORS = colors
         self.FONTS = fonts
         self.issued_rows = []
         self.received_rows = []
 
+    @staticmethod
+    def _order_lines(rows, parse_weight):
+        """[(item_id, item_name, weight), ...] for the issued/received rows that have an item selected"""
+        lines = []
+        for r in rows:
+            item_text = (r['item_combo'].get() or '').strip()
+            if not item_text:
+                continue
+            item_id, item_name = item_text.split(' - ', 1)
+            lines.append((int(item_id), item_name, parse_weight(r['weight_entry'])))
+        return lines
+
     def show_create_order_modal(self):
         modal = tk.Toplevel(self.root_window)
         modal.title("Create Karigar Order")
@@ -291,156 +308,16 @@ class KarigarOrdersManager:
                 messagebox.showerror("Error", "Please select a karigar")
                 return
             try:
-                print("[KarigarOrder] SAVE start")
-                print(f"  Issued rows: {len(self.issued_rows)} | Received rows: {len(self.received_rows)}")
-                # compute totals
-                issued_total = sum(parse_weight(r['weight_entry']) for r in self.issued_rows)
-                received_total = sum(parse_weight(r['weight_entry']) for r in self.received_rows)
-                balance_total = issued_total - received_total
-                from datetime import datetime
-                created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                # Generate Ref ID: KO + ddmmyy + / + seq
-                date_str = datetime.now().strftime('%d%m%y')
-                try:
-                    row_last = self.db.execute_query(
-                        "SELECT ref_id FROM karigar_orders WHERE ref_id LIKE ? ORDER BY ref_id DESC LIMIT 1",
-                        (f"KO{date_str}/%",)
-                    )
-                    if row_last and row_last[0][0]:
-                        last_num = int(str(row_last[0][0]).split('/')[-1])
-                    else:
-                        last_num = 0
-                except Exception:
-                    last_num = 0
-                ref_id = f"KO{date_str}/{last_num + 1:03d}"
+                logger.debug("[KarigarOrder] SAVE start")
+                logger.debug("  Issued rows: %s | Received rows: %s", len(self.issued_rows), len(self.received_rows))
                 karigar_id = int(karigar_text.split(' - ')[0]) if ' - ' in karigar_text else None
                 karigar_name = karigar_text.split(' - ')[1] if ' - ' in karigar_text else karigar_text
-                # Ensure karigar_orders table exists and insert summary row
-                print(f"  Using Ref ID: {ref_id}")
-                self.db.execute_update(
-                    """
-                    CREATE TABLE IF NOT EXISTS karigar_orders (
-                        order_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        ref_id TEXT,
-                        karigar_id INTEGER,
-                        karigar_name TEXT,
-                        issued_total REAL DEFAULT 0,
-                        received_total REAL DEFAULT 0,
-                        balance_total REAL DEFAULT 0,
-                        status TEXT DEFAULT 'in progress',
-                        created_at TEXT
-                    )
-                    """
-                )
-                # Ensure ref_id column exists
-                try:
-                    cols = self.db.execute_query("PRAGMA table_info(karigar_orders)") or []
-                    if not any(c[1].lower() == 'ref_id' for c in cols):
-                        self.db.execute_update("ALTER TABLE karigar_orders ADD COLUMN ref_id TEXT")
-                except Exception:
-                    pass
-                # Detail items table
-                self.db.execute_update(
-                    """
-                    CREATE TABLE IF NOT EXISTS karigar_order_items (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        order_id INTEGER,
-                        item_id INTEGER,
-                        item_name TEXT,
-                        direction TEXT,
-                        weight REAL,
-                        created_at TEXT
-                    )
-                    """
-                )
-                self.db.execute_update(
-                    """
-                    INSERT INTO karigar_orders (ref_id, karigar_id, karigar_name, issued_total, received_total, balance_total, status, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, 'in progress', ?)
-                    """,
-                    (ref_id, karigar_id, karigar_name, issued_total, received_total, balance_total, created_at)
-                )
-                # Retrieve last order id
-                try:
-                    last_id_row = self.db.execute_query("SELECT last_insert_rowid()")
-                    order_id = last_id_row[0][0] if last_id_row else None
-                except Exception:
-                    order_id = None
-                print(f"  Inserted order_id: {order_id}")
-                for r in self.issued_rows:
-                    try:
-                        exists_combo = 0
-                        exists_entry = 0
-                        try:
-                            exists_combo = int(r['item_combo'].winfo_exists())
-                            exists_entry = int(r['weight_entry'].winfo_exists())
-                        except Exception:
-                            pass
-                        print(f"  [Issued] row exists? combo={exists_combo} entry={exists_entry}")
-                        item_text = ''
-                        try:
-                            item_text = (r['item_combo'].get() or '').strip()
-                        except Exception as ee:
-                            print(f"    ERROR getting combo value: {ee}")
-                            item_text = ''
-                        if not item_text:
-                            continue
-                        item_id = int(item_text.split(' - ')[0])
-                        wt = parse_weight(r['weight_entry'])
-                        print(f"    issue item_id={item_id} name={item_text} wt={wt}")
-                    except Exception as loop_e:
-                        print(f"    ERROR preparing issued row: {loop_e}")
-                        continue
-                    # Subtract inventory
-                    try:
-                        self.main_app.update_item_inventory(item_id, wt, wt, 'subtract')
-                    except Exception as inv_e:
-                        print(f"    ERROR updating inventory (issued): {inv_e}")
-                    if order_id and wt > 0:
-                        try:
-                            self.db.execute_update(
-                                "INSERT INTO karigar_order_items (order_id, item_id, item_name, direction, weight, created_at) VALUES (?, ?, ?, 'issued', ?, ?)",
-                                (order_id, item_id, item_text.split(' - ')[1], wt, created_at)
-                            )
-                        except Exception as det_e:
-                            print(f"    ERROR inserting issued detail: {det_e}")
-                for r in self.received_rows:
-                    try:
-                        exists_combo = 0
-                        exists_entry = 0
-                        try:
-                            exists_combo = int(r['item_combo'].winfo_exists())
-                            exists_entry = int(r['weight_entry'].winfo_exists())
-                        except Exception:
-                            pass
-                        print(f"  [Received] row exists? combo={exists_combo} entry={exists_entry}")
-                        item_text = ''
-                        try:
-                            item_text = (r['item_combo'].get() or '').strip()
-                        except Exception as ee:
-                            print(f"    ERROR getting combo value: {ee}")
-                            item_text = ''
-                        if not item_text:
-                            continue
-                        item_id = int(item_text.split(' - ')[0])
-                        wt = parse_weight(r['weight_entry'])
-                        print(f"    recv item_id={item_id} name={item_text} wt={wt}")
-                    except Exception as loop_e:
-                        print(f"    ERROR preparing received row: {loop_e}")
-                        continue
-                    # Add inventory
-                    try:
-                        self.main_app.update_item_inventory(item_id, wt, wt, 'add')
-                    except Exception as inv_e:
-                        print(f"    ERROR updating inventory (received): {inv_e}")
-                    if order_id and wt > 0:
-                        try:
-                            self.db.execute_update(
-                                "INSERT INTO karigar_order_items (order_id, item_id, item_name, direction, weight, created_at) VALUES (?, ?, ?, 'received', ?, ?)",
-                                (order_id, item_id, item_text.split(' - ')[1], wt, created_at)
-                            )
-                        except Exception as det_e:
-                            print(f"    ERROR inserting received detail: {det_e}")
+                issued = self._order_lines(self.issued_rows, parse_weight)
+                received = self._order_lines(self.received_rows, parse_weight)
+                # Header (with its Ref ID), detail rows and stock moves are saved together or not at all
+                order_id, ref_id = self.service.save_order(karigar_id, karigar_name, issued, received)
+                logger.debug("  Inserted order_id: %s (%s)", order_id, ref_id)
+                self.main_app.load_items_data()
                 # Refresh table in main app if available
                 try:
                     self.main_app.load_karigar_orders_data()
@@ -453,7 +330,7 @@ class KarigarOrdersManager:
             except Exception as e:
                 # Log to console for easier debugging in addition to UI error
                 try:
-                    print(f"Error saving karigar order: {e}")
+                    logger.error("Error saving karigar order: %s", e)
                 except Exception:
                     pass
                 messagebox.showerror("Error", f"Error saving order: {e}")
@@ -597,10 +474,7 @@ class KarigarOrdersManager:
 
         # Load existing detail items
         try:
-            items = self.db.execute_query(
-                "SELECT item_name, direction, weight FROM karigar_order_items WHERE order_id = ? ORDER BY id",
-                (order_id,)
-            ) or []
+            items = self.service.order_items(order_id)
             for item_name, direction, weight in items:
                 host = exist_issued if str(direction).lower() == 'issued' else exist_received
                 row = tk.Frame(host, bg=self.COLORS['light'])
@@ -651,46 +525,11 @@ class KarigarOrdersManager:
 
         def apply_updates():
             try:
-                issued_delta = sum(parse_w(r['weight_entry']) for r in add_issued_rows)
-                received_delta = sum(parse_w(r['weight_entry']) for r in add_received_rows)
-                new_issued = (issued_total or 0) + issued_delta
-                new_received = (received_total or 0) + received_delta
-                new_balance = new_issued - new_received
-                # Update summary row
-                self.db.execute_update(
-                    "UPDATE karigar_orders SET issued_total = ?, received_total = ?, balance_total = ? WHERE order_id = ?",
-                    (new_issued, new_received, new_balance, order_id)
-                )
-                # Adjust inventory for deltas only
-                for r in add_issued_rows:
-                    item_text = r['item_combo'].get().strip()
-                    if not item_text:
-                        continue
-                    item_id = int(item_text.split(' - ')[0])
-                    wt = parse_w(r['weight_entry'])
-                    if wt > 0:
-                        self.main_app.update_item_inventory(item_id, wt, wt, 'subtract')
-                        # add detail record
-                        from datetime import datetime
-                        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        self.db.execute_update(
-                            "INSERT INTO karigar_order_items (order_id, item_id, item_name, direction, weight, created_at) VALUES (?, ?, ?, 'issued', ?, ?)",
-                            (order_id, item_id, item_text.split(' - ')[1], wt, created_at)
-                        )
-                for r in add_received_rows:
-                    item_text = r['item_combo'].get().strip()
-                    if not item_text:
-                        continue
-                    item_id = int(item_text.split(' - ')[0])
-                    wt = parse_w(r['weight_entry'])
-                    if wt > 0:
-                        self.main_app.update_item_inventory(item_id, wt, wt, 'add')
-                        from datetime import datetime
-                        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        self.db.execute_update(
-                            "INSERT INTO karigar_order_items (order_id, item_id, item_name, direction, weight, created_at) VALUES (?, ?, ?, 'received', ?, ?)",
-                            (order_id, item_id, item_text.split(' - ')[1], wt, created_at)
-                        )
+                issued = self._order_lines(add_issued_rows, parse_w)
+                received = self._order_lines(add_received_rows, parse_w)
+                # Totals, detail rows and stock moves for the new rows, in one transaction
+                self.service.add_to_order(order_id, issued, received)
+                self.main_app.load_items_data()
                 try:
                     self.main_app.load_karigar_orders_data()
                 except Exception:
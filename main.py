@@ -3,6 +3,17 @@ Main application file for Gold Jewelry Business Management System
 This is the entry point for the application
 """
 
+import sys
+import time
+from startup_profiler import StartupProfiler
+
+# Checked before the imports below so their cost shows up in the profile
+STARTUP_PROFILER = StartupProfiler.from_argv(sys.argv)
+_imports_started = time.perf_counter()
+
+import itertools
+import logging
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from database import DatabaseManager
@@ -11,8 +22,20 @@ from freelancer import FreelancerManager
 from workorder import WorkOrderManager
 from karigar_orders import KarigarOrdersManager
 from supplier import SupplierManager
+from reports import ReportsManager
 from multiple_sales import MultipleSalesManager
 from multiple_purchases import MultiplePurchasesManager
+from bulk_import import BulkImportManager
+from services import (ExposureService, HomeService, ItemsService, KarigarService, PurchasesService, RainiService,
+                      SalesService, SuppliersService, KarigarOrder, RainiOrder, Supplier)
+from services.exposure import AGE_BUCKETS
+from statuses import PENDING
+from app_logging import configure_logging, get_logger
+from instrumentation import metrics, timed, timer
+
+logger = get_logger(__name__)
+
+STARTUP_PROFILER.mark('imports', _imports_started)
 
 # Define color scheme
 COLORS = {
@@ -30,6 +53,16 @@ COLORS = {
     'silver': '#c0c0c0'       # Silver
 }
 
+# Rows inserted into a treeview per UI tick when streaming query results
+TREE_INSERT_CHUNK = 300
+# Tabs built in the background after startup, most likely next first
+PREFETCH_TABS = ("🏆 Sales/Purchase Order", "📦 Items")
+# Pause between building prefetched tabs so input events get handled in between
+TAB_PREFETCH_DELAY_MS = 150
+# `main.py --dump-metrics` writes the collected timings next to the database on exit
+DUMP_METRICS_FLAG = '--dump-metrics'
+METRICS_REPORT_NAME = 'metrics.json'
+
 # Define fonts
 FONTS = {
     'title': ('Segoe UI', 24, 'bold'),
@@ -48,27 +81,55 @@ class GoldJewelryApp:
         self.root.configure(bg=COLORS['light'])
         
         # Configure style
-        self.configure_styles()
+        with STARTUP_PROFILER.phase('styles'):
+            self.configure_styles()
         
         # Center the window
         self.center_window()
         
         # Initialize database
-        self.db = DatabaseManager()
-        
-        # Initialize managers
+        with STARTUP_PROFILER.phase('database'):
+            self.db = DatabaseManager()
+        # Latest background load per view; stale results are discarded
+        self._view_load_tokens = {}
+        # View loaders queued by request_refresh (ordered, each once) and the idle job that runs them
+        self._pending_refreshes = {}
+        self._refresh_job = None
+        # Latest row stream per treeview; an older stream stops at its next chunk
+        self._tree_stream_tokens = {}
+        # Source-table version (db.change_version) each view last finished drawing; a reload of an
+        # unchanged view returns straight away
+        self._view_versions = {}
+        
+        # Initialize services (headless data access) and managers
+        managers_started = time.perf_counter()
+        self.items_service = ItemsService(self.db)
+        self.suppliers_service = SuppliersService(self.db)
+        self.sales_service = SalesService(self.db)
+        self.purchases_service = PurchasesService(self.db)
+        self.karigar_service = KarigarService(self.db)
+        self.raini_service = RainiService(self.db)
+        # Cached "today" snapshot for the Home tab
+        self.home_service = HomeService(self.db)
+        # Cached outstanding metal per karigar for the Karigar Orders tab
+        self.exposure_service = ExposureService(self.db)
         self.freelancer_manager = FreelancerManager(self.db, self.show_toast)
         self.work_order_manager = WorkOrderManager(self.db)
         self.karigar_orders_manager = KarigarOrdersManager(self.root, self, self.db, COLORS, FONTS)
         self.supplier_manager = SupplierManager(self.db, self)
         self.multiple_sales_manager = MultipleSalesManager(self.root, self, self.db, COLORS, FONTS)
         self.multiple_purchases_manager = MultiplePurchasesManager(self.root, self, self.db, COLORS, FONTS)
+        self.bulk_import_manager = BulkImportManager(self.db)
+        STARTUP_PROFILER.mark('managers', managers_started)
         
-        # Create main interface
-        self.create_widgets()
+        # Create main interface (only the header and Home tab are built here)
+        with STARTUP_PROFILER.phase('widgets'):
+            self.create_widgets()
+        self._first_paint_started = time.perf_counter()
         
-        # Load initial data
-        self.load_data()
+        # Load initial data and prefetch the next tabs once the window is on screen;
+        # after_idle runs after the pending redraw, after(0) then yields one more turn
+        self.root.after_idle(lambda: self.root.after(0, self._after_first_paint))
     
         # Add global keyboard shortcuts
         self.setup_keyboard_shortcuts()
@@ -124,6 +185,8 @@ class GoldJewelryApp:
         self.root.bind('<Control-d>', lambda e: self.handle_global_shortcut('Ctrl+D'))
         self.root.bind('<Control-q>', lambda e: self.handle_global_shortcut('Ctrl+Q'))
         self.root.bind('<Control-r>', lambda e: self.handle_global_shortcut('Ctrl+R'))
+        # Hidden diagnostics panel (timings); Ctrl+Shift+D reports keysym 'D'
+        self.root.bind('<Control-D>', lambda e: self.show_diagnostics_panel())
 
     def handle_global_shortcut(self, shortcut):
         """Handle global keyboard shortcuts"""
@@ -282,14 +345,63 @@ class GoldJewelryApp:
         # Bind tab change event to refresh home data
         self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
-        # Create tabs
-        self.create_home_tab()
-        self.create_inventory_tab()
-        self.create_raini_inventory_tab()
-        self.create_items_tab()
-        self.create_work_orders_tab()
-        self.create_freelancers_tab()
-        self.create_suppliers_tab()
+        # Register every tab up front so their order (and the indices the shortcuts use) stays
+        # fixed, but only build the Home tab now; the rest are built on first selection or
+        # by the idle-time prefetch started after the first paint
+        self._tab_frames = {}
+        self._tab_builders = {}
+        for title, builder in (
+            ("🏠 Home", self.create_home_tab),
+            ("🏆 Sales/Purchase Order", self.create_inventory_tab),
+            ("🥇 Raini Inventory", self.create_raini_inventory_tab),
+            ("📦 Items", self.create_items_tab),
+            ("🧑‍🏭 Karigar Orders", self.create_work_orders_tab),
+            ("👥 Karigar", self.create_freelancers_tab),
+            ("🏢 Suppliers", self.create_suppliers_tab),
+            ("📊 Reports", self.create_reports_tab),
+        ):
+            frame = ttk.Frame(self.notebook)
+            self.notebook.add(frame, text=title)
+            self._tab_frames[title] = frame
+            self._tab_builders[title] = builder
+        self._materialize_tab("🏠 Home")
+
+    def _tab_frame(self, title):
+        """Placeholder frame registered for a tab in create_widgets"""
+        return self._tab_frames[title]
+
+    def _materialize_tab(self, title):
+        """Build a tab's widgets (which also starts its data load) the first time it's needed"""
+        builder = self._tab_builders.pop(title, None)
+        if builder is None:
+            return
+        try:
+            builder()
+        except Exception as e:
+            logger.error("Error building tab %s: %s", title, e)
+
+    def _prefetch_tabs(self, titles):
+        """Build not-yet-opened tabs one per event-loop turn so the window stays responsive"""
+        pending = [t for t in titles if t in self._tab_builders]
+        if not pending:
+            return
+        self._materialize_tab(pending[0])
+        self.root.after(TAB_PREFETCH_DELAY_MS, lambda: self._prefetch_tabs(pending[1:]))
+
+    def _after_first_paint(self):
+        """Deferred startup work, run once the window has been drawn"""
+        STARTUP_PROFILER.mark('first_paint', self._first_paint_started)
+        with STARTUP_PROFILER.phase('home_data'):
+            self.load_home_data()
+        STARTUP_PROFILER.finish(self.db.db_path)
+        self._prefetch_tabs(PREFETCH_TABS)
+        self._check_karigar_totals()
+
+    def _check_karigar_totals(self):
+        """Reconcile karigar order totals and balances against their detail rows in the background;
+        the service logs any mismatch"""
+        self.db.submit_read(lambda conn: self.karigar_service.reconcile(conn=conn), tk_root=self.root,
+                            error_callback=lambda e: logger.error("Karigar reconciliation failed: %s", e))
     
     def create_header(self):
         """Create application header"""
@@ -321,11 +433,14 @@ class GoldJewelryApp:
         restore_btn = self.create_beautiful_button(actions_frame, "♻️ Restore...", self.restore_database_from_file, 'warning', 14)
         restore_btn.pack(side='left', padx=(0, 8))
         export_btn = self.create_beautiful_button(actions_frame, "📤 Export CSVs", self.export_all_csvs, 'info', 14)
-        export_btn.pack(side='left')
+        export_btn.pack(side='left', padx=(0, 8))
+        import_btn = self.create_beautiful_button(actions_frame, "📥 Import...", self.show_import_modal, 'success', 14)
+        import_btn.pack(side='left')
     
     def on_tab_changed(self, event):
         """Handle tab change events"""
         selected_tab = event.widget.tab('current')['text']
+        self._materialize_tab(selected_tab)
         if selected_tab == "🏠 Home":
             # Refresh home page data when home tab is selected
             self.load_home_data()
@@ -368,18 +483,187 @@ class GoldJewelryApp:
             messagebox.showerror("Restore Error", f"Failed to restore: {e}")
 
     def export_all_csvs(self):
+        if getattr(self, '_export_in_progress', False):
+            self.show_toast("An export is already running", success=False)
+            return
         try:
+            import queue
+            import threading
             from tkinter import filedialog
             export_dir = filedialog.askdirectory(title='Choose export folder')
             if not export_dir:
                 return
-            results = self.db.export_all_to_dir(export_dir)
-            if results:
-                self.show_toast(f"Exported {len(results)} files to folder", success=True)
-            else:
-                self.show_toast("Nothing to export", success=False)
+            compress = messagebox.askyesno("Export CSVs", "Compress the exported files with gzip (.csv.gz)?")
+        except Exception as e:
+            messagebox.showerror("Export Error", f"Failed to export CSVs: {e}")
+            return
+
+        # Worker threads only push onto this queue; the Tk thread drains it
+        events = queue.Queue()
+        total = len(self.db.export_targets())
+        state = {'done': 0}
+
+        def on_progress(name, rows_written, finished):
+            events.put(('progress', name, rows_written, finished))
+
+        def worker():
+            try:
+                results = self.db.export_all_to_dir(export_dir, compress=compress, progress_callback=on_progress)
+                events.put(('done', results))
+            except Exception as e:
+                events.put(('error', e))
+
+        def poll():
+            try:
+                while True:
+                    event = events.get_nowait()
+                    if event[0] == 'progress':
+                        _, name, rows_written, finished = event
+                        if finished:
+                            state['done'] += 1
+                            self.show_toast(f"Exporting... {state['done']}/{total} ({name} done)", duration=10000)
+                        else:
+                            self.show_toast(f"Exporting {name}: {rows_written} rows", duration=10000)
+                    elif event[0] == 'done':
+                        self._export_in_progress = False
+                        results = event[1]
+                        if results:
+                            self.show_toast(f"Exported {len(results)} files to folder", success=True)
+                        else:
+                            self.show_toast("Nothing to export", success=False)
+                        return
+                    else:
+                        self._export_in_progress = False
+                        self.hide_toast()
+                        messagebox.showerror("Export Error", f"Failed to export CSVs: {event[1]}")
+                        return
+            except queue.Empty:
+                pass
+            self.root.after(100, poll)
+
+        # The export reads on pool connections; commit here, on the writer's own thread
+        try:
+            self.db.commit_pending()
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to export CSVs: {e}")
+            return
+        self._export_in_progress = True
+        self.show_toast("Exporting CSVs...", duration=10000)
+        threading.Thread(target=worker, name='csv-export-runner', daemon=True).start()
+        self.root.after(100, poll)
+
+    def show_import_modal(self):
+        """Show modal for bulk importing sales/purchase lines, items or suppliers from CSV/JSONL"""
+        modal = tk.Toplevel(self.root)
+        modal.title("Bulk Import")
+        modal.configure(bg=COLORS['light'])
+        modal.resizable(False, False)
+        self.center_modal(modal, 520, 330)
+        modal.transient(self.root)
+        modal.grab_set()
+
+        main_frame = tk.Frame(modal, bg=COLORS['light'], padx=20, pady=20)
+        main_frame.pack(fill='both', expand=True)
+
+        tk.Label(main_frame, text="Bulk Import", font=FONTS['heading'],
+                 fg=COLORS['primary'], bg=COLORS['light']).pack(pady=(0, 15))
+
+        kinds = {
+            'Sales lines': 'sales',
+            'Purchase lines': 'purchases',
+            'Items': 'items',
+            'Suppliers': 'suppliers',
+        }
+        kind_frame = tk.Frame(main_frame, bg=COLORS['light'])
+        kind_frame.pack(fill='x', pady=(0, 10))
+        tk.Label(kind_frame, text="Import:", font=FONTS['body'], fg=COLORS['dark'], bg=COLORS['light']).pack(side='left')
+        kind_combo = ttk.Combobox(kind_frame, values=list(kinds.keys()), state='readonly', font=FONTS['body'], width=25)
+        kind_combo.set('Sales lines')
+        kind_combo.pack(side='left', padx=(10, 0))
+
+        file_frame = tk.Frame(main_frame, bg=COLORS['light'])
+        file_frame.pack(fill='x', pady=(0, 10))
+        file_var = tk.StringVar()
+        tk.Entry(file_frame, textvariable=file_var, font=FONTS['body'], width=40).pack(side='left', fill='x', expand=True)
+
+        def browse():
+            from tkinter import filedialog
+            path = filedialog.askopenfilename(
+                title='Select file to import',
+                filetypes=[('CSV / JSONL', '*.csv *.jsonl *.ndjson'), ('All files', '*.*')]
+            )
+            if path:
+                file_var.set(path)
+
+        tk.Button(file_frame, text="Browse...", command=browse, font=FONTS['body'],
+                  bg=COLORS['secondary'], fg=COLORS['white']).pack(side='left', padx=(8, 0))
+
+        create_missing = tk.BooleanVar(value=True)
+        tk.Checkbutton(main_frame, text="Create missing items and suppliers", variable=create_missing,
+                       fg=COLORS['dark'], bg=COLORS['light'], activebackground=COLORS['light']).pack(anchor='w')
+
+        status_label = tk.Label(main_frame, text="", font=FONTS['body'], fg=COLORS['dark'], bg=COLORS['light'], anchor='w')
+        status_label.pack(fill='x', pady=(10, 0))
+
+        def run_import():
+            path = file_var.get().strip()
+            if not path:
+                messagebox.showerror("Error", "Please choose a file to import")
+                return
+            if getattr(self, '_import_in_progress', False):
+                return
+
+            def show_progress(rows_read):
+                if modal.winfo_exists():
+                    status_label.config(text=f"Importing... {rows_read} rows read")
+
+            def finished():
+                self._import_in_progress = False
+                if modal.winfo_exists():
+                    modal.config(cursor='')
+                    import_btn.config(state='normal')
+
+            def on_result(result):
+                finished()
+                if modal.winfo_exists():
+                    modal.destroy()
+                self.load_data()
+                self.load_items_data()
+                self.load_unified_data()
+                if result.errors:
+                    details = "\n".join(result.errors[:15])
+                    messagebox.showwarning("Import Finished", f"{result.summary()}\n\n{details}")
+                else:
+                    self.show_toast(result.summary(), success=True)
+
+            def on_error(error):
+                finished()
+                if modal.winfo_exists():
+                    status_label.config(text="")
+                messagebox.showerror("Import Error", f"Import failed, nothing was saved: {error}")
+
+            # The import runs in a worker thread, in one transaction on its own connection
+            try:
+                self.bulk_import_manager.submit_import(kinds[kind_combo.get()], path,
+                                                       create_missing=create_missing.get(), tk_root=self.root,
+                                                       callback=on_result, error_callback=on_error,
+                                                       progress_callback=show_progress)
+            except Exception as e:
+                messagebox.showerror("Import Error", f"Import failed, nothing was saved: {e}")
+                return
+            self._import_in_progress = True
+            modal.config(cursor='watch')
+            import_btn.config(state='disabled')
+            status_label.config(text="Importing...")
+
+        btn_frame = tk.Frame(main_frame, bg=COLORS['light'])
+        btn_frame.pack(fill='x', pady=(20, 0))
+        import_btn = tk.Button(btn_frame, text="📥 Import", command=run_import, font=FONTS['button'],
+                               bg=COLORS['success'], fg=COLORS['white'], width=15)
+        import_btn.pack(side='right', padx=(10, 0))
+        tk.Button(btn_frame, text="Cancel", command=modal.destroy, font=FONTS['button'],
+                  bg=COLORS['secondary'], fg=COLORS['white'], width=15).pack(side='right')
+        modal.bind('<Escape>', lambda _e: modal.destroy())
 
     def on_toggle_auto_backup(self):
         self.schedule_daily_backup_if_enabled()
@@ -405,8 +689,7 @@ class GoldJewelryApp:
     
     def create_home_tab(self):
         """Create home page tab with three sections"""
-        home_frame = ttk.Frame(self.notebook)
-        self.notebook.add(home_frame, text="🏠 Home")
+        home_frame = self._tab_frame("🏠 Home")
         
         # Main container with three sections
         main_container = tk.Frame(home_frame, bg=COLORS['light'])
@@ -539,13 +822,11 @@ class GoldJewelryApp:
         pending_scrollbar.pack(side='right', fill='y')
         self.home_pending_tree.configure(yscrollcommand=pending_scrollbar.set)
         
-        # Load data for home tab
-        self.load_home_data()
+        # Home data is loaded by _after_first_paint (and on every return to this tab)
     
     def create_raini_inventory_tab(self):
         """Create Raini Inventory management tab"""
-        raini_frame = ttk.Frame(self.notebook)
-        self.notebook.add(raini_frame, text="🥇 Raini Inventory")
+        raini_frame = self._tab_frame("🥇 Raini Inventory")
         
         # Buttons frame with better styling
         btn_frame = tk.Frame(raini_frame, bg=COLORS['light'])
@@ -668,8 +949,7 @@ class GoldJewelryApp:
     
     def create_items_tab(self):
         """Create items management tab"""
-        items_frame = ttk.Frame(self.notebook)
-        self.notebook.add(items_frame, text="📦 Items")
+        items_frame = self._tab_frame("📦 Items")
         
         # Items tab content
         items_content = tk.Frame(items_frame, bg=COLORS['light'])
@@ -722,83 +1002,23 @@ class GoldJewelryApp:
         self.load_items_data()
     
     def load_items_data(self):
-        """Load items data from database"""
+        """Load items data from database (queried on a background read connection)"""
         if not hasattr(self, 'items_tree'):
             return
-            
-        # Clear existing items
-        for item in self.items_tree.get_children():
-            self.items_tree.delete(item)
-        
-        try:
-            query = '''
-                WITH 
-                p AS (
-                    SELECT item_id,
-                           SUM(gross_weight) AS g,
-                           SUM(less_weight)  AS l,
-                           SUM(net_weight)   AS n,
-                           SUM(wastage_percentage * net_weight) AS wsum
-                    FROM sales
-                    WHERE ref_id LIKE 'P%'
-                    GROUP BY item_id
-                ),
-                s AS (
-                    SELECT item_id,
-                           SUM(gross_weight) AS g,
-                           SUM(less_weight)  AS l,
-                           SUM(net_weight)   AS n,
-                           SUM(wastage_percentage * net_weight) AS wsum
-                    FROM sales
-                    WHERE ref_id LIKE 'S%'
-                    GROUP BY item_id
-                )
-                SELECT 
-                    i.item_id,
-                    i.item_name,
-                    CASE WHEN LOWER(COALESCE(i.category,'')) = 'raini'
-                         THEN COALESCE(i.net_weight, 0)
-                         ELSE COALESCE(p.g,0) - COALESCE(s.g,0)
-                    END AS gross_weight,
-                    CASE WHEN LOWER(COALESCE(i.category,'')) = 'raini'
-                         THEN 0
-                         ELSE COALESCE(p.l,0) - COALESCE(s.l,0)
-                    END AS less_weight,
-                    CASE WHEN LOWER(COALESCE(i.category,'')) = 'raini'
-                         THEN COALESCE(i.net_weight, 0)
-                         ELSE COALESCE(p.n,0) - COALESCE(s.n,0)
-                    END AS net_weight,
-                    CASE 
-                        WHEN LOWER(COALESCE(i.category,'')) = 'raini' THEN 0
-                        WHEN (COALESCE(p.n,0) - COALESCE(s.n,0)) <> 0 
-                            THEN (COALESCE(p.wsum,0) - COALESCE(s.wsum,0)) / (COALESCE(p.n,0) - COALESCE(s.n,0))
-                        ELSE 0
-                    END AS wastage_percentage
-                FROM items i
-                LEFT JOIN p ON p.item_id = i.item_id
-                LEFT JOIN s ON s.item_id = i.item_id
-                ORDER BY i.item_id DESC
-            '''
-            rows = self.db.execute_query(query)
-            
-            for i, row in enumerate(rows):
+        version = self._changed_view_version('items', ('items', 'sales'))
+        if version is None:
+            return
+
+        def render(rows):
+            # Clear existing items
+            for item in self.items_tree.get_children():
+                self.items_tree.delete(item)
+            for i, stock in enumerate(rows):
                 tag = 'even' if i % 2 == 0 else 'odd'
-                gross = float(row[2] or 0)
-                less = float(row[3] or 0)
-                netw = float(row[4] or 0)
-                wastage_pct = float(row[5] or 0)
-                formatted_row = (
-                    row[0],                 # ID
-                    row[1],                 # Item Name
-                    f"{gross:.3f}",        # Gross Weight (g)
-                    f"{less:.3f}",         # Less (g)
-                    f"{netw:.3f}",         # Net Weight (g)
-                    f"{wastage_pct:.2f}"   # Wastage (%)
-                )
-                self.items_tree.insert('', 'end', values=formatted_row, tags=(tag,))
-                
-        except Exception as e:
-            print(f"Error loading items data: {e}")
+                self.items_tree.insert('', 'end', values=stock.display_values(), tags=(tag,))
+
+        self._submit_view_load('items', self.items_service.stock_summary, render,
+                               "Error loading items data", version)
 
     def delete_selected_items(self):
         """Delete selected item records from items table"""
@@ -833,53 +1053,16 @@ class GoldJewelryApp:
     def update_item_inventory(self, item_id, fine_weight_change, net_weight_change, operation='add'):
         """Update item inventory based on purchase or sale operations"""
         try:
-            if operation == 'add':
-                # For purchases - add to inventory
-                query = '''
-                    UPDATE items 
-                    SET fine_weight = COALESCE(fine_weight, 0) + ?,
-                        net_weight = COALESCE(net_weight, 0) + ?
-                    WHERE item_id = ?
-                '''
-            else:
-                # For sales - subtract from inventory
-                query = '''
-                    UPDATE items 
-                    SET fine_weight = COALESCE(fine_weight, 0) - ?,
-                        net_weight = COALESCE(net_weight, 0) - ?
-                    WHERE item_id = ?
-                '''
-            
-            self.db.execute_update(query, (fine_weight_change, net_weight_change, item_id))
-            print(f"Updated inventory for item {item_id}: {operation} {fine_weight_change}g fine, {net_weight_change}g net")
+            # Purchases add to inventory, sales subtract from it
+            sign = 1 if operation == 'add' else -1
+            self.items_service.adjust_stock(item_id, sign * fine_weight_change, sign * net_weight_change)
+            logger.debug("Updated inventory for item %s: %s %sg fine, %sg net", item_id, operation, fine_weight_change, net_weight_change)
             
             # Refresh items data display
             self.load_items_data()
             
         except Exception as e:
-            print(f"Error updating item inventory: {e}")
-    
-    def update_item_inventory_for_record_update(self, ref_id, old_fine_gold, old_net_weight, new_fine_gold, new_net_weight, old_item_id, new_item_id, is_purchase=False):
-        """Update item inventory when a record is updated"""
-        try:
-            # First, reverse the old inventory change
-            if is_purchase:
-                # Reverse old purchase (subtract old values)
-                self.update_item_inventory(old_item_id, old_fine_gold, old_net_weight, 'subtract')
-            else:
-                # Reverse old sale (add back old values)
-                self.update_item_inventory(old_item_id, old_fine_gold, old_net_weight, 'add')
-            
-            # Then apply the new inventory change
-            if is_purchase:
-                # Apply new purchase (add new values)
-                self.update_item_inventory(new_item_id, new_fine_gold, new_net_weight, 'add')
-            else:
-                # Apply new sale (subtract new values)
-                self.update_item_inventory(new_item_id, new_fine_gold, new_net_weight, 'subtract')
-                
-        except Exception as e:
-            print(f"Error updating item inventory for record update: {e}")
+            logger.error("Error updating item inventory: %s", e)
     
     def update_supplier_balance(self, supplier_name, amount_change, operation='add'):
         """Update supplier balance (in fine gold grams) based on operations.
@@ -888,59 +1071,20 @@ class GoldJewelryApp:
         - For Sale (we give out gold): add grams to supplier's owed balance
         """
         try:
-            if operation == 'add':
-                # For sales - add grams owed to supplier
-                query = '''
-                    UPDATE suppliers 
-                    SET balance = COALESCE(balance, 0) + ?
-                    WHERE supplier_name = ?
-                '''
-            else:
-                # For purchases - subtract grams owed to supplier
-                query = '''
-                    UPDATE suppliers 
-                    SET balance = COALESCE(balance, 0) - ?
-                    WHERE supplier_name = ?
-                '''
-            
-            self.db.execute_update(query, (amount_change, supplier_name))
-            print(f"Updated balance for supplier {supplier_name}: {operation} {amount_change}")
-            
-        except Exception as e:
-            print(f"Error updating supplier balance: {e}")
-    
-    def update_supplier_balance_for_record_update(self, supplier_name, old_amount, new_amount, old_supplier_name, new_supplier_name, is_purchase=False):
-        """Update supplier balance when a record is updated"""
-        try:
-            # First, reverse the old balance change
-            if is_purchase:
-                # Reverse old purchase (add back old amount)
-                self.update_supplier_balance(old_supplier_name, old_amount, 'add')
-            else:
-                # Reverse old sale (subtract back old amount)
-                self.update_supplier_balance(old_supplier_name, old_amount, 'subtract')
+            # Sales add grams owed to the supplier, purchases subtract them
+            sign = 1 if operation == 'add' else -1
+            self.suppliers_service.adjust_balance(supplier_name, sign * amount_change)
+            logger.debug("Updated balance for supplier %s: %s %s", supplier_name, operation, amount_change)
             
-            # Then apply the new balance change
-            if is_purchase:
-                # Apply new purchase (subtract new amount)
-                self.update_supplier_balance(new_supplier_name, new_amount, 'subtract')
-            else:
-                # Apply new sale (add new amount)
-                self.update_supplier_balance(new_supplier_name, new_amount, 'add')
-                
         except Exception as e:
-            print(f"Error updating supplier balance for record update: {e}")
+            logger.error("Error updating supplier balance: %s", e)
     
     def get_supplier_balance(self, supplier_name):
         """Get current balance for a supplier"""
         try:
-            query = "SELECT COALESCE(balance, 0) FROM suppliers WHERE supplier_name = ?"
-            result = self.db.execute_query(query, (supplier_name,))
-            if result:
-                return result[0][0]
-            return 0.0
+            return self.suppliers_service.balance(supplier_name)
         except Exception as e:
-            print(f"Error getting supplier balance: {e}")
+            logger.error("Error getting supplier balance: %s", e)
             return 0.0
     
     def get_gold_price_per_gram(self):
@@ -952,7 +1096,7 @@ class GoldJewelryApp:
                 return float(result[0][0])
             return 5000.0  # Default price if not set
         except Exception as e:
-            print(f"Error getting gold price: {e}")
+            logger.error("Error getting gold price: %s", e)
             return 5000.0  # Default price on error
     
     def calculate_monetary_value(self, fine_gold_weight):
@@ -1029,7 +1173,7 @@ class GoldJewelryApp:
                     self.update_supplier_balance(supplier_name, fine_gold, 'subtract')
                     
                     deleted_count += 1
-                    print(f"Deleted sales record {ref_id} and adjusted inventory and supplier balance")
+                    logger.debug("Deleted sales record %s and adjusted inventory and supplier balance", ref_id)
             
             if deleted_count > 0:
                 self.show_toast(f"Successfully deleted {deleted_count} sales record(s)", success=True)
@@ -1063,7 +1207,7 @@ class GoldJewelryApp:
                     self.update_supplier_balance(supplier_name, fine_gold, 'add')
                     
                     deleted_count += 1
-                    print(f"Deleted purchase record {ref_id} and adjusted inventory and supplier balance")
+                    logger.debug("Deleted purchase record %s and adjusted inventory and supplier balance", ref_id)
             
             if deleted_count > 0:
                 self.show_toast(f"Successfully deleted {deleted_count} purchase record(s)", success=True)
@@ -1115,40 +1259,17 @@ class GoldJewelryApp:
         if messagebox.askyesno("Confirm Delete", message):
             self.delete_unified_records(records_to_delete)
     
+    @timed('ui.delete_unified_records')
     def delete_unified_records(self, records):
         """Delete unified records and adjust inventory"""
         try:
-            deleted_count = 0
-            for record_type, ref_id in records:
-                # Get all record details before deletion
-                query = "SELECT item_id, fine_gold, net_weight, supplier_name FROM sales WHERE ref_id = ?"
-                all_records = self.db.execute_query(query, (ref_id,))
-                
-                if all_records:
-                    # Delete all records with this Ref ID
-                    delete_query = "DELETE FROM sales WHERE ref_id = ?"
-                    self.db.execute_update(delete_query, (ref_id,))
-                    
-                    # Adjust inventory for all deleted records
-                    for record_data in all_records:
-                        item_id, fine_gold, net_weight, supplier_name = record_data
-                        
-                        if record_type == 'Sale':
-                            # Adjust inventory (add back the weights since it was a sale)
-                            self.update_item_inventory(item_id, fine_gold, net_weight, 'add')
-                            # Adjust supplier balance in grams (reverse sale)
-                            self.update_supplier_balance(supplier_name, fine_gold, 'subtract')
-                        else:  # Purchase
-                            # Adjust inventory (subtract the weights since it was a purchase)
-                            self.update_item_inventory(item_id, fine_gold, net_weight, 'subtract')
-                            # Adjust supplier balance in grams (reverse purchase)
-                            self.update_supplier_balance(supplier_name, fine_gold, 'add')
-                    
-                    deleted_count += len(all_records)
-                    print(f"Deleted {record_type.lower()} record {ref_id} and adjusted inventory and supplier balance")
+            # Lines, stock and supplier balances change together in one transaction
+            deleted_count = self.sales_service.delete_groups([ref_id for _record_type, ref_id in records])
+            logger.debug("Deleted %s line(s) from %s group(s)", deleted_count, len(records))
             
             if deleted_count > 0:
                 self.show_toast(f"Successfully deleted {deleted_count} record(s)", success=True)
+                self.load_items_data()
                 self.load_unified_data()  # Refresh the unified table
             else:
                 messagebox.showerror("Error", "No records were deleted")
@@ -1402,46 +1523,12 @@ class GoldJewelryApp:
     
     def generate_ref_id(self, prefix):
         """Generate reference ID with format: S/P + DDMMYY + / + 3-digit incremental"""
-        from datetime import datetime
-        
-        # Get current date in DDMMYY format
-        today = datetime.now()
-        date_str = today.strftime('%d%m%y')
-        
-        # Get next incremental number for today
-        try:
-            # Get the highest existing number for today
-            query = f"SELECT ref_id FROM sales WHERE ref_id LIKE '{prefix}{date_str}/%' ORDER BY ref_id DESC LIMIT 1"
-            result = self.db.execute_query(query)
-            
-            if result and result[0][0]:
-                # Extract the number from the highest existing ref_id
-                existing_ref = result[0][0]
-                existing_num = int(existing_ref.split('/')[-1])
-                next_num = existing_num + 1
-            else:
-                next_num = 1
-                
-            # Format as 3-digit number
-            ref_id = f"{prefix}{date_str}/{next_num:03d}"
-            
-            # Double-check that this Ref ID doesn't already exist
-            check_query = "SELECT COUNT(*) FROM sales WHERE ref_id = ?"
-            check_result = self.db.execute_query(check_query, (ref_id,))
-            if check_result and check_result[0][0] > 0:
-                print(f"WARNING: Ref ID {ref_id} already exists! Incrementing...")
-                next_num += 1
-                ref_id = f"{prefix}{date_str}/{next_num:03d}"
-            
-            return ref_id
-        except Exception as e:
-            print(f"Error generating ref ID: {e}")
-            return f"{prefix}{date_str}/001"
+        service = self.purchases_service if prefix == 'P' else self.sales_service
+        return service.next_ref_id()[0]
     
     def create_inventory_tab(self):
         """Create inventory management tab"""
-        inventory_frame = ttk.Frame(self.notebook)
-        self.notebook.add(inventory_frame, text="🏆 Sales/Purchase Order")
+        inventory_frame = self._tab_frame("🏆 Sales/Purchase Order")
         
         # Buttons frame with better styling
         btn_frame = tk.Frame(inventory_frame, bg=COLORS['light'])
@@ -1732,183 +1819,54 @@ class GoldJewelryApp:
             messagebox.showwarning("Warning", "Please select a record to update")
     
     def load_unified_data(self, supplier_filter=None, from_date=None, to_date=None):
-        """Load both sales and purchases data into unified table with merged Ref IDs and optional filtering"""
+        """Load both sales and purchases data into unified table with merged Ref IDs and optional filtering.
+        The queries and grouping run on a background read connection; only the tree update runs on the Tk thread.
+        """
         if not hasattr(self, 'unified_tree'):
             return
-            
-        # Clear existing items
-        for item in self.unified_tree.get_children():
-            self.unified_tree.delete(item)
-        
-        try:
-            # Build WHERE clause for filters
-            where_conditions = ["s.ref_id LIKE 'S%'"]
-            query_params = []
-
-            if supplier_filter and supplier_filter != 'All':
-                where_conditions.append("s.supplier_name = ?")
-                query_params.append(supplier_filter)
-
-            if from_date:
-                where_conditions.append("DATE(s.sale_date) >= ?")
-                query_params.append(from_date)
 
-            if to_date:
-                where_conditions.append("DATE(s.sale_date) <= ?")
-                query_params.append(to_date)
-
-            where_clause = " AND ".join(where_conditions)
-
-            # Load sales data with filters
-            sales_query = f'''
-                SELECT
-                    'Sale' as type,
-                    s.ref_id,
-                    s.supplier_name,
-                    i.item_name,
-                    s.gross_weight,
-                    s.less_weight,
-                    s.net_weight,
-                    s.tunch_percentage,
-                    s.wastage_percentage,
-                    s.fine_gold,
-                    s.sale_date,
-                    s.sale_id
-                FROM sales s
-                LEFT JOIN items i ON s.item_id = i.item_id
-                WHERE {where_clause}
-                ORDER BY s.ref_id DESC, s.sale_date DESC
-            '''
-            sales_rows = self.db.execute_query(sales_query, tuple(query_params)) if query_params else self.db.execute_query(sales_query)
-            
-            # Load purchases data with filters (reuse same filter logic)
-            purchases_where_conditions = ["s.ref_id LIKE 'P%'"]
-            purchases_query_params = []
-
-            if supplier_filter and supplier_filter != 'All':
-                purchases_where_conditions.append("s.supplier_name = ?")
-                purchases_query_params.append(supplier_filter)
+        # Filters left as None are ignored by the registered query
+        filters = {
+            'supplier': supplier_filter if supplier_filter and supplier_filter != 'All' else None,
+            'from_date': from_date or None,
+            'to_date': to_date or None,
+        }
+        version = self._changed_view_version('unified', ('sales', 'items'), tuple(filters.values()))
+        if version is None:
+            return
 
-            if from_date:
-                purchases_where_conditions.append("DATE(s.sale_date) >= ?")
-                purchases_query_params.append(from_date)
+        def fetch(conn):
+            # Lines grouped by Ref ID, most recent group first
+            return self.sales_service.unified_groups(conn, **filters)
 
-            if to_date:
-                purchases_where_conditions.append("DATE(s.sale_date) <= ?")
-                purchases_query_params.append(to_date)
+        def render(sorted_groups):
+            # Clear existing items
+            for item in self.unified_tree.get_children():
+                self.unified_tree.delete(item)
 
-            purchases_where_clause = " AND ".join(purchases_where_conditions)
+            for group in sorted_groups:
+                ref_id, records = group
+                tag = 'sale' if group.record_type == 'Sale' else 'purchase'
 
-            purchases_query = f'''
-                SELECT
-                    'Purchase' as type,
-                    s.ref_id,
-                    s.supplier_name,
-                    i.item_name,
-                    s.gross_weight,
-                    s.less_weight,
-                    s.net_weight,
-                    s.tunch_percentage,
-                    s.wastage_percentage,
-                    s.fine_gold,
-                    s.sale_date,
-                    s.sale_id
-                FROM sales s
-                LEFT JOIN items i ON s.item_id = i.item_id
-                WHERE {purchases_where_clause}
-                ORDER BY s.ref_id DESC, s.sale_date DESC
-            '''
-            purchases_rows = self.db.execute_query(purchases_query, tuple(purchases_query_params)) if purchases_query_params else self.db.execute_query(purchases_query)
-            
-            # Combine all records
-            all_records = []
-            if sales_rows:
-                all_records.extend(sales_rows)
-            if purchases_rows:
-                all_records.extend(purchases_rows)
-            
-            # Group records by Ref ID to merge entries
-            grouped_records = {}
-            for row in all_records:
-                ref_id = row[1]
-                if ref_id not in grouped_records:
-                    grouped_records[ref_id] = []
-                grouped_records[ref_id].append(row)
-            
-            # Sort grouped records by the most recent date in each group
-            sorted_groups = sorted(grouped_records.items(), 
-                                 key=lambda x: max(record[10] or '' for record in x[1]), 
-                                 reverse=True)
-            
-            for ref_id, records in sorted_groups:
-                # Sort records within each group by date
-                records.sort(key=lambda x: x[10] or '', reverse=True)
-                
-                # Calculate totals for the group
-                total_gross = sum(record[4] for record in records)
-                total_less = sum(record[5] for record in records)
-                total_net = sum(record[6] for record in records)
-                total_fine_gold = sum(record[9] for record in records)
-                
-                # Get common data from first record
-                first_record = records[0]
-                record_type = first_record[0]
-                supplier_name = first_record[2]
-                sale_date = first_record[10]
-                
-                # Create merged entry
-                tag = 'sale' if record_type == 'Sale' else 'purchase'
-                
                 # Insert the merged summary row with expand/collapse icon (expanded by default)
                 parent_item = self.unified_tree.insert('', 'end',
-                    text=f"▼ {record_type} - {ref_id} ({len(records)} items)",  # Text column with expand icon and count (▼ for expanded)
-                    values=(
-                        record_type,  # Type
-                        ref_id,  # Ref ID
-                        supplier_name,  # Supplier
-                        f"{len(records)} items",  # Item count instead of individual item
-                        f"{total_gross:.2f}",  # Total Gross
-                        f"{total_less:.2f}",  # Total Less
-                        f"{total_net:.2f}",  # Total Net
-                        f"{total_fine_gold:.2f}g",  # Total Fine Gold (combined)
-                        f"{len(records)} entries",  # Wastage column used for entry count
-                        f"{total_fine_gold:.2f}",  # Fine Gold (duplicate for display)
-                        sale_date[:10] if sale_date else 'N/A',  # Date (first 10 chars)
-                        ''  # Sale ID (empty for summary row)
-                ), tags=(tag,), open=True)  # Start expanded by default
+                    text=f"▼ {group.record_type} - {ref_id} ({len(records)} items)",  # Text column with expand icon and count (▼ for expanded)
+                    values=group.display_values(), tags=(tag,), open=True)  # Start expanded by default
 
                 # Store the ref_id in the item for later reference
                 self.unified_tree.set(parent_item, 'Ref ID', ref_id)
 
                 # Add individual item rows as children (visible since parent is expanded)
-                for i, record in enumerate(records):
-                    item_name = record[3] or 'N/A'
-                    child_item = self.unified_tree.insert(parent_item, 'end', 
-                        text=f"  • {item_name}",
-                        values=(
-                            '',  # Type (empty for child items)
-                            '',  # Ref ID (empty for child items)
-                            '',  # Supplier (empty for child items)
-                            item_name,  # Item name
-                            f"{record[4]:.2f}",  # Gross
-                            f"{record[5]:.2f}",  # Less
-                            f"{record[6]:.2f}",  # Net
-                            f"{record[7]:.1f}%",  # Tunch
-                            f"{record[8]:.1f}%",  # Wastage
-                            f"{record[9]:.2f}",  # Fine Gold
-                            record[10][:10] if record[10] else 'N/A',  # Date
-                            record[11]  # Sale ID
-                        ), tags=(f"{tag}_child",))
-                
-                # Keep parent item expanded by default
-                
-        except Exception as e:
-            print(f"Error loading unified data: {e}")
-    
+                for record in records:
+                    self.unified_tree.insert(parent_item, 'end',
+                        text=f"  • {record.item_name or 'N/A'}",
+                        values=record.display_values(), tags=(f"{tag}_child",))
+
+        self._submit_view_load('unified', fetch, render, "Error loading unified data", version)
+
     def create_work_orders_tab(self):
         """Create karigar (work) orders management tab"""
-        work_frame = ttk.Frame(self.notebook)
-        self.notebook.add(work_frame, text="🧑‍🏭 Karigar Orders")
+        work_frame = self._tab_frame("🧑‍🏭 Karigar Orders")
         
         # Buttons frame with better styling
         btn_frame = tk.Frame(work_frame, bg=COLORS['light'])
@@ -1954,7 +1912,27 @@ class GoldJewelryApp:
         scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.work_orders_tree.yview)
         scrollbar.pack(side='right', fill='y')
         self.work_orders_tree.configure(yscrollcommand=scrollbar.set)
-        
+
+        # Metal each karigar holds across open orders; expand a karigar for its items
+        exposure_frame = tk.LabelFrame(work_frame, text="Outstanding Metal by Karigar", font=FONTS['heading'],
+                                       bg=COLORS['light'], fg=COLORS['dark'])
+        exposure_frame.pack(fill='x', padx=15, pady=(0, 15))
+        exposure_columns = ('Karigar', 'Open Orders', 'Issued (g)', 'Received (g)', 'Outstanding (g)') + \
+            tuple(label for _limit, label in AGE_BUCKETS)
+        self.karigar_exposure_tree = ttk.Treeview(exposure_frame, columns=exposure_columns, show='tree headings',
+                                                  style='Treeview', height=6)
+        self.karigar_exposure_tree.column('#0', width=30, stretch=False)
+        for col in exposure_columns:
+            self.karigar_exposure_tree.heading(col, text=col)
+            self.karigar_exposure_tree.column(col, width=110, anchor='center')
+        self.karigar_exposure_tree.tag_configure('even', background=COLORS['light'])
+        self.karigar_exposure_tree.tag_configure('odd', background=COLORS['white'])
+        self.karigar_exposure_tree.tag_configure('total', font=FONTS['heading'])
+        self.karigar_exposure_tree.pack(side='left', fill='x', expand=True)
+        exposure_scrollbar = ttk.Scrollbar(exposure_frame, orient='vertical', command=self.karigar_exposure_tree.yview)
+        exposure_scrollbar.pack(side='right', fill='y')
+        self.karigar_exposure_tree.configure(yscrollcommand=exposure_scrollbar.set)
+
         # Initial load
         self.load_karigar_orders_data()
 
@@ -1982,56 +1960,41 @@ class GoldJewelryApp:
         """Load rows from karigar_orders table into the karigar orders tree"""
         if not hasattr(self, 'work_orders_tree'):
             return
-        for item in self.work_orders_tree.get_children():
-            self.work_orders_tree.delete(item)
+        self.load_karigar_exposure()
+        version = self._changed_view_version('karigar_orders', ('karigar_orders',))
+        if version is None:
+            return
         try:
-            # Ensure table exists
-            self.db.execute_update(
-                """
-                CREATE TABLE IF NOT EXISTS karigar_orders (
-                    order_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    karigar_id INTEGER,
-                    karigar_name TEXT,
-                    issued_total REAL DEFAULT 0,
-                    received_total REAL DEFAULT 0,
-                    balance_total REAL DEFAULT 0,
-                    status TEXT DEFAULT 'pending',
-                    created_at TEXT
-                )
-                """
-            )
-            # Backfill status column if missing
-            try:
-                cols = self.db.execute_query("PRAGMA table_info(karigar_orders)") or []
-                has_status = any(c[1].lower() == 'status' for c in cols)
-                if not has_status:
-                    self.db.execute_update("ALTER TABLE karigar_orders ADD COLUMN status TEXT DEFAULT 'pending'")
-            except Exception:
-                pass
-            rows = self.db.execute_query(
-                """
-                SELECT order_id, karigar_name, issued_total, received_total, balance_total, status, created_at
-                FROM karigar_orders
-                WHERE LOWER(COALESCE(status, '')) = 'in progress'
-                ORDER BY order_id DESC
-                """
-            ) or []
-            for i, r in enumerate(rows):
-                tag = 'even' if i % 2 == 0 else 'odd'
-                self.work_orders_tree.insert('', 'end', values=(
-                    r[0],                 # Order ID
-                    r[1] or '',           # Karigar
-                    f"{(r[2] or 0):.2f}",# Issued
-                    f"{(r[3] or 0):.2f}",# Received
-                    f"{(r[4] or 0):.2f}",# Balance
-                    (r[5] or 'pending').capitalize(), # Status
-                    r[6] or ''            # Created At
-                ), tags=(tag,))
+            rows = self.karigar_service.iter_open_orders()
+            self._stream_rows_into_tree(self.work_orders_tree, rows, KarigarOrder.display_values,
+                                        on_done=lambda _n: self._mark_view_rendered('karigar_orders', version))
         except Exception as e:
             try:
                 messagebox.showerror("Error", f"Error loading karigar orders: {e}")
             except Exception:
-                print(f"Error loading karigar orders: {e}")
+                logger.error("Error loading karigar orders: %s", e)
+
+    def load_karigar_exposure(self):
+        """Show outstanding metal per karigar; nothing is redrawn while the exposure is unchanged"""
+        if not hasattr(self, 'karigar_exposure_tree'):
+            return
+        try:
+            version = self.exposure_service.refresh()
+        except Exception as e:
+            logger.error("Error loading karigar exposure: %s", e)
+            return
+        if version == self._view_versions.get('karigar_exposure'):
+            return
+        tree = self.karigar_exposure_tree
+        tree.delete(*tree.get_children())
+        for i, row in enumerate(self.exposure_service.by_karigar()):
+            parent = tree.insert('', 'end', values=row.display_values(), tags=('even' if i % 2 == 0 else 'odd',))
+            for values in row.item_values():
+                tree.insert(parent, 'end', values=values)
+        outstanding, ageing = self.exposure_service.totals()
+        tree.insert('', 'end', values=('Total', '', '', '', f"{outstanding:.2f}") +
+                    tuple(f"{amount:.2f}" for amount in ageing), tags=('total',))
+        self._mark_view_rendered('karigar_exposure', version)
 
     def _set_karigar_order_status(self, status_value: str):
         """Helper to set selected karigar orders to a given status."""
@@ -2058,7 +2021,7 @@ class GoldJewelryApp:
             try:
                 messagebox.showerror("Error", f"Error updating order status: {e}")
             except Exception:
-                print(f"Error updating order status: {e}")
+                logger.error("Error updating order status: %s", e)
 
     def update_work_order(self):
         """Mark selected karigar orders as In Progress"""
@@ -2068,10 +2031,47 @@ class GoldJewelryApp:
         """Mark selected karigar orders as Completed"""
         self._set_karigar_order_status('completed')
     
+    def create_reports_tab(self):
+        """Create reports tab; each report is fetched on a background read connection"""
+        reports_frame = self._tab_frame("📊 Reports")
+        self.reports_manager = ReportsManager(self.db)
+
+        btn_frame = tk.Frame(reports_frame, bg=COLORS['light'])
+        btn_frame.pack(fill='x', padx=15, pady=15)
+        for row, buttons in enumerate((
+            (("📦 Inventory", self.reports_manager.generate_inventory_report, 'info'),
+             ("🛠️ Work Orders", self.reports_manager.generate_work_orders_report, 'info'),
+             ("👥 Karigars", self.reports_manager.generate_freelancer_report, 'info')),
+            (("♻️ Wastage", self.reports_manager.generate_wastage_report, 'secondary'),
+             ("📅 This Month", self.reports_manager.generate_monthly_report, 'secondary'),
+             ("📋 Order Details", self.reports_manager.generate_detailed_work_orders_report, 'secondary'),
+             ("💾 Export", self.export_current_report, 'success')),
+        )):
+            line = tk.Frame(btn_frame, bg=COLORS['light'])
+            line.pack(fill='x', pady=(0, 10) if row == 0 else 0)
+            for text, command, color in buttons:
+                self.create_beautiful_button(line, text, command, color, 18).pack(side='left', padx=(0, 10))
+
+        text_frame = tk.Frame(reports_frame, bg=COLORS['light'])
+        text_frame.pack(fill='both', expand=True, padx=15, pady=(0, 15))
+        reports_text = tk.Text(text_frame, font=('Courier New', 10), wrap='none')
+        reports_text.pack(side='left', fill='both', expand=True)
+        scrollbar = ttk.Scrollbar(text_frame, orient='vertical', command=reports_text.yview)
+        scrollbar.pack(side='right', fill='y')
+        reports_text.configure(yscrollcommand=scrollbar.set)
+        self.reports_manager.set_reports_text(reports_text)
+
+    def export_current_report(self):
+        """Save the report on screen to a text file next to the working directory"""
+        filename = self.reports_manager.export_report_to_file()
+        if filename:
+            self.show_toast(f"Report exported • {filename}", success=True)
+        else:
+            messagebox.showerror("Error", "Error exporting report")
+
     def create_freelancers_tab(self):
         """Create karigar (freelancers) management tab"""
-        freelancer_frame = ttk.Frame(self.notebook)
-        self.notebook.add(freelancer_frame, text="👥 Karigar")
+        freelancer_frame = self._tab_frame("👥 Karigar")
         
         # Buttons frame with better styling
         btn_frame = tk.Frame(freelancer_frame, bg=COLORS['light'])
@@ -2108,6 +2108,7 @@ class GoldJewelryApp:
         
         # Set the tree for freelancer manager
         self.freelancer_manager.set_freelancers_tree(self.freelancers_tree)
+        self.freelancer_manager.load_freelancers()
         
         # Bind double-click to show freelancer work orders
         self.freelancers_tree.bind('<Double-1>', lambda e: self.view_freelancer_work_orders())
@@ -2115,8 +2116,7 @@ class GoldJewelryApp:
     
     def create_suppliers_tab(self):
         """Create suppliers management tab"""
-        supplier_frame = ttk.Frame(self.notebook)
-        self.notebook.add(supplier_frame, text="🏢 Suppliers")
+        supplier_frame = self._tab_frame("🏢 Suppliers")
         
         # Buttons frame with better styling
         btn_frame = tk.Frame(supplier_frame, bg=COLORS['light'])
@@ -2164,6 +2164,7 @@ class GoldJewelryApp:
         
         # Set the tree for supplier manager
         self.supplier_manager.set_suppliers_tree(self.suppliers_tree)
+        self.load_suppliers_data()
     
     def on_supplier_double_click(self, event):
         """Handle supplier double-click to show all sales and purchase orders"""
@@ -2177,6 +2178,7 @@ class GoldJewelryApp:
         else:
             messagebox.showwarning("Warning", "Please select a supplier to view orders")
     
+    @timed('ui.show_supplier_orders')
     def show_supplier_orders(self, supplier_id, supplier_name):
         """Show all sales and purchase orders for a specific supplier"""
         # Create modal for showing supplier orders
@@ -2283,10 +2285,6 @@ class GoldJewelryApp:
     
     def load_supplier_sales_data(self, tree_widget, supplier_name):
         """Load sales data for a specific supplier"""
-        # Clear existing items
-        for item in tree_widget.get_children():
-            tree_widget.delete(item)
-        
         try:
             query = '''
                 SELECT 
@@ -2304,31 +2302,29 @@ class GoldJewelryApp:
                 WHERE s.supplier_name = ? AND s.ref_id LIKE 'S%'
                 ORDER BY s.sale_date DESC
             '''
-            rows = self.db.execute_query(query, (supplier_name,))
-            
-            for i, row in enumerate(rows):
-                tag = 'even' if i % 2 == 0 else 'odd'
-                tree_widget.insert('', 'end', values=(
-                    row[0],  # Ref ID
-                    row[1],  # Item
-                    f"{row[2]:.2f}",  # Gross
-                    f"{row[3]:.2f}",  # Less
-                    f"{row[4]:.2f}",  # Net
-                    f"{row[5]:.1f}",  # Tunch
-                    f"{row[6]:.1f}",  # Wastage
-                    f"{row[7]:.2f}",  # Fine Gold
-                    row[8][:10] if row[8] else 'N/A'  # Date
-                ), tags=(tag,))
+            rows = self.db.iter_query(query, (supplier_name,))
+            self._stream_rows_into_tree(tree_widget, rows, self._format_supplier_ledger_row)
                 
         except Exception as e:
-            print(f"Error loading supplier sales data: {e}")
+            logger.error("Error loading supplier sales data: %s", e)
+    
+    @staticmethod
+    def _format_supplier_ledger_row(row):
+        """Tree values for one sale/purchase line in the supplier orders view"""
+        return (
+            row[0],  # Ref ID
+            row[1],  # Item
+            f"{row[2]:.2f}",  # Gross
+            f"{row[3]:.2f}",  # Less
+            f"{row[4]:.2f}",  # Net
+            f"{row[5]:.1f}",  # Tunch
+            f"{row[6]:.1f}",  # Wastage
+            f"{row[7]:.2f}",  # Fine Gold
+            row[8][:10] if row[8] else 'N/A'  # Date
+        )
     
     def load_supplier_purchases_data(self, tree_widget, supplier_name):
         """Load purchase data for a specific supplier"""
-        # Clear existing items
-        for item in tree_widget.get_children():
-            tree_widget.delete(item)
-        
         try:
             query = '''
                 SELECT 
@@ -2346,24 +2342,11 @@ class GoldJewelryApp:
                 WHERE s.supplier_name = ? AND s.ref_id LIKE 'P%'
                 ORDER BY s.sale_date DESC
             '''
-            rows = self.db.execute_query(query, (supplier_name,))
-            
-            for i, row in enumerate(rows):
-                tag = 'even' if i % 2 == 0 else 'odd'
-                tree_widget.insert('', 'end', values=(
-                    row[0],  # Ref ID
-                    row[1],  # Item
-                    f"{row[2]:.2f}",  # Gross
-                    f"{row[3]:.2f}",  # Less
-                    f"{row[4]:.2f}",  # Net
-                    f"{row[5]:.1f}",  # Tunch
-                    f"{row[6]:.1f}",  # Wastage
-                    f"{row[7]:.2f}",  # Fine Gold
-                    row[8][:10] if row[8] else 'N/A'  # Date
-                ), tags=(tag,))
+            rows = self.db.iter_query(query, (supplier_name,))
+            self._stream_rows_into_tree(tree_widget, rows, self._format_supplier_ledger_row)
                 
         except Exception as e:
-            print(f"Error loading supplier purchases data: {e}")
+            logger.error("Error loading supplier purchases data: %s", e)
     
     def delete_selected_supplier(self):
         """Delete selected supplier and all related records"""
@@ -2378,86 +2361,33 @@ class GoldJewelryApp:
         supplier_id = values[0]
         supplier_name = values[1]
         
-        # Check for related records
-        related_sales = self.get_supplier_related_sales(supplier_name)
-        related_purchases = self.get_supplier_related_purchases(supplier_name)
+        # Count related records
+        try:
+            sales_count, purchases_count = self.suppliers_service.line_counts(supplier_name)
+        except Exception as e:
+            logger.error("Error counting supplier lines: %s", e)
+            sales_count = purchases_count = '?'
         
         # Show confirmation dialog with details
         message = f"Are you sure you want to delete supplier '{supplier_name}'?\n\n"
         message += f"This will also delete:\n"
-        message += f"• {len(related_sales)} sales record(s)\n"
-        message += f"• {len(related_purchases)} purchase record(s)\n\n"
+        message += f"• {sales_count} sales record(s)\n"
+        message += f"• {purchases_count} purchase record(s)\n\n"
         message += "This action cannot be undone!"
         
         if messagebox.askyesno("Confirm Delete", message):
-            self.delete_supplier_and_related_data(supplier_id, supplier_name, related_sales, related_purchases)
-    
-    def get_supplier_related_sales(self, supplier_name):
-        """Get all sales records for a supplier"""
-        try:
-            query = "SELECT ref_id, fine_gold, net_weight, item_id FROM sales WHERE supplier_name = ? AND ref_id LIKE 'S%'"
-            return self.db.execute_query(query, (supplier_name,))
-        except Exception as e:
-            print(f"Error getting related sales: {e}")
-            return []
-    
-    def get_supplier_related_purchases(self, supplier_name):
-        """Get all purchase records for a supplier"""
-        try:
-            query = "SELECT ref_id, fine_gold, net_weight, item_id FROM sales WHERE supplier_name = ? AND ref_id LIKE 'P%'"
-            return self.db.execute_query(query, (supplier_name,))
-        except Exception as e:
-            print(f"Error getting related purchases: {e}")
-            return []
+            self.delete_supplier_and_related_data(supplier_id, supplier_name)
     
-    def delete_supplier_and_related_data(self, supplier_id, supplier_name, related_sales, related_purchases):
+    def delete_supplier_and_related_data(self, supplier_id, supplier_name):
         """Delete supplier and all related sales/purchase records"""
         try:
-            deleted_sales = 0
-            deleted_purchases = 0
-            
-            # Delete sales records and adjust inventory
-            for sale in related_sales:
-                ref_id, fine_gold, net_weight, item_id = sale
-                
-                # Adjust inventory (add back weights since deleting sale)
-                self.update_item_inventory(item_id, fine_gold, net_weight, 'add')
-                
-                # Adjust supplier balance (subtract monetary value since deleting sale)
-                monetary_value = self.calculate_monetary_value(fine_gold)
-                self.update_supplier_balance(supplier_name, monetary_value, 'subtract')
-                
-                # Delete the sales record
-                delete_query = "DELETE FROM sales WHERE ref_id = ?"
-                self.db.execute_update(delete_query, (ref_id,))
-                deleted_sales += 1
-                print(f"Deleted sales record {ref_id}")
-            
-            # Delete purchase records and adjust inventory
-            for purchase in related_purchases:
-                ref_id, fine_gold, net_weight, item_id = purchase
-                
-                # Adjust inventory (subtract weights since deleting purchase)
-                self.update_item_inventory(item_id, fine_gold, net_weight, 'subtract')
-                
-                # Adjust supplier balance (add back monetary value since deleting purchase)
-                monetary_value = self.calculate_monetary_value(fine_gold)
-                self.update_supplier_balance(supplier_name, monetary_value, 'add')
-                
-                # Delete the purchase record
-                delete_query = "DELETE FROM sales WHERE ref_id = ?"
-                self.db.execute_update(delete_query, (ref_id,))
-                deleted_purchases += 1
-                print(f"Deleted purchase record {ref_id}")
+            # Item stock reversal and every delete commit together; the counts come from the database
+            deleted_sales, deleted_purchases = self.suppliers_service.delete_with_lines(supplier_id, supplier_name)
+            logger.debug("Deleted supplier %s with %s sales and %s purchase lines",
+                         supplier_name, deleted_sales, deleted_purchases)
             
-            # Delete the supplier
-            supplier_delete_query = "DELETE FROM suppliers WHERE supplier_id = ?"
-            self.db.execute_update(supplier_delete_query, (supplier_id,))
-            
-            # Refresh all tables
-            self.load_suppliers_data()
-            self.load_unified_data()
-            self.load_items_data()
+            # One refresh of every affected view
+            self.request_refresh(self.load_suppliers_data, self.load_unified_data, self.load_items_data)
             
             self.show_toast(f"Successfully deleted supplier '{supplier_name}' • Deleted {deleted_sales} sales, {deleted_purchases} purchases, adjusted inventory", success=True)
             
@@ -2512,34 +2442,173 @@ class GoldJewelryApp:
         if not hasattr(self, 'suppliers_tree'):
             return
             
-        # Clear existing items
-        for item in self.suppliers_tree.get_children():
-            self.suppliers_tree.delete(item)
-        
         try:
-            query = '''
-                SELECT 
-                    supplier_id,
-                    supplier_name,
-                    contact_person,
-                    phone,
-                    email,
-                    address,
-                    gst_number,
-                    CASE WHEN is_active = 1 THEN 'Active' ELSE 'Inactive' END as status
-                FROM suppliers
-                ORDER BY supplier_name
-            '''
-            rows = self.db.execute_query(query)
-            
-            for i, row in enumerate(rows):
-                tag = 'even' if i % 2 == 0 else 'odd'
-                self.suppliers_tree.insert('', 'end', values=row, tags=(tag,))
+            rows = self.suppliers_service.iter_suppliers()
+            self._stream_rows_into_tree(self.suppliers_tree, rows, Supplier.display_values)
                 
         except Exception as e:
-            print(f"Error loading suppliers data: {e}")
+            logger.error("Error loading suppliers data: %s", e)
     
     
+    def _changed_view_version(self, view, tables, key=None):
+        """Version of the tables view is drawn from (plus key, e.g. its filters), or None when the view
+        already shows exactly that version. Pass the version to _mark_view_rendered once it's drawn.
+        """
+        try:
+            version = (key, self.db.change_version(tables))
+        except Exception as e:
+            logger.error("Error reading change counters for %s: %s", view, e)
+            # Equal to nothing, so the view reloads
+            return (key, object())
+        return None if self._view_versions.get(view) == version else version
+
+    def request_refresh(self, *loaders):
+        """Run view loaders (e.g. self.load_items_data) once on the next idle turn. Requests made
+        before then are merged, so several changes in one action reload each view once."""
+        for loader in loaders:
+            self._pending_refreshes[loader] = None
+        if self._refresh_job is None:
+            self._refresh_job = self.root.after_idle(self._flush_refreshes)
+
+    def _flush_refreshes(self):
+        loaders = list(self._pending_refreshes)
+        self._pending_refreshes.clear()
+        self._refresh_job = None
+        for loader in loaders:
+            try:
+                loader()
+            except Exception as e:
+                logger.error("Error refreshing %s: %s", getattr(loader, '__name__', loader), e)
+
+    def _mark_view_rendered(self, view, version):
+        self._view_versions[view] = version
+
+    def _submit_view_load(self, view, fetch, render, error_message, version=None):
+        """Run fetch(conn) on a background read connection and pass its result to render() on the Tk thread.
+        A newer load of the same view supersedes older ones, whose results are dropped.
+        version (see _changed_view_version) is recorded for the view once render() succeeds.
+        Timed as view.<view>.fetch and .render, and end to end (queueing included) as view.<view>.load.
+        """
+        token = self._view_load_tokens.get(view, 0) + 1
+        self._view_load_tokens[view] = token
+        started = time.perf_counter()
+
+        def timed_fetch(conn):
+            with timer(f'view.{view}.fetch'):
+                return fetch(conn)
+
+        def deliver(result):
+            if self._view_load_tokens.get(view) != token:
+                return
+            try:
+                with timer(f'view.{view}.render'):
+                    render(result)
+                self._mark_view_rendered(view, version)
+                metrics.record(f'view.{view}.load', time.perf_counter() - started)
+            except Exception as e:
+                logger.error("%s: %s", error_message, e)
+
+        def fail(error):
+            if self._view_load_tokens.get(view) == token:
+                logger.error("%s: %s", error_message, error)
+
+        self.db.submit_read(timed_fetch, tk_root=self.root, callback=deliver, error_callback=fail)
+
+    def _stream_rows_into_tree(self, tree, rows, format_row, on_done=None, chunk_size=TREE_INSERT_CHUNK):
+        """Clear tree and insert rows from an iterator chunk_size at a time, yielding to the
+        event loop between chunks. format_row(row) returns the values tuple for one row.
+        Starting another stream into the same tree cancels this one.
+        """
+        key = str(tree)
+        token = self._tree_stream_tokens.get(key, 0) + 1
+        self._tree_stream_tokens[key] = token
+        tree.delete(*tree.get_children())
+        count = [0]
+
+        def insert_chunk():
+            if self._tree_stream_tokens.get(key) != token or not tree.winfo_exists():
+                if hasattr(rows, 'close'):
+                    rows.close()
+                return
+            inserted = 0
+            try:
+                for row in itertools.islice(rows, chunk_size):
+                    tag = 'even' if count[0] % 2 == 0 else 'odd'
+                    tree.insert('', 'end', values=format_row(row), tags=(tag,))
+                    count[0] += 1
+                    inserted += 1
+            except Exception as e:
+                logger.error("Error loading rows into %s: %s", key, e)
+                if hasattr(rows, 'close'):
+                    rows.close()
+                return
+            if inserted == chunk_size:
+                tree.after(1, insert_chunk)
+            elif on_done:
+                on_done(count[0])
+
+        insert_chunk()
+
+    def metrics_report_path(self):
+        """metrics.json next to the database"""
+        return os.path.join(os.path.dirname(os.path.abspath(self.db.db_path)), METRICS_REPORT_NAME)
+
+    def dump_metrics(self, path=None):
+        """Write the collected timings to JSON; returns the path"""
+        return metrics.dump_json(path or self.metrics_report_path())
+
+    def show_diagnostics_panel(self):
+        """Hidden panel (Ctrl+Shift+D) listing per-entry-point and per-statement latencies"""
+        modal = tk.Toplevel(self.root)
+        modal.title("Diagnostics")
+        modal.geometry("1100x600")
+        modal.transient(self.root)
+
+        main_frame = tk.Frame(modal, bg=COLORS['light'])
+        main_frame.pack(fill='both', expand=True, padx=20, pady=20)
+
+        tree_frame = tk.Frame(main_frame, bg=COLORS['light'])
+        tree_frame.pack(fill='both', expand=True)
+        columns = ('Metric', 'Count', 'p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'Max (ms)', 'Total (ms)', 'Rows')
+        tree = ttk.Treeview(tree_frame, columns=columns, show='headings', style='Treeview')
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=90, anchor='center')
+        tree.column('Metric', width=420, anchor='w')
+        tree.tag_configure('even', background=COLORS['light'])
+        tree.tag_configure('odd', background=COLORS['white'])
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=tree.yview)
+        scrollbar.pack(side='right', fill='y')
+        tree.configure(yscrollcommand=scrollbar.set)
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            for i, (name, m) in enumerate(metrics.snapshot().items()):
+                tree.insert('', 'end', tags=('even' if i % 2 == 0 else 'odd',), values=(
+                    name, m['count'], f"{m['p50_ms']:.2f}", f"{m['p95_ms']:.2f}", f"{m['p99_ms']:.2f}",
+                    f"{m['max_ms']:.2f}", f"{m['total_ms']:.1f}", m['rows']))
+
+        def reset():
+            metrics.reset()
+            refresh()
+
+        def export():
+            try:
+                path = self.dump_metrics()
+                self.show_toast(f"Metrics written to {path}")
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not write metrics: {e}", parent=modal)
+
+        button_frame = tk.Frame(main_frame, bg=COLORS['light'])
+        button_frame.pack(pady=(15, 0))
+        for text, command in (("Refresh", refresh), ("Reset", reset), ("Export JSON", export), ("Close", modal.destroy)):
+            tk.Button(button_frame, text=text, command=command, font=FONTS['body'],
+                      bg=COLORS['secondary'], fg=COLORS['white'], relief='raised', bd=2,
+                      width=12).pack(side='left', padx=5)
+
+        refresh()
+
     def load_data(self):
         """Load data into all treeviews"""
         self.work_order_manager.load_work_orders()
@@ -2561,39 +2630,7 @@ class GoldJewelryApp:
     
     def generate_purchase_ref_id(self):
         """Generate purchase reference ID with format: P + DDMMYY + / + 3-digit incremental"""
-        from datetime import datetime
-        today = datetime.now()
-        date_str = today.strftime('%d%m%y')
-        
-        try:
-            # Get the highest existing number for today from sales table
-            query = f"SELECT ref_id FROM sales WHERE ref_id LIKE 'P{date_str}/%' ORDER BY ref_id DESC LIMIT 1"
-            result = self.db.execute_query(query)
-            
-            if result and result[0][0]:
-                existing_ref = result[0][0]
-                existing_num = int(existing_ref.split('/')[-1])
-                next_num = existing_num + 1
-            else:
-                next_num = 1
-            
-            # Format as 3-digit number
-            ref_id = f"P{date_str}/{next_num:03d}"
-            
-            # Double-check that this Ref ID doesn't already exist
-            check_query = "SELECT COUNT(*) FROM sales WHERE ref_id = ?"
-            check_result = self.db.execute_query(check_query, (ref_id,))
-            if check_result and check_result[0][0] > 0:
-                print(f"WARNING: Ref ID {ref_id} already exists! Incrementing...")
-                next_num += 1
-                ref_id = f"P{date_str}/{next_num:03d}"
-                
-        except Exception as e:
-            print(f"Error generating purchase ref ID: {e}")
-            next_num = 1
-            ref_id = f"P{date_str}/{next_num:03d}"
-        
-        return ref_id
+        return self.purchases_service.next_ref_id()[0]
     
     def add_purchase(self):
         """Add new gold purchase - open multiple purchases directly"""
@@ -2608,28 +2645,15 @@ class GoldJewelryApp:
         
         # Get the sales record data
         try:
-            query = '''
-                SELECT 
-                    s.ref_id,
-                    s.supplier_name,
-                    s.item_id,
-                    s.gross_weight,
-                    s.less_weight,
-                    s.net_weight,
-                    s.tunch_percentage,
-                    s.wastage_percentage,
-                    s.fine_gold,
-                    s.sale_date
-                FROM sales s
-                WHERE s.ref_id = ?
-            '''
-            result = self.db.execute_query(query, (ref_id,))
+            # The whole group in one read, keyed by sale_id; edits stay in memory until saved
+            group = self.sales_service.load_group(ref_id)
             
-            if not result:
+            if not group:
                 messagebox.showerror("Error", "Sales record not found")
                 return
                 
-            record = result[0]
+            line_ids = list(group)
+            record = group[line_ids[0]]
             
         except Exception as e:
             messagebox.showerror("Error", f"Error loading sales record: {e}")
@@ -2638,7 +2662,7 @@ class GoldJewelryApp:
         # Create update modal
         update_modal = tk.Toplevel(self.root)
         update_modal.title(f"Update Sales Order - {ref_id}")
-        update_modal.geometry("700x600")
+        update_modal.geometry("700x680")
         update_modal.resizable(False, False)
         update_modal.transient(self.root)
         update_modal.grab_set()
@@ -2646,8 +2670,8 @@ class GoldJewelryApp:
         # Center the modal
         update_modal.update_idletasks()
         x = (update_modal.winfo_screenwidth() // 2) - (700 // 2)
-        y = (update_modal.winfo_screenheight() // 2) - (600 // 2)
-        update_modal.geometry(f"700x600+{x}+{y}")
+        y = (update_modal.winfo_screenheight() // 2) - (680 // 2)
+        update_modal.geometry(f"700x680+{x}+{y}")
         
         # Main frame
         main_frame = tk.Frame(update_modal, bg=COLORS['light'])
@@ -2681,6 +2705,26 @@ class GoldJewelryApp:
         ref_entry.insert(0, ref_id)
         ref_entry.config(state='readonly')
         
+        # Line selector: the group's lines are edited one at a time
+        line_frame = tk.Frame(main_frame, bg=COLORS['light'])
+        line_frame.pack(fill='x', pady=(0, 15))
+        
+        line_label = tk.Label(line_frame, 
+                             text="Line:",
+                             font=FONTS['body'],
+                             fg=COLORS['dark'],
+                             bg=COLORS['light'])
+        line_label.pack(anchor='w')
+        
+        line_combo = ttk.Combobox(line_frame, 
+                                 font=FONTS['body'],
+                                 width=30,
+                                 state='readonly')
+        line_combo['values'] = [f"{n} of {len(group)} - {line.item_name or 'N/A'} ({line.gross_weight:.2f}g)"
+                                for n, line in enumerate(group.values(), 1)]
+        line_combo.current(0)
+        line_combo.pack(fill='x', pady=(5, 0))
+        
         # Load suppliers and items for dropdowns
         try:
             suppliers = self.db.execute_query("SELECT supplier_id, supplier_name FROM suppliers ORDER BY supplier_name")
@@ -2899,70 +2943,63 @@ class GoldJewelryApp:
         self.add_number_validation(tunch_entry)
         self.add_number_validation(wastage_entry)
         
+        # Typed values per edited sale_id: (item, gross, less, tunch, wastage)
+        edits = {}
+        shown_line = [line_ids[0]]
+        
+        def line_values(sale_id):
+            if sale_id in edits:
+                return edits[sale_id]
+            line = group[sale_id]
+            item_text = next((option for option in item_options if option.startswith(f"{line.item_id} -")),
+                             f"{line.item_id} - {line.item_name or 'N/A'}")
+            return (item_text, str(line.gross_weight), str(line.less_weight), str(line.tunch_percentage),
+                    str(line.wastage_percentage))
+        
+        def stash_shown_line():
+            edits[shown_line[0]] = (item_combo.get().strip(), gross_entry.get().strip(), less_entry.get().strip(),
+                                    tunch_entry.get().strip(), wastage_entry.get().strip())
+        
+        def show_line(_event=None):
+            stash_shown_line()
+            shown_line[0] = line_ids[line_combo.current()]
+            item_text, gross, less, tunch, wastage = line_values(shown_line[0])
+            item_combo.set(item_text)
+            self.populate_entry_field(gross_entry, gross)
+            self.populate_entry_field(less_entry, less)
+            self.populate_entry_field(tunch_entry, tunch)
+            self.populate_entry_field(wastage_entry, wastage)
+            calculate_values()
+        
+        line_combo.bind('<<ComboboxSelected>>', show_line)
+        
         # Buttons
         button_frame = tk.Frame(main_frame, bg=COLORS['light'])
         button_frame.pack(fill='x', pady=(20, 0))
         
         def save_update():
-            """Save the updated sales record"""
+            """Save the edited lines of the sale group in one transaction"""
             supplier_text = supplier_combo.get().strip()
-            item_text = item_combo.get().strip()
-            gross = gross_entry.get().strip()
-            less = less_entry.get().strip()
-            tunch = tunch_entry.get().strip()
-            wastage = wastage_entry.get().strip()
+            stash_shown_line()
             
-            if not all([supplier_text, item_text, gross, less, tunch, wastage]):
+            if not supplier_text or not all(all(values) for values in edits.values()):
                 messagebox.showerror("Error", "All fields are required")
                 return
             
             try:
-                # Get old values for inventory and balance adjustment
-                old_query = "SELECT item_id, fine_gold, net_weight, supplier_name FROM sales WHERE ref_id = ?"
-                old_values = self.db.execute_query(old_query, (ref_id,))
-                if old_values:
-                    old_item_id, old_fine_gold, old_net_weight, old_supplier_name = old_values[0]
-                else:
-                    old_item_id, old_fine_gold, old_net_weight, old_supplier_name = 0, 0, 0, ""
-                
-                # Extract supplier_id and supplier_name
-                supplier_id = int(supplier_text.split(' - ')[0])
+                # Extract supplier_name
                 supplier_name = supplier_text.split(' - ')[1]
                 
-                # Extract item_id
-                item_id = int(item_text.split(' - ')[0])
-                
-                # Calculate values
-                net_weight = float(gross) - float(less)
-                fine_gold = (net_weight / 100 * float(tunch)) + (net_weight / 100 * float(wastage))
-                
-                # Update the record
-                query = '''
-                    UPDATE sales 
-                    SET supplier_name = ?, item_id = ?, gross_weight = ?, less_weight = ?, 
-                        net_weight = ?, tunch_percentage = ?, wastage_percentage = ?, fine_gold = ?
-                    WHERE ref_id = ?
-                '''
-                self.db.execute_update(query, (
-                    supplier_name, item_id, float(gross), float(less),
-                    net_weight, float(tunch), float(wastage), fine_gold, ref_id
-                ))
-                
-                # Update item inventory (reverse old sale, apply new sale)
-                self.update_item_inventory_for_record_update(
-                    ref_id, old_fine_gold, old_net_weight, fine_gold, net_weight, 
-                    old_item_id, item_id, is_purchase=False
-                )
-                
-                # Update supplier balance (reverse old sale, apply new sale)
-                old_monetary_value = self.calculate_monetary_value(old_fine_gold)
-                new_monetary_value = self.calculate_monetary_value(fine_gold)
-                self.update_supplier_balance_for_record_update(
-                    ref_id, old_monetary_value, new_monetary_value, old_supplier_name, supplier_name, is_purchase=False
-                )
+                # Untouched lines keep their values; stock and balances move by the difference only
+                lines = []
+                for sale_id in line_ids:
+                    item_text, gross, less, tunch, wastage = line_values(sale_id)
+                    lines.append((sale_id, int(item_text.split(' - ')[0]), gross, less, tunch, wastage))
+                self.sales_service.update_group(ref_id, group, supplier_name, lines)
                 
                 self.show_toast("Sales record updated successfully!", success=True)
                 self.load_unified_data()  # Refresh unified table
+                self.load_items_data()
                 update_modal.destroy()
                 
             except Exception as e:
@@ -2996,28 +3033,15 @@ class GoldJewelryApp:
         
         # Get the purchase record data
         try:
-            query = '''
-                SELECT 
-                    s.ref_id,
-                    s.supplier_name,
-                    s.item_id,
-                    s.gross_weight,
-                    s.less_weight,
-                    s.net_weight,
-                    s.tunch_percentage,
-                    s.wastage_percentage,
-                    s.fine_gold,
-                    s.sale_date
-                FROM sales s
-                WHERE s.ref_id = ?
-            '''
-            result = self.db.execute_query(query, (ref_id,))
+            # The whole group in one read, keyed by sale_id; edits stay in memory until saved
+            group = self.purchases_service.load_group(ref_id)
             
-            if not result:
+            if not group:
                 messagebox.showerror("Error", "Purchase record not found")
                 return
                 
-            record = result[0]
+            line_ids = list(group)
+            record = group[line_ids[0]]
             
         except Exception as e:
             messagebox.showerror("Error", f"Error loading purchase record: {e}")
@@ -3026,7 +3050,7 @@ class GoldJewelryApp:
         # Create update modal
         update_modal = tk.Toplevel(self.root)
         update_modal.title(f"Update Purchase Order - {ref_id}")
-        update_modal.geometry("700x600")
+        update_modal.geometry("700x680")
         update_modal.resizable(False, False)
         update_modal.transient(self.root)
         update_modal.grab_set()
@@ -3034,8 +3058,8 @@ class GoldJewelryApp:
         # Center the modal
         update_modal.update_idletasks()
         x = (update_modal.winfo_screenwidth() // 2) - (700 // 2)
-        y = (update_modal.winfo_screenheight() // 2) - (600 // 2)
-        update_modal.geometry(f"700x600+{x}+{y}")
+        y = (update_modal.winfo_screenheight() // 2) - (680 // 2)
+        update_modal.geometry(f"700x680+{x}+{y}")
         
         # Main frame
         main_frame = tk.Frame(update_modal, bg=COLORS['light'])
@@ -3069,6 +3093,26 @@ class GoldJewelryApp:
         ref_entry.insert(0, ref_id)
         ref_entry.config(state='readonly')
         
+        # Line selector: the group's lines are edited one at a time
+        line_frame = tk.Frame(main_frame, bg=COLORS['light'])
+        line_frame.pack(fill='x', pady=(0, 15))
+        
+        line_label = tk.Label(line_frame, 
+                             text="Line:",
+                             font=FONTS['body'],
+                             fg=COLORS['dark'],
+                             bg=COLORS['light'])
+        line_label.pack(anchor='w')
+        
+        line_combo = ttk.Combobox(line_frame, 
+                                 font=FONTS['body'],
+                                 width=30,
+                                 state='readonly')
+        line_combo['values'] = [f"{n} of {len(group)} - {line.item_name or 'N/A'} ({line.gross_weight:.2f}g)"
+                                for n, line in enumerate(group.values(), 1)]
+        line_combo.current(0)
+        line_combo.pack(fill='x', pady=(5, 0))
+        
         # Load suppliers and items for dropdowns
         try:
             suppliers = self.db.execute_query("SELECT supplier_id, supplier_name FROM suppliers ORDER BY supplier_name")
@@ -3283,70 +3327,63 @@ class GoldJewelryApp:
         self.add_number_validation(tunch_entry)
         self.add_number_validation(wastage_entry)
         
+        # Typed values per edited sale_id: (item, gross, less, tunch, wastage)
+        edits = {}
+        shown_line = [line_ids[0]]
+        
+        def line_values(sale_id):
+            if sale_id in edits:
+                return edits[sale_id]
+            line = group[sale_id]
+            item_text = next((option for option in item_options if option.startswith(f"{line.item_id} -")),
+                             f"{line.item_id} - {line.item_name or 'N/A'}")
+            return (item_text, str(line.gross_weight), str(line.less_weight), str(line.tunch_percentage),
+                    str(line.wastage_percentage))
+        
+        def stash_shown_line():
+            edits[shown_line[0]] = (item_combo.get().strip(), gross_entry.get().strip(), less_entry.get().strip(),
+                                    tunch_entry.get().strip(), wastage_entry.get().strip())
+        
+        def show_line(_event=None):
+            stash_shown_line()
+            shown_line[0] = line_ids[line_combo.current()]
+            item_text, gross, less, tunch, wastage = line_values(shown_line[0])
+            item_combo.set(item_text)
+            self.populate_entry_field(gross_entry, gross)
+            self.populate_entry_field(less_entry, less)
+            self.populate_entry_field(tunch_entry, tunch)
+            self.populate_entry_field(wastage_entry, wastage)
+            calculate_values()
+        
+        line_combo.bind('<<ComboboxSelected>>', show_line)
+        
         # Buttons
         button_frame = tk.Frame(main_frame, bg=COLORS['light'])
         button_frame.pack(fill='x', pady=(20, 0))
         
         def save_update():
-            """Save the updated purchase record"""
+            """Save the edited lines of the purchase group in one transaction"""
             supplier_text = supplier_combo.get().strip()
-            item_text = item_combo.get().strip()
-            gross = gross_entry.get().strip()
-            less = less_entry.get().strip()
-            tunch = tunch_entry.get().strip()
-            wastage = wastage_entry.get().strip()
+            stash_shown_line()
             
-            if not all([supplier_text, item_text, gross, less, tunch, wastage]):
+            if not supplier_text or not all(all(values) for values in edits.values()):
                 messagebox.showerror("Error", "All fields are required")
                 return
             
             try:
-                # Get old values for inventory and balance adjustment
-                old_query = "SELECT item_id, fine_gold, net_weight, supplier_name FROM sales WHERE ref_id = ?"
-                old_values = self.db.execute_query(old_query, (ref_id,))
-                if old_values:
-                    old_item_id, old_fine_gold, old_net_weight, old_supplier_name = old_values[0]
-                else:
-                    old_item_id, old_fine_gold, old_net_weight, old_supplier_name = 0, 0, 0, ""
-                
-                # Extract supplier_id and supplier_name
-                supplier_id = int(supplier_text.split(' - ')[0])
+                # Extract supplier_name
                 supplier_name = supplier_text.split(' - ')[1]
                 
-                # Extract item_id
-                item_id = int(item_text.split(' - ')[0])
-                
-                # Calculate values
-                net_weight = float(gross) - float(less)
-                fine_gold = (net_weight / 100 * float(tunch)) + (net_weight / 100 * float(wastage))
-                
-                # Update the record
-                query = '''
-                    UPDATE sales 
-                    SET supplier_name = ?, item_id = ?, gross_weight = ?, less_weight = ?, 
-                        net_weight = ?, tunch_percentage = ?, wastage_percentage = ?, fine_gold = ?
-                    WHERE ref_id = ?
-                '''
-                self.db.execute_update(query, (
-                    supplier_name, item_id, float(gross), float(less),
-                    net_weight, float(tunch), float(wastage), fine_gold, ref_id
-                ))
-                
-                # Update item inventory (reverse old purchase, apply new purchase)
-                self.update_item_inventory_for_record_update(
-                    ref_id, old_fine_gold, old_net_weight, fine_gold, net_weight, 
-                    old_item_id, item_id, is_purchase=True
-                )
-                
-                # Update supplier balance (reverse old purchase, apply new purchase)
-                old_monetary_value = self.calculate_monetary_value(old_fine_gold)
-                new_monetary_value = self.calculate_monetary_value(fine_gold)
-                self.update_supplier_balance_for_record_update(
-                    ref_id, old_monetary_value, new_monetary_value, old_supplier_name, supplier_name, is_purchase=True
-                )
+                # Untouched lines keep their values; stock and balances move by the difference only
+                lines = []
+                for sale_id in line_ids:
+                    item_text, gross, less, tunch, wastage = line_values(sale_id)
+                    lines.append((sale_id, int(item_text.split(' - ')[0]), gross, less, tunch, wastage))
+                self.purchases_service.update_group(ref_id, group, supplier_name, lines)
                 
                 self.show_toast("Purchase record updated successfully!", success=True)
                 self.load_unified_data()  # Refresh unified table
+                self.load_items_data()
                 update_modal.destroy()
                 
             except Exception as e:
@@ -3412,8 +3449,7 @@ class GoldJewelryApp:
                 return
             if not messagebox.askyesno("Confirm", f"Delete {len(ids)} order(s)?"):
                 return
-            q = f"DELETE FROM karigar_orders WHERE order_id IN ({','.join(['?']*len(ids))})"
-            self.db.execute_update(q, tuple(ids))
+            self.karigar_service.delete_orders(ids)
             self.load_karigar_orders_data()
             self.show_toast("Order(s) deleted", success=True)
         except Exception as e:
@@ -3448,44 +3484,30 @@ class GoldJewelryApp:
     
     # Home tab methods
     def load_home_data(self):
-        """Load data for home tab tables"""
+        """Load data for home tab tables; nothing is redrawn while the snapshot is unchanged"""
+        try:
+            version = self.home_service.refresh()
+        except Exception as e:
+            logger.error("Error refreshing home snapshot: %s", e)
+            version = None
+        if version is not None and version == self._view_versions.get('home'):
+            return
         self.load_recent_transactions()
         self.load_pending_orders()
+        if hasattr(self, 'home_main_tree') and hasattr(self, 'home_pending_tree'):
+            self._mark_view_rendered('home', version)
     
     def load_recent_transactions(self):
         """Load today's sales and purchase orders into main table"""
+        if not hasattr(self, 'home_main_tree'):
+            return
         # Clear existing items
         for item in self.home_main_tree.get_children():
             self.home_main_tree.delete(item)
         
         try:
-            from datetime import datetime
-            today = datetime.now().strftime('%Y-%m-%d')
-            
-            # Load today's sales and purchase orders
-            query = '''
-                SELECT 
-                    s.ref_id,
-                    CASE 
-                        WHEN s.ref_id LIKE 'S%' THEN 'Sale'
-                        WHEN s.ref_id LIKE 'P%' THEN 'Purchase'
-                        ELSE 'Unknown'
-                    END as type,
-                    s.supplier_name,
-                    COALESCE(i.item_name, 'N/A') as item_name,
-                    s.gross_weight,
-                    s.less_weight,
-                    s.net_weight,
-                    s.tunch_percentage,
-                    s.wastage_percentage,
-                    s.fine_gold,
-                    strftime('%H:%M', s.sale_date) as time
-                FROM sales s
-                LEFT JOIN items i ON s.item_id = i.item_id
-                WHERE DATE(s.sale_date) = ?
-                ORDER BY s.sale_date DESC
-            '''
-            rows = self.db.execute_query(query, (today,))
+            # Today's sales and purchase orders, as of the last home_service.refresh()
+            rows = self.home_service.today_lines()
             
             for i, row in enumerate(rows):
                 tag = 'even' if i % 2 == 0 else 'odd'
@@ -3504,7 +3526,7 @@ class GoldJewelryApp:
                 ), tags=(tag,))
                 
         except Exception as e:
-            print(f"Error loading today's orders: {e}")
+            logger.error("Error loading today's orders: %s", e)
             # Add sample data if database is empty
             sample_data = [
                 ("S110925/001", "Sale", "Sample Supplier", "Ring", "25.50", "2.00", "23.50", "91.6", "2.0", "22.03", "14:30"),
@@ -3520,7 +3542,7 @@ class GoldJewelryApp:
         """Load pending Raini orders from database"""
         # Check if home_pending_tree exists
         if not hasattr(self, 'home_pending_tree'):
-            print("home_pending_tree not found, skipping load_pending_orders")
+            logger.debug("home_pending_tree not found, skipping load_pending_orders")
             return
             
         # Clear existing items
@@ -3528,32 +3550,14 @@ class GoldJewelryApp:
             self.home_pending_tree.delete(item)
         
         try:
-            print("Loading pending Raini orders from database...")
-            
-            # First, check if raini_orders table exists
-            table_check_query = "SELECT name FROM sqlite_master WHERE type='table' AND name='raini_orders'"
-            table_exists = self.db.execute_query(table_check_query)
-            
-            if not table_exists:
-                print("raini_orders table does not exist")
-                return
+            logger.debug("Loading pending Raini orders from database...")
             
-            # Load pending Raini orders
-            query = '''
-                SELECT 
-                    raini_id as id,
-                    total_weight as weight
-                FROM raini_orders
-                WHERE status = 'Pending'
-                ORDER BY created_date ASC
-                LIMIT 15
-            '''
-            rows = self.db.execute_query(query)
-            print(f"Found {len(rows)} pending Raini orders")
+            rows = self.home_service.pending_orders()
+            logger.debug("Found %s pending Raini orders", len(rows))
             
             # If no pending orders found, show empty table
             if len(rows) == 0:
-                print("No pending orders found")
+                logger.debug("No pending orders found")
             
             # Display the data
             for i, row in enumerate(rows):
@@ -3563,7 +3567,7 @@ class GoldJewelryApp:
                 ), tags=(tag,))
                 
         except Exception as e:
-            print(f"Error loading pending Raini orders: {e}")
+            logger.error("Error loading pending Raini orders: %s", e)
     
     def on_home_pending_double_click(self, event):
         """Handle double-click on home pending orders table"""
@@ -3593,9 +3597,9 @@ class GoldJewelryApp:
                     created_date,
                     status
                 FROM raini_orders
-                WHERE raini_id = ? AND status = 'Pending'
+                WHERE raini_id = ? AND status_code = ?
             '''
-            order_details = self.db.execute_query(query, (order_id,))
+            order_details = self.db.execute_query(query, (order_id, PENDING))
             
             if order_details:
                 order_values = order_details[0]
@@ -3672,22 +3676,8 @@ class GoldJewelryApp:
                 return
             if not messagebox.askyesno("Confirm Delete", f"Delete {len(ids)} Raini order(s)? This cannot be undone."):
                 return
-            placeholders = ','.join(['?'] * len(ids))
-            # Delete child details if any (best-effort)
-            try:
-                # If a detail table exists, clear it first to avoid FK issues
-                detail_exists = False
-                try:
-                    chk = self.db.execute_query("SELECT name FROM sqlite_master WHERE type='table' AND name='raini_order_items'")
-                    detail_exists = bool(chk)
-                except Exception:
-                    detail_exists = False
-                if detail_exists:
-                    self.db.execute_update(f"DELETE FROM raini_order_items WHERE raini_id IN ({placeholders})", tuple(ids))
-            except Exception:
-                pass
             try:
-                self.db.execute_update(f"DELETE FROM raini_orders WHERE raini_id IN ({placeholders})", tuple(ids))
+                self.raini_service.delete_orders(ids)
             except Exception as e:
                 messagebox.showerror("Error", f"Error deleting Raini order(s): {e}")
                 return
@@ -3704,76 +3694,34 @@ class GoldJewelryApp:
         """Load Raini inventory data"""
         # Check if raini_tree exists (tab might not be created yet)
         if not hasattr(self, 'raini_tree'):
-            print("raini_tree not found, skipping load_raini_data")
+            logger.debug("raini_tree not found, skipping load_raini_data")
+            return
+        # The table and the totals below both come from raini_orders alone
+        version = self._changed_view_version('raini', ('raini_orders',))
+        if version is None:
             return
             
-        print("Loading Raini data from database...")
-        
-        # Clear existing items
-        for item in self.raini_tree.get_children():
-            self.raini_tree.delete(item)
+        logger.debug("Loading Raini data from database...")
         
         try:
-            # First check if raini_orders table exists
-            table_check_query = "SELECT name FROM sqlite_master WHERE type='table' AND name='raini_orders'"
-            table_exists = self.db.execute_query(table_check_query)
-            
-            if not table_exists:
-                print("raini_orders table does not exist, loading sample data")
-                self._load_sample_raini_data()
-                return
-            
-            # Load Raini orders from database
-            query = '''
-                SELECT 
-                    raini_id,
-                    purity_percentage,
-                    pure_gold_weight,
-                    impurities_weight,
-                    copper_weight,
-                    silver_weight,
-                    total_weight,
-                    actual_weight,
-                    created_date,
-                    status
-                FROM raini_orders
-                ORDER BY created_date DESC
-            '''
-            rows = self.db.execute_query(query)
-            print(f"Found {len(rows)} Raini orders in database")
-            
-            if len(rows) > 0:
-                for i, row in enumerate(rows):
-                    tag = 'even' if i % 2 == 0 else 'odd'
-                    actual_weight_display = f"{row[7]:.3f}" if row[7] is not None else "N/A"
-                    self.raini_tree.insert('', 'end', values=(
-                        row[0], f"{row[1]:.2f}", f"{row[2]:.3f}", 
-                        f"{row[3]:.3f}", f"{row[4]:.3f}", f"{row[5]:.3f}", 
-                        f"{row[6]:.3f}", actual_weight_display, row[8], row[9]
-                    ), tags=(tag,))
-            else:
-                # Show empty state instead of injecting sample rows to avoid confusion after deletions
-                print("No Raini orders found in database")
+            # The rows stream from a read-only connection, which only sees committed writes
+            self.db.commit_pending()
+            rows = self.raini_service.iter_orders()
+
+            def done(count):
+                logger.debug("Found %s Raini orders in database", count)
+                self._mark_view_rendered('raini', version)
+
+            # Show empty state instead of injecting sample rows to avoid confusion after deletions
+            self._stream_rows_into_tree(self.raini_tree, rows, RainiOrder.display_values, on_done=done)
                 
         except Exception as e:
-            print(f"Error loading Raini data: {e}")
+            logger.error("Error loading Raini data: %s", e)
             # Do not load sample rows on error; leave table empty to avoid confusion
         
         # Update total Raini gold display
         self.update_total_raini_display()
     
-    def _load_sample_raini_data(self):
-        """Load sample Raini data when database is empty or has errors"""
-        print("Loading sample Raini data...")
-        sample_data = [
-            (1, "75.00", "100.00", "33.33", "16.67", "8.33", "133.33", "N/A", "2024-01-15", "Pending"),
-            (2, "91.60", "50.00", "4.58", "2.29", "1.15", "54.58", "N/A", "2024-01-14", "Pending"),
-            (3, "99.50", "25.00", "0.13", "0.07", "0.03", "25.13", "25.50", "2024-01-13", "Completed")
-        ]
-        for i, row in enumerate(sample_data):
-            tag = 'even' if i % 2 == 0 else 'odd'
-            self.raini_tree.insert('', 'end', values=row, tags=(tag,))
-    
     def update_total_raini_display(self):
         """Update the total Raini gold display and pending orders info"""
         # Check if labels exist (tab might not be created yet)
@@ -3781,26 +3729,12 @@ class GoldJewelryApp:
             return
             
         try:
-            # Get completed Raini gold total
-            completed_query = "SELECT SUM(actual_weight) FROM raini_orders WHERE status = 'Completed'"
-            completed_result = self.db.execute_query(completed_query)
-            total_raini = completed_result[0][0] if completed_result and completed_result[0][0] else 0
+            total_raini, pending_count, pending_weight = self.raini_service.totals()
             self.total_raini_label.config(text=f"Total Raini Gold: {total_raini:.2f} grams")
-            
-            # Get pending orders count and total weight
-            pending_query = '''
-                SELECT COUNT(*), SUM(total_weight) 
-                FROM raini_orders 
-                WHERE status = 'Pending'
-            '''
-            pending_result = self.db.execute_query(pending_query)
-            pending_count = pending_result[0][0] if pending_result and pending_result[0][0] else 0
-            pending_weight = pending_result[0][1] if pending_result and pending_result[0][1] else 0
-            
             self.pending_orders_label.config(text=f"Pending Orders: {pending_count} ({pending_weight:.2f}g)")
             
         except Exception as e:
-            print(f"Error updating Raini display: {e}")
+            logger.error("Error updating Raini display: %s", e)
             self.total_raini_label.config(text="Total Raini Gold: 0.00 grams")
             self.pending_orders_label.config(text="Pending Orders: 0 (0.00g)")
     
@@ -3968,13 +3902,13 @@ class GoldJewelryApp:
                     return 0.0
                 val = float(t)
                 try:
-                    print(f"[RainiDebug] _as_float input='{text}' parsed={val}")
+                    logger.debug("[RainiDebug] _as_float input='%s' parsed=%s", text, val)
                 except Exception:
                     pass
                 return val
             except Exception:
                 try:
-                    print(f"[RainiDebug] _as_float failed for input='{text}', defaulting 0.0")
+                    logger.debug("[RainiDebug] _as_float failed for input='%s', defaulting 0.0", text)
                 except Exception:
                     pass
                 return 0.0
@@ -4015,7 +3949,7 @@ class GoldJewelryApp:
                         c = 0.0
                     s = _clamp_pct(100.0 - c)
                     try:
-                        print(f"[RainiDebug] on_copper_blur raw='{raw}' -> c={c:.2f}, s={s:.2f}")
+                        logger.debug("[RainiDebug] on_copper_blur raw='%s' -> c=%.2f, s=%.2f", raw, c, s)
                     except Exception:
                         pass
                     _set_entry_value(silver_var, f"{s:.2f}")
@@ -4027,7 +3961,7 @@ class GoldJewelryApp:
                         s = 0.0
                     c = _clamp_pct(100.0 - s)
                     try:
-                        print(f"[RainiDebug] on_silver_blur raw='{raw}' -> s={s:.2f}, c={c:.2f}")
+                        logger.debug("[RainiDebug] on_silver_blur raw='%s' -> s=%.2f, c=%.2f", raw, s, c)
                     except Exception:
                         pass
                     _set_entry_value(copper_var, f"{c:.2f}")
@@ -4035,22 +3969,26 @@ class GoldJewelryApp:
                 calculate_impurities()
             except Exception:
                 try:
-                    print(f"[RainiDebug] _auto_fill_counterpart exception (changed={changed})", flush=True)
+                    logger.debug("[RainiDebug] _auto_fill_counterpart exception (changed=%s)", changed)
                 except Exception:
                     pass
                 pass
 
         def on_copper_blur(_e=None):
-            try:
-                print(f"[RainiDebug] on_copper_blur start focus={modal.focus_get()}")
-            except Exception:
-                pass
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                try:
+                    logger.debug("[RainiDebug] on_copper_blur start focus=%s", modal.focus_get())
+                except Exception:
+                    pass
             _auto_fill_counterpart('copper')
+            if not debug:
+                return
             try:
                 # Defer read to allow after(0) writers to complete
                 def _log_after():
                     try:
-                        print(f"[RainiDebug] on_copper_blur end copper='{copper_entry.get()}', silver='{silver_entry.get()}'")
+                        logger.debug("[RainiDebug] on_copper_blur end copper='%s', silver='%s'", copper_entry.get(), silver_entry.get())
                     except Exception:
                         pass
                 modal.after(0, _log_after)
@@ -4058,15 +3996,19 @@ class GoldJewelryApp:
                 pass
 
         def on_silver_blur(_e=None):
-            try:
-                print(f"[RainiDebug] on_silver_blur start focus={modal.focus_get()}")
-            except Exception:
-                pass
+            debug = logger.isEnabledFor(logging.DEBUG)
+            if debug:
+                try:
+                    logger.debug("[RainiDebug] on_silver_blur start focus=%s", modal.focus_get())
+                except Exception:
+                    pass
             _auto_fill_counterpart('silver')
+            if not debug:
+                return
             try:
                 def _log_after():
                     try:
-                        print(f"[RainiDebug] on_silver_blur end copper='{copper_entry.get()}', silver='{silver_entry.get()}'")
+                        logger.debug("[RainiDebug] on_silver_blur end copper='%s', silver='%s'", copper_entry.get(), silver_entry.get())
                     except Exception:
                         pass
                 modal.after(0, _log_after)
@@ -4075,7 +4017,7 @@ class GoldJewelryApp:
 
         # Default both if both are empty at start
         try:
-            print("[RainiDebug] Initialized defaults copper=0.00, silver=100.00 (via vars)")
+            logger.debug("[RainiDebug] Initialized defaults copper=0.00, silver=100.00 (via vars)")
         except Exception:
             pass
         # Bind: when user finishes editing one, auto-fill the other to sum 100
@@ -4147,7 +4089,7 @@ class GoldJewelryApp:
                 copper_percent = float(copper_var.get()) if copper_var.get() else 0
                 silver_percent = float(silver_var.get()) if silver_var.get() else 0
                 try:
-                    print(f"[RainiDebug] save pre-validate copper={copper_percent}, silver={silver_percent}, sum={copper_percent+silver_percent}")
+                    logger.debug("[RainiDebug] save pre-validate copper=%s, silver=%s, sum=%s", copper_percent, silver_percent, copper_percent + silver_percent)
                 except Exception:
                     pass
                 
@@ -4222,29 +4164,15 @@ class GoldJewelryApp:
                     copper_percent = float(copper_var.get()) if copper_var.get() else 0
                     silver_percent = float(silver_var.get()) if silver_var.get() else 0
                     try:
-                        print(f"[RainiDebug] save post-autofill copper={copper_percent}, silver={silver_percent}, sum={copper_percent+silver_percent}")
+                        logger.debug("[RainiDebug] save post-autofill copper=%s, silver=%s, sum=%s", copper_percent, silver_percent, copper_percent + silver_percent)
                     except Exception:
                         pass
                     if abs((copper_percent + silver_percent) - 100.0) > 1e-6:
                         messagebox.showerror("Error", "Copper% + Silver% must total 100%")
                         return
                 
-                # Calculate final values
-                total_weight = pure_gold / (purity / 100)
-                impurities = total_weight - pure_gold
-                copper_weight = (impurities * copper_percent) / 100 if copper_percent > 0 else 0
-                silver_weight = (impurities * silver_percent) / 100 if silver_percent > 0 else 0
-                
-                # Save to database
-                query = '''
-                    INSERT INTO raini_orders 
-                    (purity_percentage, pure_gold_weight, impurities_weight, total_weight, 
-                     copper_percentage, copper_weight, silver_percentage, silver_weight, 
-                     created_date, status)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, datetime('now'), 'Pending')
-                '''
-                self.db.execute_update(query, (purity, pure_gold, impurities, total_weight, 
-                                            copper_percent, copper_weight, silver_percent, silver_weight))
+                # Save to database (the service works out the alloy weights)
+                _raini_id, total_weight = self.raini_service.create_order(purity, pure_gold, copper_percent, silver_percent)
                 
                 self.show_toast(f"Raini order created successfully! • Pure Gold: {pure_gold:.2f}g • Purity: {purity:.2f}% • Expected Weight: {total_weight:.2f}g", success=True)
                 
@@ -4378,92 +4306,22 @@ Expected Total: {order_values[6]}g"""
             """Complete the Raini order"""
             try:
                 actual_weight = float(weight_entry.get()) if weight_entry.get() else 0
-                
+            except ValueError:
+                messagebox.showerror("Error", "Please enter a valid numeric value")
+                return
+            try:
                 if actual_weight <= 0:
                     messagebox.showerror("Error", "Please enter a valid actual weight")
                     return
                 
-                # Update order status and actual weight
-                query = '''
-                    UPDATE raini_orders 
-                    SET status = 'Completed', actual_weight = ?
-                    WHERE raini_id = ?
-                '''
-                self.db.execute_update(query, (actual_weight, order_id))
-                
-                # Auto-create or update Raini item based on purity
+                # Purity percentage is at index 1 in order_values for both sources
                 try:
-                    # Purity percentage is at index 1 in order_values for both sources
+                    purity_val = float(order_values[1])
+                except Exception:
                     purity_val = 0.0
-                    try:
-                        purity_val = float(order_values[1])
-                    except Exception:
-                        purity_val = 0.0
-                    # Build item name: Raini (75) for 75.0, or Raini (91.6) for fractional
-                    if int(purity_val) == purity_val:
-                        purity_label = f"{int(purity_val)}"
-                    else:
-                        purity_label = (f"{purity_val:.2f}").rstrip('0').rstrip('.')
-                    item_name = f"Raini ({purity_label})"
-                    fine_to_add = actual_weight * (purity_val / 100.0)
-                    net_to_add = actual_weight
-                    # Find existing item
-                    existing = None
-                    try:
-                        existing = self.db.execute_query(
-                            "SELECT item_id FROM items WHERE item_name = ? LIMIT 1",
-                            (item_name,)
-                        )
-                    except Exception:
-                        existing = None
-                    if existing and len(existing) > 0:
-                        item_id = existing[0][0]
-                        # Update existing inventory
-                        try:
-                            self.db.execute_update(
-                                """
-                                UPDATE items
-                                SET fine_weight = COALESCE(fine_weight, 0) + ?,
-                                    net_weight = COALESCE(net_weight, 0) + ?
-                                WHERE item_id = ?
-                                """,
-                                (fine_to_add, net_to_add, item_id)
-                            )
-                        except Exception:
-                            pass
-                    else:
-                        # Insert new item record
-                        from datetime import datetime as _dt
-                        created_ts = _dt.now().strftime('%Y-%m-%d %H:%M:%S')
-                        description = f"Raini output {purity_label}%"
-                        try:
-                            self.db.execute_update(
-                                """
-                                INSERT INTO items (item_name, item_code, category, description, fine_weight, net_weight, is_active, created_date)
-                                VALUES (?, NULL, 'Raini', ?, ?, ?, 1, ?)
-                                """,
-                                (item_name, description, fine_to_add, net_to_add, created_ts)
-                            )
-                        except Exception:
-                            # Fallback: try minimal insert
-                            try:
-                                self.db.execute_update(
-                                    "INSERT INTO items (item_name, fine_weight, net_weight) VALUES (?, ?, ?)",
-                                    (item_name, fine_to_add, net_to_add)
-                                )
-                            except Exception:
-                                pass
-                    # Refresh items view after change
-                    try:
-                        self.load_items_data()
-                    except Exception:
-                        pass
-                except Exception as raini_item_err:
-                    # Non-fatal: log error but continue
-                    try:
-                        print(f"Error updating Raini item inventory: {raini_item_err}")
-                    except Exception:
-                        pass
+                # Status, actual weight and the matching Raini stock item change in one transaction
+                self.raini_service.complete_order(order_id, actual_weight, purity_val)
+                self.load_items_data()
 
                 self.show_toast(f"Raini order completed successfully! • Order ID: {order_id} • Actual Weight: {actual_weight:.3f}g", success=True)
                 
@@ -4472,8 +4330,6 @@ Expected Total: {order_values[6]}g"""
                 self.load_home_data()  # Refresh home page data
                 modal.destroy()
                 
-            except ValueError:
-                messagebox.showerror("Error", "Please enter a valid numeric value")
             except Exception as e:
                 messagebox.showerror("Error", f"Error completing order: {e}")
         
@@ -4485,7 +4341,7 @@ Expected Total: {order_values[6]}g"""
         right_btns.pack(side='right')
         # Debug: check if right_btns frame is being created
         try:
-            print(f"[RainiDebug] right_btns created: {right_btns}")
+            logger.debug("[RainiDebug] right_btns created: %s", right_btns)
         except Exception:
             pass
 
@@ -4684,11 +4540,20 @@ Expected Total: {order_values[6]}g"""
 
 def main():
     """Main function to run the application"""
-    root = tk.Tk()
+    # --debug turns on debug output for every module; GOLDAPP_LOG_LEVELS can target single modules
+    configure_logging('DEBUG' if '--debug' in sys.argv else None)
+    dump_metrics = DUMP_METRICS_FLAG in sys.argv
+    with STARTUP_PROFILER.phase('tk_root'):
+        root = tk.Tk()
     app = GoldJewelryApp(root)
     
     # Handle window close event
     def on_closing():
+        if dump_metrics:
+            try:
+                logger.info("Metrics written to %s", app.dump_metrics())
+            except OSError as e:
+                logger.error("Could not write metrics: %s", e)
         app.db.close_connection()
         root.destroy()
     
@@ -4696,4 +4561,7 @@ def main():
     root.mainloop()
 
 if __name__ == "__main__":
+    # Dialogs do `from main import GoldJewelryApp`; point that at this already-running
+    # module instead of letting Python import and execute main.py a second time
+    sys.modules.setdefault('main', sys.modules[__name__])
     main()
@@ -0,0 +1,525 @@
+"""
+Migrations module for Gold Jewelry Business Management System
+Applies numbered schema changes exactly once, tracking progress in PRAGMA user_version
+"""
+
+import sqlite3
+from app_logging import get_logger
+from statuses import IN_PROGRESS, PENDING, STATUS_CODES, STATUS_TABLE_IDS
+
+logger = get_logger(__name__)
+
+# Generated columns (migration 8) need SQLite 3.31
+MIN_SQLITE_VERSION = (3, 31, 0)
+# Unrecognised statuses listed when migration 8 refuses to run
+UNKNOWN_STATUS_SAMPLE = 20
+
+
+# Rebuilds karigar_item_balances from the detail rows in one grouped pass (migration 7 and
+# KarigarService.reconcile)
+KARIGAR_ITEM_BALANCES_FILL = '''
+    INSERT OR REPLACE INTO karigar_item_balances (karigar_name, item_id, item_name, issued, received)
+    SELECT COALESCE(o.karigar_name, ''), COALESCE(i.item_id, 0), MAX(i.item_name),
+           COALESCE(SUM(CASE WHEN i.direction = 'issued' THEN i.weight END), 0),
+           COALESCE(SUM(CASE WHEN i.direction = 'received' THEN i.weight END), 0)
+    FROM karigar_order_items i
+    JOIN karigar_orders o ON o.order_id = i.order_id
+    GROUP BY 1, 2
+'''
+
+# Recomputes the one-row raini_totals summary from raini_orders (migration 9 and RainiService.rebuild_totals)
+RAINI_TOTALS_FILL = '''
+    INSERT OR REPLACE INTO raini_totals (id, completed_weight, pending_count, pending_weight)
+    SELECT 1,
+           COALESCE(SUM(CASE WHEN status_code = 2 THEN actual_weight END), 0),
+           COUNT(CASE WHEN status_code = 0 THEN 1 END),
+           COALESCE(SUM(CASE WHEN status_code = 0 THEN total_weight END), 0)
+    FROM raini_orders
+'''
+
+
+def _columns(conn, table_name):
+    """Column names of a table (empty if the table doesn't exist)"""
+    return [column[1] for column in conn.execute(f"PRAGMA table_info({table_name})").fetchall()]
+
+
+def _v1_base_schema(conn):
+    """Create the core tables and bring databases from before schema versioning up to date.
+    Everything here used to run on every launch, so it still tolerates any older layout.
+    """
+    # Gold Types table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS gold_types (
+            gold_type_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            purity_percentage REAL NOT NULL,
+            description TEXT
+        )
+    ''')
+
+    # Gold Inventory table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS gold_inventory (
+            inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            gold_type_id INTEGER,
+            weight_grams REAL NOT NULL,
+            purity_percentage REAL NOT NULL,
+            form TEXT NOT NULL,
+            description TEXT,
+            received_date TEXT NOT NULL,
+            supplier_info TEXT,
+            FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
+        )
+    ''')
+
+    # Drop the old is_available column (SQLite has no DROP COLUMN, so rebuild the table)
+    if 'is_available' in _columns(conn, 'gold_inventory'):
+        conn.execute('''
+            CREATE TABLE gold_inventory_new (
+                inventory_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                gold_type_id INTEGER,
+                weight_grams REAL NOT NULL,
+                purity_percentage REAL NOT NULL,
+                form TEXT NOT NULL,
+                description TEXT,
+                received_date TEXT NOT NULL,
+                supplier_info TEXT,
+                FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
+            )
+        ''')
+        conn.execute('''
+            INSERT INTO gold_inventory_new
+            (inventory_id, gold_type_id, weight_grams, purity_percentage, form, description, received_date, supplier_info)
+            SELECT inventory_id, gold_type_id, weight_grams, purity_percentage, form, description, received_date, supplier_info
+            FROM gold_inventory
+        ''')
+        conn.execute('DROP TABLE gold_inventory')
+        conn.execute('ALTER TABLE gold_inventory_new RENAME TO gold_inventory')
+
+    # Freelancers table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS freelancers (
+            freelancer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            full_name TEXT NOT NULL,
+            specialization TEXT,
+            phone TEXT,
+            address TEXT,
+            bank_details TEXT,
+            joined_date TEXT NOT NULL,
+            is_active BOOLEAN DEFAULT 1
+        )
+    ''')
+
+    # Designs table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS designs (
+            design_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            design_name TEXT NOT NULL,
+            design_code TEXT UNIQUE,
+            category TEXT NOT NULL,
+            complexity_level TEXT NOT NULL,
+            estimated_gold_weight REAL NOT NULL,
+            design_specifications TEXT,
+            is_active BOOLEAN DEFAULT 1
+        )
+    ''')
+
+    # Work Orders table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS work_orders (
+            work_order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            freelancer_id INTEGER,
+            gold_type_id INTEGER,
+            jewelry_design TEXT NOT NULL,
+            original_metal_weight REAL NOT NULL,
+            gold_weight_issued REAL NOT NULL,
+            expected_final_weight REAL NOT NULL,
+            issue_date TEXT NOT NULL,
+            expected_completion_date TEXT,
+            status TEXT DEFAULT 'issued',
+            special_instructions TEXT,
+            wastage_weight REAL DEFAULT 0,
+            final_jewelry_weight REAL DEFAULT 0,
+            completion_date TEXT,
+            notes TEXT,
+            FOREIGN KEY (freelancer_id) REFERENCES freelancers (freelancer_id),
+            FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
+        )
+    ''')
+    if 'original_metal_weight' not in _columns(conn, 'work_orders'):
+        conn.execute('ALTER TABLE work_orders ADD COLUMN original_metal_weight REAL DEFAULT 0')
+
+    # Suppliers table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS suppliers (
+            supplier_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            supplier_name TEXT NOT NULL,
+            contact_person TEXT,
+            phone TEXT,
+            email TEXT,
+            address TEXT,
+            gst_number TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            balance REAL DEFAULT 0.0
+        )
+    ''')
+    if 'balance' not in _columns(conn, 'suppliers'):
+        conn.execute('ALTER TABLE suppliers ADD COLUMN balance REAL DEFAULT 0.0')
+
+    # Gold Purchases table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS gold_purchases (
+            purchase_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            supplier_id INTEGER,
+            gold_type_id INTEGER,
+            weight_grams REAL NOT NULL,
+            purity_percentage REAL NOT NULL,
+            purchase_date TEXT NOT NULL,
+            invoice_number TEXT,
+            notes TEXT,
+            FOREIGN KEY (supplier_id) REFERENCES suppliers (supplier_id),
+            FOREIGN KEY (gold_type_id) REFERENCES gold_types (gold_type_id)
+        )
+    ''')
+
+    # Raini Orders table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS raini_orders (
+            raini_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            purity_percentage REAL NOT NULL,
+            pure_gold_weight REAL NOT NULL,
+            impurities_weight REAL NOT NULL,
+            total_weight REAL NOT NULL,
+            created_date TEXT NOT NULL,
+            status TEXT DEFAULT 'Active',
+            notes TEXT
+        )
+    ''')
+    raini_columns = _columns(conn, 'raini_orders')
+    if 'copper_percentage' not in raini_columns:
+        conn.execute('ALTER TABLE raini_orders ADD COLUMN copper_percentage REAL DEFAULT 0')
+        conn.execute('ALTER TABLE raini_orders ADD COLUMN copper_weight REAL DEFAULT 0')
+        conn.execute('ALTER TABLE raini_orders ADD COLUMN silver_percentage REAL DEFAULT 0')
+        conn.execute('ALTER TABLE raini_orders ADD COLUMN silver_weight REAL DEFAULT 0')
+    if 'actual_weight' not in raini_columns:
+        conn.execute('ALTER TABLE raini_orders ADD COLUMN actual_weight REAL DEFAULT 0')
+
+    # Settings table with the global gold price per gram
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS settings (
+            setting_key TEXT PRIMARY KEY,
+            setting_value TEXT
+        )
+    ''')
+    conn.execute("INSERT OR IGNORE INTO settings (setting_key, setting_value) VALUES ('gold_price_per_gram', '5000')")
+
+    # Items table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS items (
+            item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            item_name TEXT NOT NULL,
+            item_code TEXT UNIQUE,
+            description TEXT,
+            category TEXT,
+            is_active BOOLEAN DEFAULT 1,
+            fine_weight REAL DEFAULT 0.0,
+            net_weight REAL DEFAULT 0.0,
+            created_date TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    items_columns = _columns(conn, 'items')
+    if 'fine_weight' not in items_columns:
+        conn.execute('ALTER TABLE items ADD COLUMN fine_weight REAL DEFAULT 0.0')
+    if 'net_weight' not in items_columns:
+        conn.execute('ALTER TABLE items ADD COLUMN net_weight REAL DEFAULT 0.0')
+
+    # Sales table (purchases share it, told apart by the 'P' ref_id prefix)
+    sales_sql = '''
+        CREATE TABLE IF NOT EXISTS sales (
+            sale_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ref_id TEXT NOT NULL,
+            supplier_name TEXT NOT NULL,
+            item_id INTEGER,
+            gross_weight REAL NOT NULL,
+            less_weight REAL NOT NULL,
+            net_weight REAL NOT NULL,
+            tunch_percentage REAL NOT NULL,
+            wastage_percentage REAL NOT NULL,
+            fine_gold REAL NOT NULL,
+            sale_date TEXT NOT NULL,
+            notes TEXT,
+            FOREIGN KEY (item_id) REFERENCES items (item_id)
+        )
+    '''
+    conn.execute(sales_sql)
+    # Several lines share one ref_id, so drop the UNIQUE constraint older databases had on it
+    table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='sales'").fetchone()
+    if table_sql and 'ref_id TEXT UNIQUE' in table_sql[0]:
+        conn.execute(sales_sql.replace('IF NOT EXISTS sales', 'sales_new'))
+        conn.execute('INSERT INTO sales_new SELECT * FROM sales')
+        conn.execute('DROP TABLE sales')
+        conn.execute('ALTER TABLE sales_new RENAME TO sales')
+
+    # Default gold types (only into an empty table; there is no unique key to ignore duplicates on)
+    if not conn.execute("SELECT 1 FROM gold_types LIMIT 1").fetchone():
+        conn.execute('''
+            INSERT INTO gold_types (name, purity_percentage, description)
+            VALUES
+                ('24K', 99.9, 'Pure gold'),
+                ('22K', 91.7, '22 karat gold'),
+                ('18K', 75.0, '18 karat gold'),
+                ('14K', 58.3, '14 karat gold')
+        ''')
+
+
+def _v2_karigar_tables(conn):
+    """Karigar order headers and their issued/received lines (previously created lazily on load and save)"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS karigar_orders (
+            order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            ref_id TEXT,
+            karigar_id INTEGER,
+            karigar_name TEXT,
+            issued_total REAL DEFAULT 0,
+            received_total REAL DEFAULT 0,
+            balance_total REAL DEFAULT 0,
+            status TEXT DEFAULT 'in progress',
+            created_at TEXT
+        )
+    ''')
+    # The tree loader and the order editor each created this table with a different column set
+    karigar_columns = [name.lower() for name in _columns(conn, 'karigar_orders')]
+    if 'ref_id' not in karigar_columns:
+        conn.execute('ALTER TABLE karigar_orders ADD COLUMN ref_id TEXT')
+    if 'status' not in karigar_columns:
+        conn.execute("ALTER TABLE karigar_orders ADD COLUMN status TEXT DEFAULT 'pending'")
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS karigar_order_items (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            order_id INTEGER,
+            item_id INTEGER,
+            item_name TEXT,
+            direction TEXT,
+            weight REAL,
+            created_at TEXT
+        )
+    ''')
+
+
+def create_change_counter(conn, table_name, id_column):
+    """Count writes to a table in table_changes: `inserts` for rows appended past the highest id,
+    `rewrites` for updates, deletes and out-of-order inserts. A reader that cached the rows up to
+    some id can fetch just the newer ones while `rewrites` is unchanged, and reload otherwise.
+    """
+    conn.execute("INSERT OR IGNORE INTO table_changes (table_name) VALUES (?)", (table_name,))
+    conn.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {table_name}_count_insert AFTER INSERT ON {table_name}
+        BEGIN
+            UPDATE table_changes
+            SET inserts = inserts + 1,
+                rewrites = rewrites + (NEW.{id_column} < (SELECT MAX({id_column}) FROM {table_name}))
+            WHERE table_name = '{table_name}';
+        END
+    ''')
+    for event in ('UPDATE', 'DELETE'):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS {table_name}_count_{event.lower()} AFTER {event} ON {table_name}
+            BEGIN
+                UPDATE table_changes SET rewrites = rewrites + 1 WHERE table_name = '{table_name}';
+            END
+        ''')
+
+
+def _v3_change_counters(conn):
+    """Per-table write counters for the fact tables read by the analytics cache"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS table_changes (
+            table_name TEXT PRIMARY KEY,
+            inserts INTEGER NOT NULL DEFAULT 0,
+            rewrites INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    for table_name, id_column in (('sales', 'sale_id'), ('karigar_order_items', 'id'),
+                                  ('raini_orders', 'raini_id'), ('work_orders', 'work_order_id'),
+                                  ('gold_inventory', 'inventory_id'), ('freelancers', 'freelancer_id'),
+                                  ('gold_types', 'gold_type_id')):
+        create_change_counter(conn, table_name, id_column)
+
+
+def _v4_inventory_form_purity_index(conn):
+    """Index the inventory breakdown's GROUP BY; weight_grams is included so the pivot never reads the table"""
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_gold_inventory_form_purity
+        ON gold_inventory (form, purity_percentage, weight_grams)
+    ''')
+
+
+def _v5_sales_date_index(conn):
+    """Index sales by sale_date for day and date-range reads (the Home tab's today snapshot)"""
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sales_sale_date ON sales (sale_date)")
+
+
+def _v6_view_change_counters(conn):
+    """Write counters for the remaining tables behind the main views, so unchanged views skip reloading"""
+    for table_name, id_column in (('items', 'item_id'), ('karigar_orders', 'order_id')):
+        create_change_counter(conn, table_name, id_column)
+
+
+def _v7_karigar_balances(conn):
+    """Index karigar detail rows by order and keep per-karigar / per-item running balances.
+    karigar_item_balances is kept equal to the detail rows grouped by (order's karigar, item) by
+    triggers on karigar_order_items; the karigar_balances view rolls it up per karigar.
+    Detail rows whose order no longer exists are left out.
+    """
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_karigar_order_items_order
+        ON karigar_order_items (order_id, direction, weight)
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS karigar_item_balances (
+            karigar_name TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            item_name TEXT,
+            issued REAL NOT NULL DEFAULT 0,
+            received REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (karigar_name, item_id)
+        )
+    ''')
+    conn.execute(KARIGAR_ITEM_BALANCES_FILL)
+
+    def apply(row, sign):
+        # Add (sign 1) or take away (sign -1) one detail row; rows of unknown orders change nothing
+        return f'''
+            INSERT OR IGNORE INTO karigar_item_balances (karigar_name, item_id, item_name)
+            SELECT COALESCE(karigar_name, ''), COALESCE({row}.item_id, 0), {row}.item_name
+            FROM karigar_orders WHERE order_id = {row}.order_id;
+            UPDATE karigar_item_balances
+            SET issued = issued + {sign} * (CASE WHEN {row}.direction = 'issued' THEN COALESCE({row}.weight, 0) ELSE 0 END),
+                received = received + {sign} * (CASE WHEN {row}.direction = 'received' THEN COALESCE({row}.weight, 0) ELSE 0 END)
+            WHERE item_id = COALESCE({row}.item_id, 0)
+              AND karigar_name = (SELECT COALESCE(karigar_name, '') FROM karigar_orders WHERE order_id = {row}.order_id);
+        '''
+
+    for event, body in (('INSERT', apply('NEW', 1)), ('DELETE', apply('OLD', -1)),
+                        ('UPDATE', apply('OLD', -1) + apply('NEW', 1))):
+        conn.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS karigar_order_items_balance_{event.lower()}
+            AFTER {event} ON karigar_order_items
+            BEGIN
+                {body}
+            END
+        ''')
+    conn.execute('''
+        CREATE VIEW IF NOT EXISTS karigar_balances AS
+        SELECT karigar_name, SUM(issued) AS issued, SUM(received) AS received,
+               SUM(issued) - SUM(received) AS outstanding
+        FROM karigar_item_balances
+        GROUP BY karigar_name
+    ''')
+
+
+def _v8_status_codes(conn):
+    """Give the order tables an integer status_code generated from their status text (see statuses.py),
+    with a CHECK on the allowed codes, and partial indexes over the open rows the views list.
+    Fails without changing anything if a row holds a status no map knows; those rows are listed
+    in the error so they can be corrected by hand.
+    """
+    if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+        raise sqlite3.NotSupportedError(
+            f"SQLite {sqlite3.sqlite_version} is too old: order status codes need SQLite "
+            f"{'.'.join(map(str, MIN_SQLITE_VERSION))} or newer (upgrade Python or its sqlite3 library)")
+    unknown = []
+    for table_name, codes in STATUS_CODES.items():
+        if 'status_code' in _columns(conn, table_name):
+            continue
+        texts = ', '.join(f"'{text}'" for text in codes)
+        id_column = STATUS_TABLE_IDS[table_name]
+        unknown.extend(f"{table_name} {id_column}={row_id} status={status!r}" for row_id, status in conn.execute(f"""
+            SELECT {id_column}, status FROM {table_name}
+            WHERE LOWER(TRIM(COALESCE(status, ''))) NOT IN ({texts})
+            LIMIT {UNKNOWN_STATUS_SAMPLE}
+        """))
+    if unknown:
+        raise sqlite3.IntegrityError("Unrecognised order status(es); correct them (see statuses.py) and restart: "
+                                     + '; '.join(unknown))
+    for table_name, codes in STATUS_CODES.items():
+        if 'status_code' in _columns(conn, table_name):
+            continue
+        cases = ' '.join(f"WHEN '{text}' THEN {code}" for text, code in codes.items())
+        allowed = ', '.join(str(code) for code in sorted(set(codes.values())))
+        conn.execute(f"""
+            ALTER TABLE {table_name} ADD COLUMN status_code INTEGER
+            GENERATED ALWAYS AS (CASE LOWER(TRIM(COALESCE(status, ''))) {cases} END) VIRTUAL
+            NOT NULL CHECK (status_code IN ({allowed}))
+        """)
+    conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_raini_orders_pending
+        ON raini_orders (created_date, total_weight) WHERE status_code = {PENDING}
+    ''')
+    conn.execute(f'''
+        CREATE INDEX IF NOT EXISTS idx_karigar_orders_in_progress
+        ON karigar_orders (order_id) WHERE status_code = {IN_PROGRESS}
+    ''')
+
+
+def _v9_raini_totals(conn):
+    """One-row running totals of Raini orders (completed actual weight, pending count and weight),
+    kept up to date by RainiService in the same transaction as each order write"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS raini_totals (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            completed_weight REAL NOT NULL DEFAULT 0,
+            pending_count INTEGER NOT NULL DEFAULT 0,
+            pending_weight REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    conn.execute(RAINI_TOTALS_FILL)
+
+
+# (version, description, step) in the order they must run. Append new steps at the end and
+# never edit one that has shipped: databases that already ran it won't run it again.
+MIGRATIONS = [
+    (1, "Base schema", _v1_base_schema),
+    (2, "Karigar order tables", _v2_karigar_tables),
+    (3, "Table change counters", _v3_change_counters),
+    (4, "Inventory form/purity index", _v4_inventory_form_purity_index),
+    (5, "Sales date index", _v5_sales_date_index),
+    (6, "View change counters", _v6_view_change_counters),
+    (7, "Karigar order item index and balances", _v7_karigar_balances),
+    (8, "Order status codes", _v8_status_codes),
+    (9, "Raini totals", _v9_raini_totals),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn):
+    """Schema version recorded in the database file (0 for databases created before versioning)"""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    """Apply every migration newer than the database's schema version.
+    Each step runs in its own transaction together with its user_version bump, so a failed
+    step leaves the database at the previous version. Returns the resulting version.
+    """
+    version = get_schema_version(conn)
+    if version >= SCHEMA_VERSION:
+        return version
+    conn.commit()
+    for step_version, description, step in MIGRATIONS:
+        if step_version <= version:
+            continue
+        try:
+            conn.execute("BEGIN")
+            step(conn)
+            conn.execute(f"PRAGMA user_version = {int(step_version)}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            logger.error("Schema migration %s (%s) failed: %s", step_version, description, e)
+            raise
+        logger.info("Applied schema migration %s: %s", step_version, description)
+        version = step_version
+    return version
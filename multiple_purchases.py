@@ -1,6 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+from app_logging import get_logger
+from instrumentation import timed
+from services import PurchasesService
+
+logger = get_logger(__name__)
 
 class MultiplePurchasesManager:
     def __init__(self, root_window, main_app, db_manager, colors, fonts):
@@ -12,15 +17,16 @@ class MultiplePurchasesManager:
         self.purchase_rows = []
         self.instance_id = id(self)  # Unique identifier for this instance
         self.session_ref_counter = 0  # Counter for Ref IDs in current session
-        print(f"MultiplePurchasesManager instance created with ID: {self.instance_id}")
+        self.service = PurchasesService(db_manager)
+        logger.debug("MultiplePurchasesManager instance created with ID: %s", self.instance_id)
         
     def show_multiple_purchases_modal(self):
         """Show full-screen modal for adding multiple purchases with table interface
         Uses screen-level supplier and one Ref ID for the whole transaction.
         """
-        print(f"=== OPENING MULTIPLE PURCHASES MODAL ===")
-        print(f"Initial purchase_rows length: {len(self.purchase_rows)}")
-        print(f"Initial purchase_rows id: {id(self.purchase_rows)}")
+        logger.debug("=== OPENING MULTIPLE PURCHASES MODAL ===")
+        logger.debug("Initial purchase_rows length: %s", len(self.purchase_rows))
+        logger.debug("Initial purchase_rows id: %s", id(self.purchase_rows))
         
         # Create modal at 80% of screen
         modal = tk.Toplevel(self.root_window)
@@ -148,7 +154,7 @@ class MultiplePurchasesManager:
             items_data = self.db.execute_query(items_query)
             item_options = [f"{row[0]} - {row[1]}" for row in items_data]
         except Exception as e:
-            print(f"Error loading dropdown data: {e}")
+            logger.error("Error loading dropdown data: %s", e)
             item_options = []
 
         # Load suppliers for screen-level dropdown
@@ -157,7 +163,7 @@ class MultiplePurchasesManager:
             suppliers_data = self.db.execute_query(suppliers_query)
             supplier_options = [f"{row[0]} - {row[1]}" for row in suppliers_data]
         except Exception as e:
-            print(f"Error loading suppliers: {e}")
+            logger.error("Error loading suppliers: %s", e)
             supplier_options = []
         
         self.supplier_combo = ttk.Combobox(supplier_frame,
@@ -273,27 +279,27 @@ class MultiplePurchasesManager:
             pass
         
         # Clear any existing purchase rows
-        print(f"Before clearing - purchase_rows length: {len(self.purchase_rows)}")
+        logger.debug("Before clearing - purchase_rows length: %s", len(self.purchase_rows))
         self.purchase_rows.clear()
-        print(f"After clearing - purchase_rows length: {len(self.purchase_rows)}")
-        print(f"After clearing - purchase_rows id: {id(self.purchase_rows)}")
+        logger.debug("After clearing - purchase_rows length: %s", len(self.purchase_rows))
+        logger.debug("After clearing - purchase_rows id: %s", id(self.purchase_rows))
         
         # Reset session counter for new modal session
         self.session_ref_counter = 0
-        print(f"Session ref counter reset to: {self.session_ref_counter}")
+        logger.debug("Session ref counter reset to: %s", self.session_ref_counter)
         
         # Add a test marker to verify self object consistency
         self.test_marker = "MODAL_OPENED"
-        print(f"Test marker set: {self.test_marker}")
+        logger.debug("Test marker set: %s", self.test_marker)
         
         def create_purchase_row(row_num, existing_data=None):
             """Create a new purchase row"""
-            print(f"=== CREATE_PURCHASE_ROW CALLED ===")
-            print(f"Row number: {row_num}")
-            print(f"Current purchase_rows length: {len(self.purchase_rows)}")
-            print(f"Current purchase_rows id: {id(self.purchase_rows)}")
-            print(f"Test marker: {getattr(self, 'test_marker', 'NOT_FOUND')}")
-            print(f"Instance ID: {getattr(self, 'instance_id', 'NOT_FOUND')}")
+            logger.debug("=== CREATE_PURCHASE_ROW CALLED ===")
+            logger.debug("Row number: %s", row_num)
+            logger.debug("Current purchase_rows length: %s", len(self.purchase_rows))
+            logger.debug("Current purchase_rows id: %s", id(self.purchase_rows))
+            logger.debug("Test marker: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
+            logger.debug("Instance ID: %s", getattr(self, 'instance_id', 'NOT_FOUND'))
             
             # Highlight the first row to make it more visible
             bg_color = self.COLORS['light'] if row_num == 0 else self.COLORS['white']
@@ -370,7 +376,7 @@ class MultiplePurchasesManager:
                     gross_text = gross_entry.get().strip()
                     less_text = less_entry.get().strip()
                     
-                    print(f"Calculating net weight - Gross: '{gross_text}', Less: '{less_text}'")  # Debug print
+                    logger.debug("Calculating net weight - Gross: '%s', Less: '%s'", gross_text, less_text)
                     
                     if not gross_text and not less_text:
                         net_entry.config(state='normal')
@@ -383,7 +389,7 @@ class MultiplePurchasesManager:
                     less = float(less_text or 0)
                     net = gross - less
                     
-                    print(f"Net weight calculated: {net:.3f}")  # Debug print
+                    logger.debug("Net weight calculated: %.3f", net)
                     
                     net_entry.config(state='normal')
                     net_entry.delete(0, tk.END)
@@ -391,7 +397,7 @@ class MultiplePurchasesManager:
                     net_entry.config(state='readonly')
                     calculate_fine_gold()
                 except (ValueError, TypeError) as e:
-                    print(f"Error in calculate_net_weight: {e}")  # Debug print
+                    logger.error("Error in calculate_net_weight: %s", e)
                     net_entry.config(state='normal')
                     net_entry.delete(0, tk.END)
                     net_entry.insert(0, "0.00")
@@ -403,7 +409,7 @@ class MultiplePurchasesManager:
                     tunch_text = tunch_entry.get().strip()
                     wastage_text = wastage_entry.get().strip()
                     
-                    print(f"Calculating fine gold - Net: '{net_text}', Tunch: '{tunch_text}', Wastage: '{wastage_text}'")  # Debug print
+                    logger.debug("Calculating fine gold - Net: '%s', Tunch: '%s', Wastage: '%s'", net_text, tunch_text, wastage_text)
                     
                     if not net_text and not tunch_text and not wastage_text:
                         fine_entry.config(state='normal')
@@ -422,7 +428,7 @@ class MultiplePurchasesManager:
                     else:
                         fine_gold = net / 100 * tunch
                     
-                    print(f"Fine gold calculated: {fine_gold:.3f}")  # Debug print
+                    logger.debug("Fine gold calculated: %.3f", fine_gold)
                     
                     fine_entry.config(state='normal')
                     fine_entry.delete(0, tk.END)
@@ -433,7 +439,7 @@ class MultiplePurchasesManager:
                     except Exception:
                         pass
                 except (ValueError, ZeroDivisionError, TypeError) as e:
-                    print(f"Error in calculate_fine_gold: {e}")  # Debug print
+                    logger.error("Error in calculate_fine_gold: %s", e)
                     fine_entry.config(state='normal')
                     fine_entry.delete(0, tk.END)
                     fine_entry.insert(0, "0.00")
@@ -445,19 +451,19 @@ class MultiplePurchasesManager:
             
             # Bind calculation events for immediate response
             def on_gross_change(event=None):
-                print("Gross weight changed, calculating net weight...")
+                logger.debug("Gross weight changed, calculating net weight...")
                 calculate_net_weight()
             
             def on_less_change(event=None):
-                print("Less weight changed, calculating net weight...")
+                logger.debug("Less weight changed, calculating net weight...")
                 calculate_net_weight()
             
             def on_tunch_change(event=None):
-                print("Tunch changed, calculating fine gold...")
+                logger.debug("Tunch changed, calculating fine gold...")
                 calculate_fine_gold()
             
             def on_wastage_change(event=None):
-                print("Wastage changed, calculating fine gold...")
+                logger.debug("Wastage changed, calculating fine gold...")
                 calculate_fine_gold()
             
             # Bind events
@@ -476,14 +482,14 @@ class MultiplePurchasesManager:
             
             # Test function to manually trigger calculations
             def test_calculations():
-                print("=== TESTING CALCULATIONS ===")
-                print(f"Gross entry value: '{gross_entry.get()}'")
-                print(f"Less entry value: '{less_entry.get()}'")
-                print(f"Net entry value: '{net_entry.get()}'")
-                print("Calling calculate_net_weight()...")
+                logger.debug("=== TESTING CALCULATIONS ===")
+                logger.debug("Gross entry value: '%s'", gross_entry.get())
+                logger.debug("Less entry value: '%s'", less_entry.get())
+                logger.debug("Net entry value: '%s'", net_entry.get())
+                logger.debug("Calling calculate_net_weight()...")
                 calculate_net_weight()
-                print(f"After calculation - Net entry value: '{net_entry.get()}'")
-                print("=== END TEST ===")
+                logger.debug("After calculation - Net entry value: '%s'", net_entry.get())
+                logger.debug("=== END TEST ===")
             
             # Test button for calculations (temporary)
             # Test button removed
@@ -532,9 +538,8 @@ class MultiplePurchasesManager:
                         break
             
             self.purchase_rows.append(row_data)
-            print(f"Added row {row_num} to purchase_rows. Total rows now: {len(self.purchase_rows)}")  # Debug print
-            print(f"Purchase_rows content after append: {[r['row_num'] for r in self.purchase_rows]}")  # Debug print
-            print(f"Purchase_rows id after append: {id(self.purchase_rows)}")  # Debug print
+            logger.debug("Added row %s to purchase_rows. Total rows now: %s", row_num, len(self.purchase_rows))
+            logger.debug("Purchase_rows id after append: %s", id(self.purchase_rows))
             update_status()
             return row_data
         
@@ -549,23 +554,23 @@ class MultiplePurchasesManager:
         
         def add_new_row():
             """Add a new row to the table"""
-            print(f"=== ADD_NEW_ROW CALLED ===")
+            logger.debug("=== ADD_NEW_ROW CALLED ===")
             row_num = len(self.purchase_rows)
-            print(f"Adding new row {row_num}. Current purchase_rows length: {len(self.purchase_rows)}")  # Debug print
-            print(f"Purchase_rows id in add_new_row: {id(self.purchase_rows)}")
-            print(f"Test marker in add_new_row: {getattr(self, 'test_marker', 'NOT_FOUND')}")
+            logger.debug("Adding new row %s. Current purchase_rows length: %s", row_num, len(self.purchase_rows))
+            logger.debug("Purchase_rows id in add_new_row: %s", id(self.purchase_rows))
+            logger.debug("Test marker in add_new_row: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
             create_purchase_row(row_num)
-            print(f"After create_purchase_row call - purchase_rows length: {len(self.purchase_rows)}")
+            logger.debug("After create_purchase_row call - purchase_rows length: %s", len(self.purchase_rows))
         
+        @timed('multiple_purchases.save_all_purchases')
         def save_all_purchases():
             """Save all purchases to database"""
-            print(f"=== SAVE ALL PURCHASES DEBUG ===")
-            print(f"Number of purchase rows: {len(self.purchase_rows)}")
-            print(f"Purchase rows content: {self.purchase_rows}")
-            print(f"Purchase rows type: {type(self.purchase_rows)}")
-            print(f"Purchase rows id: {id(self.purchase_rows)}")
-            print(f"Instance ID: {getattr(self, 'instance_id', 'NOT_FOUND')}")
-            print(f"Test marker: {getattr(self, 'test_marker', 'NOT_FOUND')}")
+            logger.debug("=== SAVE ALL PURCHASES DEBUG ===")
+            logger.debug("Number of purchase rows: %s", len(self.purchase_rows))
+            logger.debug("Purchase rows type: %s", type(self.purchase_rows))
+            logger.debug("Purchase rows id: %s", id(self.purchase_rows))
+            logger.debug("Instance ID: %s", getattr(self, 'instance_id', 'NOT_FOUND'))
+            logger.debug("Test marker: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
             
             if not self.purchase_rows:
                 messagebox.showerror("Error", "No purchases to save")
@@ -581,93 +586,59 @@ class MultiplePurchasesManager:
                 supplier_name = supplier_text.split(' - ')[1]
                 
                 purchase_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                saved_count = 0
+                lines = []
                 
                 for i, row_data in enumerate(self.purchase_rows):
-                    print(f"\n--- Processing Row {i+1} ---")
+                    logger.debug("--- Processing Row %s ---", i + 1)
                     item_text = row_data['item_combo'].get().strip()
                     gross = row_data['gross_entry'].get().strip()
                     less = row_data['less_entry'].get().strip()
                     tunch = row_data['tunch_entry'].get().strip()
                     wastage = row_data['wastage_entry'].get().strip()
                     
-                    print(f"Supplier: '{supplier_text}'")
-                    print(f"Item: '{item_text}'")
-                    print(f"Gross: '{gross}'")
-                    print(f"Less: '{less}'")
-                    print(f"Tunch: '{tunch}'")
-                    print(f"Wastage: '{wastage}'")
+                    logger.debug("Supplier: '%s'", supplier_text)
+                    logger.debug("Item: '%s'", item_text)
+                    logger.debug("Gross: '%s'", gross)
+                    logger.debug("Less: '%s'", less)
+                    logger.debug("Tunch: '%s'", tunch)
+                    logger.debug("Wastage: '%s'", wastage)
                     
                     # Check if essential fields are filled (item, gross, less)
                     essential_fields = [item_text, gross, less]
                     if not all(essential_fields):
-                        print(f"Row {i+1}: Skipping - missing essential fields")
+                        logger.debug("Row %s: Skipping - missing essential fields", i + 1)
                         continue
                     
                     # Check if tunch and wastage have valid values (not empty and not just "0.0")
                     if not tunch or tunch == "0.0" or tunch == "0":
-                        print(f"Row {i+1}: Skipping - invalid tunch value: '{tunch}'")
+                        logger.debug("Row %s: Skipping - invalid tunch value: '%s'", i + 1, tunch)
                         continue
                         
                     if not wastage or wastage == "0.0" or wastage == "0":
-                        print(f"Row {i+1}: Skipping - invalid wastage value: '{wastage}'")
+                        logger.debug("Row %s: Skipping - invalid wastage value: '%s'", i + 1, wastage)
                         continue
                     
                     # Extract item info
                     item_id = int(item_text.split(' - ')[0])
-                    
-                    # Calculate values
-                    net_weight = float(gross) - float(less)
-                    if float(wastage) != 0:  # Avoid division by zero
-                        fine_gold = (net_weight / 100 * float(tunch)) + (net_weight / 100 * float(wastage))
-                    else:
-                        fine_gold = net_weight / 100 * float(tunch)
-                    
-                    # Insert into database
-                    query = '''
-                        INSERT INTO sales (ref_id, supplier_name, item_id, gross_weight, less_weight, 
-                                         net_weight, tunch_percentage, wastage_percentage, fine_gold, sale_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    '''
-                    
-                    insert_data = (
-                        self.transaction_ref_id,
-                        supplier_name,
-                        item_id,
-                        float(gross),
-                        float(less),
-                        net_weight,
-                        float(tunch),
-                        float(wastage),
-                        fine_gold,
-                        purchase_date
-                    )
-                    
-                    print(f"Inserting data: {insert_data}")
-                    self.db.execute_update(query, insert_data)
-                    print(f"Data inserted successfully into purchases table!")
-                    
-                    # Update item inventory (add to inventory for purchases)
-                    self.main_app.update_item_inventory(item_id, fine_gold, net_weight, 'add')
-                    
-                    # Update supplier balance in grams for purchase (we owe less)
-                    self.main_app.update_supplier_balance(supplier_name, fine_gold, 'subtract')
-                    
-                    saved_count += 1
-                    print(f"Row {i+1}: Successfully saved!")
+                    lines.append((item_id, float(gross), float(less), float(tunch), float(wastage)))
+                    logger.debug("Row %s: queued for save", i + 1)
                 
-                print(f"\n=== SAVE RESULT ===")
-                print(f"Total rows processed: {len(self.purchase_rows)}")
-                print(f"Successfully saved: {saved_count}")
+                # Lines, item stock and the supplier balance are written in one transaction
+                saved_count = self.service.save_group(self.transaction_ref_id, supplier_name, lines, purchase_date)
+                
+                logger.debug("=== SAVE RESULT ===")
+                logger.debug("Total rows processed: %s", len(self.purchase_rows))
+                logger.debug("Successfully saved: %s", saved_count)
                 
                 if saved_count > 0:
+                    self.main_app.load_items_data()
                     self.main_app.show_toast(f"Successfully saved {saved_count} purchases!", success=True)
                     # Refresh unified table view
                     try:
                         self.main_app.load_unified_data()
-                        print(f"Main unified table refreshed successfully!")
+                        logger.debug("Main unified table refreshed successfully!")
                     except Exception as e:
-                        print(f"Error refreshing unified table: {e}")
+                        logger.error("Error refreshing unified table: %s", e)
                     modal.destroy()
                 else:
                     messagebox.showerror("Error", "No valid purchases to save. Please fill all required fields.")
@@ -685,18 +656,18 @@ class MultiplePurchasesManager:
         
         def update_status():
             """Update the status label with current row count (safe before label exists)"""
-            print(f"=== UPDATE_STATUS CALLED ===")
-            print(f"Purchase_rows length in update_status: {len(self.purchase_rows)}")
-            print(f"Purchase_rows id in update_status: {id(self.purchase_rows)}")
+            logger.debug("=== UPDATE_STATUS CALLED ===")
+            logger.debug("Purchase_rows length in update_status: %s", len(self.purchase_rows))
+            logger.debug("Purchase_rows id in update_status: %s", id(self.purchase_rows))
             try:
                 if hasattr(self, 'status_label') and self.status_label.winfo_exists():
                     self.status_label.config(text=f"Rows: {len(self.purchase_rows)}")
-                    print(f"Status label updated to: Rows: {len(self.purchase_rows)}")
+                    logger.debug("Status label updated to: Rows: %s", len(self.purchase_rows))
                 else:
-                    print("Status label not available yet, skipping update")
+                    logger.debug("Status label not available yet, skipping update")
             except Exception as e:
-                print(f"Error updating status label: {e}")
-                print("Status label not available yet, skipping update")
+                logger.error("Error updating status label: %s", e)
+                logger.debug("Status label not available yet, skipping update")
         
         # Pack canvas and scrollbar first
         canvas.pack(side="left", fill="both", expand=True)
@@ -708,9 +679,9 @@ class MultiplePurchasesManager:
         
         # Add debugging for modal lifecycle
         def on_modal_close():
-            print(f"=== MODAL CLOSING ===")
-            print(f"Final purchase_rows length: {len(self.purchase_rows)}")
-            print(f"Final purchase_rows id: {id(self.purchase_rows)}")
+            logger.debug("=== MODAL CLOSING ===")
+            logger.debug("Final purchase_rows length: %s", len(self.purchase_rows))
+            logger.debug("Final purchase_rows id: %s", id(self.purchase_rows))
             modal.destroy()
         
         modal.protocol("WM_DELETE_WINDOW", on_modal_close)
@@ -801,42 +772,26 @@ class MultiplePurchasesManager:
         If it exists, show an error and return False.
         """
         try:
-            query = "SELECT COUNT(*) FROM sales WHERE ref_id = ?"
-            result = self.db.execute_query(query, (self.transaction_ref_id,))
+            result = self.db.execute_named('sales.ref_count', (self.transaction_ref_id,))
             exists = result and result[0][0] > 0
             if exists:
                 messagebox.showerror("Duplicate Ref ID", f"Ref ID {self.transaction_ref_id} already exists. Please try again.")
                 return False
             return True
         except Exception as e:
-            print(f"Error checking Ref ID existence: {e}")
+            logger.error("Error checking Ref ID existence: %s", e)
             return False
 
     def show_multiple_purchases_modal_for_edit(self, ref_id: str):
         """Open multiple purchases modal in edit mode for a given Ref ID.
-        Loads all rows for the transaction, allows editing, and saves by deleting
-        existing rows and re-inserting current rows with the same Ref ID.
+        Loads all rows for the transaction keyed by sale_id, allows editing, and saves
+        the difference (changed, added and removed rows) in one transaction.
         """
         # Load existing rows
         try:
-            query = '''
-                SELECT 
-                    s.sale_id,
-                    s.supplier_name,
-                    i.item_name,
-                    s.gross_weight,
-                    s.less_weight,
-                    s.net_weight,
-                    s.tunch_percentage,
-                    s.wastage_percentage,
-                    s.fine_gold,
-                    s.sale_date
-                FROM sales s
-                LEFT JOIN items i ON s.item_id = i.item_id
-                WHERE s.ref_id = ?
-                ORDER BY s.sale_id
-            '''
-            existing_records = self.db.execute_query(query, (ref_id,))
+            # The whole group in one read, keyed by sale_id; saving applies the difference to it
+            existing_lines = self.service.load_group(ref_id)
+            existing_records = list(existing_lines.values())
             if not existing_records:
                 messagebox.showerror("Error", f"No records found for Ref ID: {ref_id}")
                 return
@@ -1005,9 +960,9 @@ class MultiplePurchasesManager:
             # Pre-fill values when existing data is provided
             if existing_data_row is not None:
                 try:
-                    # existing_data_row indices:
-                    # 2=item_name, 3=gross, 4=less, 5=net, 6=tunch, 7=wastage, 8=fine
-                    item_name = existing_data_row[2]
+                    # existing_data_row is a GroupLine:
+                    # 3=gross, 4=less, 5=net, 6=tunch, 7=wastage, 8=fine
+                    item_name = existing_data_row.item_name
                     for option in item_options:
                         if option.endswith(f" - {item_name}"):
                             item_combo.set(option)
@@ -1046,7 +1001,8 @@ class MultiplePurchasesManager:
                 'tunch_entry': tunch_entry,
                 'wastage_entry': wastage_entry,
                 'fine_entry': fine_entry,
-                'row_frame': row_frame
+                'row_frame': row_frame,
+                'existing_sale_id': existing_data_row[0] if existing_data_row is not None else None
             }
             self.purchase_rows.append(row_data)
             return row_data
@@ -1066,8 +1022,9 @@ class MultiplePurchasesManager:
         for i, existing_record in enumerate(existing_records):
             create_purchase_row(i, existing_record)
 
+        @timed('multiple_purchases.save_all_purchases_edit')
         def save_all_purchases_edit():
-            # Save by replacing existing rows
+            # Save the difference against the loaded rows
             if not self.purchase_rows:
                 messagebox.showerror("Error", "No purchases to save")
                 return
@@ -1077,10 +1034,8 @@ class MultiplePurchasesManager:
                 return
             supplier_name = supplier_text.split(' - ')[1]
             try:
-                # Delete existing
-                self.db.execute_update("DELETE FROM sales WHERE ref_id = ?", (self.transaction_ref_id,))
-                # Insert current
-                purchase_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                # Rows keep the sale_id they were loaded with; new rows have none
+                lines = []
                 for row_data in self.purchase_rows:
                     item_text = row_data['item_combo'].get().strip()
                     gross = row_data['gross_entry'].get().strip()
@@ -1090,26 +1045,14 @@ class MultiplePurchasesManager:
                     if not all([item_text, gross, less, tunch, wastage]):
                         continue
                     item_id = int(item_text.split(' - ')[0])
-                    net_weight = float(gross) - float(less)
-                    fine_gold = (net_weight / 100 * float(tunch)) + (net_weight / 100 * float(wastage)) if float(wastage) != 0 else (net_weight / 100 * float(tunch))
-                    self.db.execute_update(
-                        """
-                        INSERT INTO sales (ref_id, supplier_name, item_id, gross_weight, less_weight, net_weight, tunch_percentage, wastage_percentage, fine_gold, sale_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """,
-                        (
-                            self.transaction_ref_id,
-                            supplier_name,
-                            item_id,
-                            float(gross),
-                            float(less),
-                            net_weight,
-                            float(tunch),
-                            float(wastage),
-                            fine_gold,
-                            purchase_date,
-                        ),
-                    )
+                    lines.append((row_data.get('existing_sale_id'), item_id, gross, less, tunch, wastage))
+                if not lines:
+                    messagebox.showerror("Error", "No valid purchases to save. Please fill all required fields.")
+                    return
+                # One transaction: changed lines updated, new ones inserted, removed ones deleted,
+                # stock and balance moved by the difference
+                self.service.update_group(self.transaction_ref_id, existing_lines, supplier_name, lines)
+                self.main_app.load_items_data()
                 self.main_app.load_unified_data()
                 self.main_app.show_toast("Purchases updated successfully!", success=True)
                 modal.destroy()
@@ -1159,58 +1102,6 @@ class MultiplePurchasesManager:
     
     def generate_ref_id(self, prefix):
         """Generate reference ID with format: P + DDMMYY + / + 3-digit incremental"""
-        # Get current date in DDMMYY format
-        today = datetime.now()
-        date_str = today.strftime('%d%m%y')
-        
-        print(f"Generating Ref ID for prefix: {prefix}, date: {date_str}")  # Debug print
-        
-        # Get next incremental number for today
-        try:
-            # Get the highest existing number for today from sales table
-            query = f"SELECT ref_id FROM sales WHERE ref_id LIKE '{prefix}{date_str}/%' ORDER BY ref_id DESC LIMIT 1"
-            print(f"Executing query: {query}")  # Debug print
-            result = self.db.execute_query(query)
-            
-            if result and result[0][0]:
-                # Extract the number from the highest existing ref_id
-                existing_ref = result[0][0]
-                print(f"Highest existing ref_id: {existing_ref}")
-                # Extract number after the last slash
-                existing_num = int(existing_ref.split('/')[-1])
-                max_db_num = existing_num
-                print(f"Highest existing number: {max_db_num}")
-            else:
-                max_db_num = 0
-                print(f"No existing records found for today")
-            
-            # Use the higher of database max number or session counter
-            next_num = max(max_db_num, self.session_ref_counter) + 1
-            print(f"Max DB number: {max_db_num}, Session counter: {self.session_ref_counter}, Next num: {next_num}")
-            
-            # Update session counter
-            self.session_ref_counter = next_num
-            
-        except Exception as e:
-            print(f"Error generating ref ID: {e}")
-            self.session_ref_counter += 1
-            next_num = self.session_ref_counter
-        
-        # Format as 3-digit number
-        ref_id = f"{prefix}{date_str}/{next_num:03d}"
-        
-        # Double-check that this Ref ID doesn't already exist
-        try:
-            check_query = "SELECT COUNT(*) FROM sales WHERE ref_id = ?"
-            check_result = self.db.execute_query(check_query, (ref_id,))
-            if check_result and check_result[0][0] > 0:
-                print(f"WARNING: Ref ID {ref_id} already exists! Incrementing...")
-                self.session_ref_counter += 1
-                next_num = self.session_ref_counter
-                ref_id = f"{prefix}{date_str}/{next_num:03d}"
-                print(f"New Ref ID after increment: {ref_id}")
-        except Exception as e:
-            print(f"Error checking Ref ID uniqueness: {e}")
-        
-        print(f"Final Generated Ref ID: {ref_id}")  # Debug print
+        ref_id, self.session_ref_counter = self.service.next_ref_id(self.session_ref_counter)
+        logger.debug("Generated Ref ID: %s", ref_id)
         return ref_id
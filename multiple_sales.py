@@ -1,6 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
+from app_logging import get_logger
+from instrumentation import timed
+from services import SalesService
+
+logger = get_logger(__name__)
 
 class MultipleSalesManager:
     def __init__(self, root_window, main_app, db_manager, colors, fonts):
@@ -12,13 +17,14 @@ class MultipleSalesManager:
         self.sales_rows = []
         self.instance_id = id(self)  # Unique identifier for this instance
         self.session_ref_counter = 0  # Counter for Ref IDs in current session
-        print(f"MultipleSalesManager instance created with ID: {self.instance_id}")
+        self.service = SalesService(db_manager)
+        logger.debug("MultipleSalesManager instance created with ID: %s", self.instance_id)
         
     def show_multiple_sales_modal(self):
         """Show full-screen modal for adding multiple sales with table interface"""
-        print(f"=== OPENING MULTIPLE SALES MODAL ===")
-        print(f"Initial sales_rows length: {len(self.sales_rows)}")
-        print(f"Initial sales_rows id: {id(self.sales_rows)}")
+        logger.debug("=== OPENING MULTIPLE SALES MODAL ===")
+        logger.debug("Initial sales_rows length: %s", len(self.sales_rows))
+        logger.debug("Initial sales_rows id: %s", id(self.sales_rows))
         
         # Create full-screen modal (80% of screen)
         modal = tk.Toplevel(self.root_window)
@@ -110,7 +116,7 @@ class MultipleSalesManager:
             suppliers_data = self.db.execute_query(suppliers_query)
             supplier_options = [f"{row[0]} - {row[1]}" for row in suppliers_data]
         except Exception as e:
-            print(f"Error loading suppliers: {e}")
+            logger.error("Error loading suppliers: %s", e)
             supplier_options = []
         
         self.supplier_combo = ttk.Combobox(supplier_frame, 
@@ -294,32 +300,32 @@ class MultipleSalesManager:
             items_data = self.db.execute_query(items_query)
             item_options = [f"{row[0]} - {row[1]}" for row in items_data]
         except Exception as e:
-            print(f"Error loading dropdown data: {e}")
+            logger.error("Error loading dropdown data: %s", e)
             supplier_options = []
             item_options = []
         
         # Clear any existing sales rows
-        print(f"Before clearing - sales_rows length: {len(self.sales_rows)}")
+        logger.debug("Before clearing - sales_rows length: %s", len(self.sales_rows))
         self.sales_rows.clear()
-        print(f"After clearing - sales_rows length: {len(self.sales_rows)}")
-        print(f"After clearing - sales_rows id: {id(self.sales_rows)}")
+        logger.debug("After clearing - sales_rows length: %s", len(self.sales_rows))
+        logger.debug("After clearing - sales_rows id: %s", id(self.sales_rows))
         
         # Reset session counter for new modal session
         self.session_ref_counter = 0
-        print(f"Session ref counter reset to: {self.session_ref_counter}")
+        logger.debug("Session ref counter reset to: %s", self.session_ref_counter)
         
         # Add a test marker to verify self object consistency
         self.test_marker = "MODAL_OPENED"
-        print(f"Test marker set: {self.test_marker}")
+        logger.debug("Test marker set: %s", self.test_marker)
         
         def create_sales_row(row_num):
             """Create a new sales row"""
-            print(f"=== CREATE_SALES_ROW CALLED ===")
-            print(f"Row number: {row_num}")
-            print(f"Current sales_rows length: {len(self.sales_rows)}")
-            print(f"Current sales_rows id: {id(self.sales_rows)}")
-            print(f"Test marker: {getattr(self, 'test_marker', 'NOT_FOUND')}")
-            print(f"Instance ID: {getattr(self, 'instance_id', 'NOT_FOUND')}")
+            logger.debug("=== CREATE_SALES_ROW CALLED ===")
+            logger.debug("Row number: %s", row_num)
+            logger.debug("Current sales_rows length: %s", len(self.sales_rows))
+            logger.debug("Current sales_rows id: %s", id(self.sales_rows))
+            logger.debug("Test marker: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
+            logger.debug("Instance ID: %s", getattr(self, 'instance_id', 'NOT_FOUND'))
             
             # Highlight the first row to make it more visible
             bg_color = self.COLORS['light'] if row_num == 0 else self.COLORS['white']
@@ -399,7 +405,7 @@ class MultipleSalesManager:
                     gross_text = gross_entry.get().strip()
                     less_text = less_entry.get().strip()
                     
-                    print(f"Calculating net weight - Gross: '{gross_text}', Less: '{less_text}'")  # Debug print
+                    logger.debug("Calculating net weight - Gross: '%s', Less: '%s'", gross_text, less_text)
                     
                     if not gross_text and not less_text:
                         net_entry.config(state='normal')
@@ -412,7 +418,7 @@ class MultipleSalesManager:
                     less = float(less_text or 0)
                     net = gross - less
                     
-                    print(f"Net weight calculated: {net:.3f}")  # Debug print
+                    logger.debug("Net weight calculated: %.3f", net)
                     
                     net_entry.config(state='normal')
                     net_entry.delete(0, tk.END)
@@ -420,7 +426,7 @@ class MultipleSalesManager:
                     net_entry.config(state='readonly')
                     calculate_fine_gold()
                 except (ValueError, TypeError) as e:
-                    print(f"Error in calculate_net_weight: {e}")  # Debug print
+                    logger.error("Error in calculate_net_weight: %s", e)
                     net_entry.config(state='normal')
                     net_entry.delete(0, tk.END)
                     net_entry.insert(0, "0.00")
@@ -432,7 +438,7 @@ class MultipleSalesManager:
                     tunch_text = tunch_entry.get().strip()
                     wastage_text = wastage_entry.get().strip()
                     
-                    print(f"Calculating fine gold - Net: '{net_text}', Tunch: '{tunch_text}', Wastage: '{wastage_text}'")  # Debug print
+                    logger.debug("Calculating fine gold - Net: '%s', Tunch: '%s', Wastage: '%s'", net_text, tunch_text, wastage_text)
                     
                     if not net_text and not tunch_text and not wastage_text:
                         fine_entry.config(state='normal')
@@ -451,7 +457,7 @@ class MultipleSalesManager:
                     else:
                         fine_gold = net / 100 * tunch
                     
-                    print(f"Fine gold calculated: {fine_gold:.3f}")  # Debug print
+                    logger.debug("Fine gold calculated: %.3f", fine_gold)
                     
                     fine_entry.config(state='normal')
                     fine_entry.delete(0, tk.END)
@@ -462,7 +468,7 @@ class MultipleSalesManager:
                     except Exception:
                         pass
                 except (ValueError, ZeroDivisionError, TypeError) as e:
-                    print(f"Error in calculate_fine_gold: {e}")  # Debug print
+                    logger.error("Error in calculate_fine_gold: %s", e)
                     fine_entry.config(state='normal')
                     fine_entry.delete(0, tk.END)
                     fine_entry.insert(0, "0.00")
@@ -474,19 +480,19 @@ class MultipleSalesManager:
             
             # Bind calculation events for immediate response
             def on_gross_change(event=None):
-                print("Gross weight changed, calculating net weight...")
+                logger.debug("Gross weight changed, calculating net weight...")
                 calculate_net_weight()
             
             def on_less_change(event=None):
-                print("Less weight changed, calculating net weight...")
+                logger.debug("Less weight changed, calculating net weight...")
                 calculate_net_weight()
             
             def on_tunch_change(event=None):
-                print("Tunch changed, calculating fine gold...")
+                logger.debug("Tunch changed, calculating fine gold...")
                 calculate_fine_gold()
             
             def on_wastage_change(event=None):
-                print("Wastage changed, calculating fine gold...")
+                logger.debug("Wastage changed, calculating fine gold...")
                 calculate_fine_gold()
             
             # Bind events
@@ -524,7 +530,7 @@ class MultipleSalesManager:
             
             # Trigger initial calculations after a short delay to ensure fields are ready
             def trigger_initial_calculations():
-                print("Triggering initial calculations...")  # Debug print
+                logger.debug("Triggering initial calculations...")
                 test_calculations()
             
             # Use after_idle and a short delay to ensure the GUI is fully updated
@@ -546,9 +552,8 @@ class MultipleSalesManager:
             }
             
             self.sales_rows.append(row_data)
-            print(f"Added row {row_num} to sales_rows. Total rows now: {len(self.sales_rows)}")  # Debug print
-            print(f"Sales_rows content after append: {[r['row_num'] for r in self.sales_rows]}")  # Debug print
-            print(f"Sales_rows id after append: {id(self.sales_rows)}")  # Debug print
+            logger.debug("Added row %s to sales_rows. Total rows now: %s", row_num, len(self.sales_rows))
+            logger.debug("Sales_rows id after append: %s", id(self.sales_rows))
             update_status()
             return row_data
         
@@ -563,23 +568,23 @@ class MultipleSalesManager:
         
         def add_new_row():
             """Add a new row to the table"""
-            print(f"=== ADD_NEW_ROW CALLED ===")
+            logger.debug("=== ADD_NEW_ROW CALLED ===")
             row_num = len(self.sales_rows)
-            print(f"Adding new row {row_num}. Current sales_rows length: {len(self.sales_rows)}")  # Debug print
-            print(f"Sales_rows id in add_new_row: {id(self.sales_rows)}")
-            print(f"Test marker in add_new_row: {getattr(self, 'test_marker', 'NOT_FOUND')}")
+            logger.debug("Adding new row %s. Current sales_rows length: %s", row_num, len(self.sales_rows))
+            logger.debug("Sales_rows id in add_new_row: %s", id(self.sales_rows))
+            logger.debug("Test marker in add_new_row: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
             create_sales_row(row_num)
-            print(f"After create_sales_row call - sales_rows length: {len(self.sales_rows)}")
+            logger.debug("After create_sales_row call - sales_rows length: %s", len(self.sales_rows))
         
+        @timed('multiple_sales.save_all_sales')
         def save_all_sales():
             """Save all sales to database"""
-            print(f"=== SAVE ALL SALES DEBUG ===")
-            print(f"Number of sales rows: {len(self.sales_rows)}")
-            print(f"Sales rows content: {self.sales_rows}")
-            print(f"Sales rows type: {type(self.sales_rows)}")
-            print(f"Sales rows id: {id(self.sales_rows)}")
-            print(f"Instance ID: {getattr(self, 'instance_id', 'NOT_FOUND')}")
-            print(f"Test marker: {getattr(self, 'test_marker', 'NOT_FOUND')}")
+            logger.debug("=== SAVE ALL SALES DEBUG ===")
+            logger.debug("Number of sales rows: %s", len(self.sales_rows))
+            logger.debug("Sales rows type: %s", type(self.sales_rows))
+            logger.debug("Sales rows id: %s", id(self.sales_rows))
+            logger.debug("Instance ID: %s", getattr(self, 'instance_id', 'NOT_FOUND'))
+            logger.debug("Test marker: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
             
             if not self.sales_rows:
                 messagebox.showerror("Error", "No sales to save")
@@ -601,112 +606,70 @@ class MultipleSalesManager:
                 supplier_id = int(supplier_text.split(' - ')[0])
                 supplier_name = supplier_text.split(' - ')[1]
                 
-                print(f"=== TRANSACTION DETAILS ===")
-                print(f"Transaction Ref ID: {self.transaction_ref_id}")
-                print(f"Supplier: {supplier_name} (ID: {supplier_id})")
-                print(f"Number of rows to process: {len(self.sales_rows)}")
+                logger.debug("=== TRANSACTION DETAILS ===")
+                logger.debug("Transaction Ref ID: %s", self.transaction_ref_id)
+                logger.debug("Supplier: %s (ID: %s)", supplier_name, supplier_id)
+                logger.debug("Number of rows to process: %s", len(self.sales_rows))
                 
                 sale_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                saved_count = 0
+                lines = []
                 
                 for i, row_data in enumerate(self.sales_rows):
-                    print(f"\n--- Processing Row {i+1} ---")
+                    logger.debug("--- Processing Row %s ---", i + 1)
                     item_text = row_data['item_combo'].get().strip()
                     gross = row_data['gross_entry'].get().strip()
                     less = row_data['less_entry'].get().strip()
                     tunch = row_data['tunch_entry'].get().strip()
                     wastage = row_data['wastage_entry'].get().strip()
                     
-                    print(f"Supplier: '{supplier_name}' (from screen selection)")
-                    print(f"Item: '{item_text}'")
-                    print(f"Gross: '{gross}'")
-                    print(f"Less: '{less}'")
-                    print(f"Tunch: '{tunch}'")
-                    print(f"Wastage: '{wastage}'")
+                    logger.debug("Supplier: '%s' (from screen selection)", supplier_name)
+                    logger.debug("Item: '%s'", item_text)
+                    logger.debug("Gross: '%s'", gross)
+                    logger.debug("Less: '%s'", less)
+                    logger.debug("Tunch: '%s'", tunch)
+                    logger.debug("Wastage: '%s'", wastage)
                     
                     # Check if essential fields are filled (item, gross, less)
                     essential_fields = [item_text, gross, less]
                     if not all(essential_fields):
-                        print(f"Row {i+1}: Skipping - missing essential fields")
+                        logger.debug("Row %s: Skipping - missing essential fields", i + 1)
                         continue
                     
                     # Check if tunch and wastage have valid values (not empty and not just "0.0")
                     if not tunch or tunch == "0.0" or tunch == "0":
-                        print(f"Row {i+1}: Skipping - invalid tunch value: '{tunch}'")
+                        logger.debug("Row %s: Skipping - invalid tunch value: '%s'", i + 1, tunch)
                         continue
                         
                     if not wastage or wastage == "0.0" or wastage == "0":
-                        print(f"Row {i+1}: Skipping - invalid wastage value: '{wastage}'")
+                        logger.debug("Row %s: Skipping - invalid wastage value: '%s'", i + 1, wastage)
                         continue
                     
                     # Extract item info
                     item_id = int(item_text.split(' - ')[0])
-                    
-                    # Calculate values
-                    net_weight = float(gross) - float(less)
-                    if float(wastage) != 0:  # Avoid division by zero
-                        fine_gold = (net_weight / 100 * float(tunch)) + (net_weight / 100 * float(wastage))
-                    else:
-                        fine_gold = net_weight / 100 * float(tunch)
-                    
-                    # Insert into database with single Ref ID for all entries
-                    query = '''
-                        INSERT INTO sales (ref_id, supplier_name, item_id, gross_weight, less_weight, 
-                                         net_weight, tunch_percentage, wastage_percentage, fine_gold, sale_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    '''
-                    
-                    insert_data = (
-                        self.transaction_ref_id,  # Use single Ref ID for all entries
-                        supplier_name,
-                        item_id,
-                        float(gross),
-                        float(less),
-                        net_weight,
-                        float(tunch),
-                        float(wastage),
-                        fine_gold,
-                        sale_date
-                    )
-                    
-                    print(f"Inserting data: {insert_data}")
-                    try:
-                        self.db.execute_update(query, insert_data)
-                        print(f"Data inserted successfully into sales table!")
-                    except Exception as db_error:
-                        print(f"Database error inserting row {i+1}: {db_error}")
-                        print(f"Query: {query}")
-                        print(f"Data: {insert_data}")
-                        raise db_error
-                    
-                    # Update item inventory (subtract from inventory for sales)
-                    self.main_app.update_item_inventory(item_id, fine_gold, net_weight, 'subtract')
-                    
-                    # Update supplier balance (add monetary value to supplier balance for sales)
-                    # Update supplier balance in grams for sale
-                    self.main_app.update_supplier_balance(supplier_name, fine_gold, 'add')
-                    
-                    saved_count += 1
-                    print(f"Row {i+1}: Successfully saved!")
+                    lines.append((item_id, float(gross), float(less), float(tunch), float(wastage)))
+                    logger.debug("Row %s: queued for save", i + 1)
                 
-                print(f"\n=== SAVE RESULT ===")
-                print(f"Total rows processed: {len(self.sales_rows)}")
-                print(f"Successfully saved: {saved_count}")
+                # Lines, item stock and the supplier balance are written in one transaction
+                saved_count = self.service.save_group(self.transaction_ref_id, supplier_name, lines, sale_date)
+                
+                logger.debug("=== SAVE RESULT ===")
+                logger.debug("Total rows processed: %s", len(self.sales_rows))
+                logger.debug("Successfully saved: %s", saved_count)
                 
                 if saved_count > 0:
+                    self.main_app.load_items_data()
                     self.main_app.show_toast(f"Successfully saved {saved_count} sales with Ref ID: {self.transaction_ref_id}!", success=True)
                     # Call main app's load_unified_data method to refresh the unified table
-                    print(f"Calling main_app.load_unified_data() to refresh main table...")
-                    print(f"Main app object: {self.main_app}")
-                    print(f"Main app type: {type(self.main_app)}")
+                    logger.debug("Calling main_app.load_unified_data() to refresh main table...")
+                    logger.debug("Main app object: %s", self.main_app)
+                    logger.debug("Main app type: %s", type(self.main_app))
                     
                     if hasattr(self.main_app, 'load_unified_data'):
-                        print(f"Found load_unified_data method, calling it...")
+                        logger.debug("Found load_unified_data method, calling it...")
                         self.main_app.load_unified_data()
-                        print(f"Main unified table refreshed successfully!")
+                        logger.debug("Main unified table refreshed successfully!")
                     else:
-                        print(f"Main app does not have load_unified_data method!")
-                        print(f"Available methods: {[method for method in dir(self.main_app) if not method.startswith('_')]}")
+                        logger.debug("Main app does not have load_unified_data method!")
                     modal.destroy()
                 else:
                     messagebox.showerror("Error", "No valid sales to save. Please fill all required fields.")
@@ -724,18 +687,18 @@ class MultipleSalesManager:
         
         def update_status():
             """Update the status label with current row count (safe before label exists)"""
-            print(f"=== UPDATE_STATUS CALLED ===")
-            print(f"Sales_rows length in update_status: {len(self.sales_rows)}")
-            print(f"Sales_rows id in update_status: {id(self.sales_rows)}")
+            logger.debug("=== UPDATE_STATUS CALLED ===")
+            logger.debug("Sales_rows length in update_status: %s", len(self.sales_rows))
+            logger.debug("Sales_rows id in update_status: %s", id(self.sales_rows))
             try:
                 if hasattr(self, 'status_label') and self.status_label.winfo_exists():
                     self.status_label.config(text=f"Rows: {len(self.sales_rows)}")
-                    print(f"Status label updated to: Rows: {len(self.sales_rows)}")
+                    logger.debug("Status label updated to: Rows: %s", len(self.sales_rows))
                 else:
-                    print("Status label not available yet, skipping update")
+                    logger.debug("Status label not available yet, skipping update")
             except Exception as e:
-                print(f"Error updating status label: {e}")
-                print("Status label not available yet, skipping update")
+                logger.error("Error updating status label: %s", e)
+                logger.debug("Status label not available yet, skipping update")
         
         # Pack canvas and scrollbar first
         canvas.pack(side="left", fill="both", expand=True)
@@ -747,9 +710,9 @@ class MultipleSalesManager:
         
         # Add debugging for modal lifecycle
         def on_modal_close():
-            print(f"=== MODAL CLOSING ===")
-            print(f"Final sales_rows length: {len(self.sales_rows)}")
-            print(f"Final sales_rows id: {id(self.sales_rows)}")
+            logger.debug("=== MODAL CLOSING ===")
+            logger.debug("Final sales_rows length: %s", len(self.sales_rows))
+            logger.debug("Final sales_rows id: %s", id(self.sales_rows))
             modal.destroy()
         
         modal.protocol("WM_DELETE_WINDOW", on_modal_close)
@@ -770,11 +733,11 @@ class MultipleSalesManager:
         button_frame.pack(side='bottom', fill='x', pady=(8, 8))
 
         def on_save_click():
-            print(f"=== SAVE BUTTON CLICKED ===")
-            print(f"Before save_all_sales - sales_rows length: {len(self.sales_rows)}")
-            print(f"Sales_rows id before save: {id(self.sales_rows)}")
+            logger.debug("=== SAVE BUTTON CLICKED ===")
+            logger.debug("Before save_all_sales - sales_rows length: %s", len(self.sales_rows))
+            logger.debug("Sales_rows id before save: %s", id(self.sales_rows))
             save_all_sales()
-            print(f"After save_all_sales - sales_rows length: {len(self.sales_rows)}")
+            logger.debug("After save_all_sales - sales_rows length: %s", len(self.sales_rows))
 
         add_row_btn_bottom = tk.Button(button_frame,
                                  text="➕ Add Row",
@@ -839,123 +802,47 @@ class MultipleSalesManager:
     
     def generate_ref_id(self, prefix):
         """Generate reference ID with format: S/P + DDMMYY + / + 3-digit incremental"""
-        # Get current date in DDMMYY format
-        today = datetime.now()
-        date_str = today.strftime('%d%m%y')
-        
-        print(f"Generating Ref ID for prefix: {prefix}, date: {date_str}")  # Debug print
-        
-        # Get next incremental number for today
-        try:
-            # First check if sales table exists
-            table_check_query = "SELECT name FROM sqlite_master WHERE type='table' AND name='sales'"
-            table_result = self.db.execute_query(table_check_query)
-            
-            if not table_result:
-                print("Sales table doesn't exist, using default count of 0")
-                max_db_num = 0
-            else:
-                # Get the highest existing number for today
-                query = f"SELECT ref_id FROM sales WHERE ref_id LIKE '{prefix}{date_str}/%' ORDER BY ref_id DESC LIMIT 1"
-                print(f"Executing query: {query}")  # Debug print
-                result = self.db.execute_query(query)
-                
-                if result and result[0][0]:
-                    # Extract the number from the highest existing ref_id
-                    existing_ref = result[0][0]
-                    print(f"Highest existing ref_id: {existing_ref}")
-                    # Extract number after the last slash
-                    existing_num = int(existing_ref.split('/')[-1])
-                    max_db_num = existing_num
-                    print(f"Highest existing number: {max_db_num}")
-                else:
-                    max_db_num = 0
-                    print(f"No existing records found for today")
-            
-            # Use the higher of database max number or session counter
-            next_num = max(max_db_num, self.session_ref_counter) + 1
-            print(f"Max DB number: {max_db_num}, Session counter: {self.session_ref_counter}, Next num: {next_num}")
-            
-            # Update session counter
-            self.session_ref_counter = next_num
-            
-        except Exception as e:
-            print(f"Error generating ref ID: {e}")
-            self.session_ref_counter += 1
-            next_num = self.session_ref_counter
-        
-        # Format as 3-digit number
-        ref_id = f"{prefix}{date_str}/{next_num:03d}"
-        
-        # Double-check that this Ref ID doesn't already exist
-        try:
-            check_query = "SELECT COUNT(*) FROM sales WHERE ref_id = ?"
-            check_result = self.db.execute_query(check_query, (ref_id,))
-            if check_result and check_result[0][0] > 0:
-                print(f"WARNING: Ref ID {ref_id} already exists! Incrementing...")
-                self.session_ref_counter += 1
-                next_num = self.session_ref_counter
-                ref_id = f"{prefix}{date_str}/{next_num:03d}"
-                print(f"New Ref ID after increment: {ref_id}")
-        except Exception as e:
-            print(f"Error checking Ref ID uniqueness: {e}")
-        
-        print(f"Final Generated Ref ID: {ref_id}")  # Debug print
+        ref_id, self.session_ref_counter = self.service.next_ref_id(self.session_ref_counter)
+        logger.debug("Generated Ref ID: %s", ref_id)
         return ref_id
     
     def check_ref_id_exists(self):
         """Check if the generated Ref ID already exists in the database"""
         try:
-            query = "SELECT COUNT(*) FROM sales WHERE ref_id = ?"
-            result = self.db.execute_query(query, (self.transaction_ref_id,))
+            result = self.db.execute_named('sales.ref_count', (self.transaction_ref_id,))
             
             if result and result[0][0] > 0:
                 # Ref ID exists, show error
                 messagebox.showerror("Error", 
                     f"Ref ID '{self.transaction_ref_id}' already exists in the database.\n"
                     f"Please try again to generate a new Ref ID.")
-                print(f"ERROR: Ref ID {self.transaction_ref_id} already exists!")
+                logger.error("ERROR: Ref ID %s already exists!", self.transaction_ref_id)
                 return False
             else:
-                print(f"Ref ID {self.transaction_ref_id} is available")
+                logger.debug("Ref ID %s is available", self.transaction_ref_id)
                 return True
                 
         except Exception as e:
-            print(f"Error checking Ref ID existence: {e}")
+            logger.error("Error checking Ref ID existence: %s", e)
             messagebox.showerror("Error", f"Error checking Ref ID: {e}")
             return False
     
     def show_multiple_sales_modal_for_edit(self, ref_id):
         """Show multiple sales modal for editing an existing transaction group"""
-        print(f"=== OPENING MULTIPLE SALES MODAL FOR EDIT ===")
-        print(f"Ref ID to edit: {ref_id}")
+        logger.debug("=== OPENING MULTIPLE SALES MODAL FOR EDIT ===")
+        logger.debug("Ref ID to edit: %s", ref_id)
         
         # Load existing data for this Ref ID
         try:
-            query = '''
-                SELECT 
-                    s.sale_id,
-                    s.supplier_name,
-                    i.item_name,
-                    s.gross_weight,
-                    s.less_weight,
-                    s.net_weight,
-                    s.tunch_percentage,
-                    s.wastage_percentage,
-                    s.fine_gold,
-                    s.sale_date
-                FROM sales s
-                LEFT JOIN items i ON s.item_id = i.item_id
-                WHERE s.ref_id = ?
-                ORDER BY s.sale_id
-            '''
-            existing_records = self.db.execute_query(query, (ref_id,))
+            # The whole group in one read, keyed by sale_id; saving applies the difference to it
+            self.existing_lines = self.service.load_group(ref_id)
+            existing_records = list(self.existing_lines.values())
             
             if not existing_records:
                 messagebox.showerror("Error", f"No records found for Ref ID: {ref_id}")
                 return
                 
-            print(f"Found {len(existing_records)} existing records for Ref ID: {ref_id}")
+            logger.debug("Found %s existing records for Ref ID: %s", len(existing_records), ref_id)
             
         except Exception as e:
             messagebox.showerror("Error", f"Error loading existing data: {e}")
@@ -1031,11 +918,11 @@ class MultipleSalesManager:
         
         # Right side - Save button
         def on_save_click():
-            print(f"=== SAVE BUTTON CLICKED (EDIT MODE) ===")
-            print(f"Before save_all_sales - sales_rows length: {len(self.sales_rows)}")
-            print(f"Sales_rows id before save: {id(self.sales_rows)}")
+            logger.debug("=== SAVE BUTTON CLICKED (EDIT MODE) ===")
+            logger.debug("Before save_all_sales - sales_rows length: %s", len(self.sales_rows))
+            logger.debug("Sales_rows id before save: %s", id(self.sales_rows))
             save_all_sales_edit()
-            print(f"After save_all_sales - sales_rows length: {len(self.sales_rows)}")
+            logger.debug("After save_all_sales - sales_rows length: %s", len(self.sales_rows))
         
         # Top-right save removed; bottom bar has primary save button
         
@@ -1056,7 +943,7 @@ class MultipleSalesManager:
             suppliers_data = self.db.execute_query(suppliers_query)
             supplier_options = [f"{row[0]} - {row[1]}" for row in suppliers_data]
         except Exception as e:
-            print(f"Error loading suppliers: {e}")
+            logger.error("Error loading suppliers: %s", e)
             supplier_options = []
         
         self.supplier_combo = ttk.Combobox(supplier_frame, 
@@ -1134,35 +1021,35 @@ class MultipleSalesManager:
             items_data = self.db.execute_query(items_query)
             item_options = [f"{row[0]} - {row[1]}" for row in items_data]
         except Exception as e:
-            print(f"Error loading dropdown data: {e}")
+            logger.error("Error loading dropdown data: %s", e)
             item_options = []
         
         # Clear any existing sales rows
-        print(f"Before clearing - sales_rows length: {len(self.sales_rows)}")
+        logger.debug("Before clearing - sales_rows length: %s", len(self.sales_rows))
         self.sales_rows.clear()
-        print(f"After clearing - sales_rows length: {len(self.sales_rows)}")
-        print(f"After clearing - sales_rows id: {id(self.sales_rows)}")
+        logger.debug("After clearing - sales_rows length: %s", len(self.sales_rows))
+        logger.debug("After clearing - sales_rows id: %s", id(self.sales_rows))
         
         # Reset session counter for new modal session
         self.session_ref_counter = 0
-        print(f"Session ref counter reset to: {self.session_ref_counter}")
+        logger.debug("Session ref counter reset to: %s", self.session_ref_counter)
         
         # Add a test marker to verify self object consistency
         self.test_marker = "MODAL_OPENED_EDIT"
-        print(f"Test marker set: {self.test_marker}")
+        logger.debug("Test marker set: %s", self.test_marker)
         
         # Create a local reference to the class instance's sales_rows for the nested functions
         sales_rows_ref = self.sales_rows
         
         def create_sales_row(row_num, existing_data=None):
             """Create a new sales row with optional existing data"""
-            print(f"=== CREATE_SALES_ROW CALLED (EDIT MODE) ===")
-            print(f"Row number: {row_num}")
-            print(f"Existing data: {existing_data}")
-            print(f"Current sales_rows length: {len(sales_rows_ref)}")
-            print(f"Current sales_rows id: {id(sales_rows_ref)}")
-            print(f"Test marker: {getattr(self, 'test_marker', 'NOT_FOUND')}")
-            print(f"Instance ID: {getattr(self, 'instance_id', 'NOT_FOUND')}")
+            logger.debug("=== CREATE_SALES_ROW CALLED (EDIT MODE) ===")
+            logger.debug("Row number: %s", row_num)
+            logger.debug("Existing data: %s", existing_data)
+            logger.debug("Current sales_rows length: %s", len(sales_rows_ref))
+            logger.debug("Current sales_rows id: %s", id(sales_rows_ref))
+            logger.debug("Test marker: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
+            logger.debug("Instance ID: %s", getattr(self, 'instance_id', 'NOT_FOUND'))
             
             # Highlight the first row to make it more visible
             bg_color = self.COLORS['light'] if row_num == 0 else self.COLORS['white']
@@ -1186,7 +1073,7 @@ class MultipleSalesManager:
             
             # Set existing item if provided
             if existing_data:
-                item_name = existing_data[2]  # item_name from existing data
+                item_name = existing_data.item_name
                 # Find matching item in dropdown
                 for option in item_options:
                     if option.endswith(f" - {item_name}"):
@@ -1251,7 +1138,7 @@ class MultipleSalesManager:
                     gross_text = gross_entry.get().strip()
                     less_text = less_entry.get().strip()
                     
-                    print(f"Calculating net weight - Gross: '{gross_text}', Less: '{less_text}'")
+                    logger.debug("Calculating net weight - Gross: '%s', Less: '%s'", gross_text, less_text)
                     
                     if not gross_text and not less_text:
                         net_entry.config(state='normal')
@@ -1264,7 +1151,7 @@ class MultipleSalesManager:
                     less = float(less_text or 0)
                     net = gross - less
                     
-                    print(f"Net weight calculated: {net:.2f}")
+                    logger.debug("Net weight calculated: %.2f", net)
                     
                     net_entry.config(state='normal')
                     net_entry.delete(0, tk.END)
@@ -1272,7 +1159,7 @@ class MultipleSalesManager:
                     net_entry.config(state='readonly')
                     calculate_fine_gold()
                 except (ValueError, TypeError) as e:
-                    print(f"Error in calculate_net_weight: {e}")
+                    logger.error("Error in calculate_net_weight: %s", e)
                     net_entry.config(state='normal')
                     net_entry.delete(0, tk.END)
                     net_entry.insert(0, "0.00")
@@ -1284,7 +1171,7 @@ class MultipleSalesManager:
                     tunch_text = tunch_entry.get().strip()
                     wastage_text = wastage_entry.get().strip()
                     
-                    print(f"Calculating fine gold - Net: '{net_text}', Tunch: '{tunch_text}', Wastage: '{wastage_text}'")
+                    logger.debug("Calculating fine gold - Net: '%s', Tunch: '%s', Wastage: '%s'", net_text, tunch_text, wastage_text)
                     
                     if not net_text and not tunch_text and not wastage_text:
                         fine_entry.config(state='normal')
@@ -1303,7 +1190,7 @@ class MultipleSalesManager:
                     else:
                         fine_gold = net / 100 * tunch
                     
-                    print(f"Fine gold calculated: {fine_gold:.2f}")
+                    logger.debug("Fine gold calculated: %.2f", fine_gold)
                     
                     fine_entry.config(state='normal')
                     fine_entry.delete(0, tk.END)
@@ -1314,7 +1201,7 @@ class MultipleSalesManager:
                     except Exception:
                         pass
                 except (ValueError, ZeroDivisionError, TypeError) as e:
-                    print(f"Error in calculate_fine_gold: {e}")
+                    logger.error("Error in calculate_fine_gold: %s", e)
                     fine_entry.config(state='normal')
                     fine_entry.delete(0, tk.END)
                     fine_entry.insert(0, "0.00")
@@ -1322,19 +1209,19 @@ class MultipleSalesManager:
             
             # Bind calculation events for immediate response
             def on_gross_change(event=None):
-                print("Gross weight changed, calculating net weight...")
+                logger.debug("Gross weight changed, calculating net weight...")
                 calculate_net_weight()
             
             def on_less_change(event=None):
-                print("Less weight changed, calculating net weight...")
+                logger.debug("Less weight changed, calculating net weight...")
                 calculate_net_weight()
             
             def on_tunch_change(event=None):
-                print("Tunch changed, calculating fine gold...")
+                logger.debug("Tunch changed, calculating fine gold...")
                 calculate_fine_gold()
             
             def on_wastage_change(event=None):
-                print("Wastage changed, calculating fine gold...")
+                logger.debug("Wastage changed, calculating fine gold...")
                 calculate_fine_gold()
             
             # Bind events
@@ -1353,14 +1240,14 @@ class MultipleSalesManager:
             
             # Test function to manually trigger calculations
             def test_calculations():
-                print("=== TESTING CALCULATIONS ===")
-                print(f"Gross entry value: '{gross_entry.get()}'")
-                print(f"Less entry value: '{less_entry.get()}'")
-                print(f"Net entry value: '{net_entry.get()}'")
-                print("Calling calculate_net_weight()...")
+                logger.debug("=== TESTING CALCULATIONS ===")
+                logger.debug("Gross entry value: '%s'", gross_entry.get())
+                logger.debug("Less entry value: '%s'", less_entry.get())
+                logger.debug("Net entry value: '%s'", net_entry.get())
+                logger.debug("Calling calculate_net_weight()...")
                 calculate_net_weight()
-                print(f"After calculation - Net entry value: '{net_entry.get()}'")
-                print("=== END TEST ===")
+                logger.debug("After calculation - Net entry value: '%s'", net_entry.get())
+                logger.debug("=== END TEST ===")
             
             # Test button for calculations (temporary)
             # Test button removed
@@ -1383,7 +1270,7 @@ class MultipleSalesManager:
             
             # Trigger initial calculations after a short delay to ensure fields are ready
             def trigger_initial_calculations():
-                print("Triggering initial calculations...")
+                logger.debug("Triggering initial calculations...")
                 test_calculations()
             
             # Use after_idle to ensure the GUI is fully updated
@@ -1411,9 +1298,8 @@ class MultipleSalesManager:
             }
             
             sales_rows_ref.append(row_data)
-            print(f"Added row {row_num} to sales_rows. Total rows now: {len(sales_rows_ref)}")
-            print(f"Sales_rows content after append: {[r['row_num'] for r in sales_rows_ref]}")
-            print(f"Sales_rows id after append: {id(sales_rows_ref)}")
+            logger.debug("Added row %s to sales_rows. Total rows now: %s", row_num, len(sales_rows_ref))
+            logger.debug("Sales_rows id after append: %s", id(sales_rows_ref))
             update_status()
             return row_data
         
@@ -1428,23 +1314,23 @@ class MultipleSalesManager:
         
         def add_new_row():
             """Add a new row to the table"""
-            print(f"=== ADD_NEW_ROW CALLED (EDIT MODE) ===")
+            logger.debug("=== ADD_NEW_ROW CALLED (EDIT MODE) ===")
             row_num = len(sales_rows_ref)
-            print(f"Adding new row {row_num}. Current sales_rows length: {len(sales_rows_ref)}")
-            print(f"Sales_rows id in add_new_row: {id(sales_rows_ref)}")
-            print(f"Test marker in add_new_row: {getattr(self, 'test_marker', 'NOT_FOUND')}")
+            logger.debug("Adding new row %s. Current sales_rows length: %s", row_num, len(sales_rows_ref))
+            logger.debug("Sales_rows id in add_new_row: %s", id(sales_rows_ref))
+            logger.debug("Test marker in add_new_row: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
             create_sales_row(row_num)
-            print(f"After create_sales_row call - sales_rows length: {len(sales_rows_ref)}")
+            logger.debug("After create_sales_row call - sales_rows length: %s", len(sales_rows_ref))
         
+        @timed('multiple_sales.save_all_sales_edit')
         def save_all_sales_edit():
             """Save all sales changes to database (edit mode)"""
-            print(f"=== SAVE ALL SALES EDIT DEBUG ===")
-            print(f"Number of sales rows: {len(sales_rows_ref)}")
-            print(f"Sales rows content: {sales_rows_ref}")
-            print(f"Sales rows type: {type(sales_rows_ref)}")
-            print(f"Sales rows id: {id(sales_rows_ref)}")
-            print(f"Instance ID: {getattr(self, 'instance_id', 'NOT_FOUND')}")
-            print(f"Test marker: {getattr(self, 'test_marker', 'NOT_FOUND')}")
+            logger.debug("=== SAVE ALL SALES EDIT DEBUG ===")
+            logger.debug("Number of sales rows: %s", len(sales_rows_ref))
+            logger.debug("Sales rows type: %s", type(sales_rows_ref))
+            logger.debug("Sales rows id: %s", id(sales_rows_ref))
+            logger.debug("Instance ID: %s", getattr(self, 'instance_id', 'NOT_FOUND'))
+            logger.debug("Test marker: %s", getattr(self, 'test_marker', 'NOT_FOUND'))
             
             if not sales_rows_ref:
                 messagebox.showerror("Error", "No sales to save")
@@ -1466,118 +1352,71 @@ class MultipleSalesManager:
                 supplier_id = int(supplier_text.split(' - ')[0])
                 supplier_name = supplier_text.split(' - ')[1]
                 
-                print(f"=== TRANSACTION DETAILS (EDIT) ===")
-                print(f"Transaction Ref ID: {self.transaction_ref_id}")
-                print(f"Supplier: {supplier_name} (ID: {supplier_id})")
-                print(f"Number of rows to process: {len(self.sales_rows)}")
-                
-                sale_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                saved_count = 0
+                logger.debug("=== TRANSACTION DETAILS (EDIT) ===")
+                logger.debug("Transaction Ref ID: %s", self.transaction_ref_id)
+                logger.debug("Supplier: %s (ID: %s)", supplier_name, supplier_id)
+                logger.debug("Number of rows to process: %s", len(self.sales_rows))
                 
-                # First, delete all existing records for this Ref ID
-                print(f"Deleting existing records for Ref ID: {self.transaction_ref_id}")
-                delete_existing_query = "DELETE FROM sales WHERE ref_id = ?"
-                self.db.execute_update(delete_existing_query, (self.transaction_ref_id,))
-                print(f"Deleted existing records for Ref ID: {self.transaction_ref_id}")
-                
-                # Then insert all current rows as new records
+                # Rows keep the sale_id they were loaded with; new rows have none
+                lines = []
                 for i, row_data in enumerate(sales_rows_ref):
-                    print(f"\n--- Processing Row {i+1} (EDIT) ---")
+                    logger.debug("--- Processing Row %s (EDIT) ---", i + 1)
                     item_text = row_data['item_combo'].get().strip()
                     gross = row_data['gross_entry'].get().strip()
                     less = row_data['less_entry'].get().strip()
                     tunch = row_data['tunch_entry'].get().strip()
                     wastage = row_data['wastage_entry'].get().strip()
                     
-                    print(f"Supplier: '{supplier_name}' (from screen selection)")
-                    print(f"Item: '{item_text}'")
-                    print(f"Gross: '{gross}'")
-                    print(f"Less: '{less}'")
-                    print(f"Tunch: '{tunch}'")
-                    print(f"Wastage: '{wastage}'")
+                    logger.debug("Supplier: '%s' (from screen selection)", supplier_name)
+                    logger.debug("Item: '%s'", item_text)
+                    logger.debug("Gross: '%s'", gross)
+                    logger.debug("Less: '%s'", less)
+                    logger.debug("Tunch: '%s'", tunch)
+                    logger.debug("Wastage: '%s'", wastage)
                     
                     # Check if essential fields are filled (item, gross, less)
                     essential_fields = [item_text, gross, less]
                     if not all(essential_fields):
-                        print(f"Row {i+1}: Skipping - missing essential fields")
+                        logger.debug("Row %s: Skipping - missing essential fields", i + 1)
                         continue
                     
                     # Check if tunch and wastage have valid values (not empty and not just "0.0")
                     if not tunch or tunch == "0.0" or tunch == "0":
-                        print(f"Row {i+1}: Skipping - invalid tunch value: '{tunch}'")
+                        logger.debug("Row %s: Skipping - invalid tunch value: '%s'", i + 1, tunch)
                         continue
                         
                     if not wastage or wastage == "0.0" or wastage == "0":
-                        print(f"Row {i+1}: Skipping - invalid wastage value: '{wastage}'")
+                        logger.debug("Row %s: Skipping - invalid wastage value: '%s'", i + 1, wastage)
                         continue
                     
                     # Extract item info
                     item_id = int(item_text.split(' - ')[0])
                     
-                    # Calculate values
-                    net_weight = float(gross) - float(less)
-                    if float(wastage) != 0:  # Avoid division by zero
-                        fine_gold = (net_weight / 100 * float(tunch)) + (net_weight / 100 * float(wastage))
-                    else:
-                        fine_gold = net_weight / 100 * float(tunch)
-                    
-                    # Insert into database with single Ref ID for all entries
-                    query = '''
-                        INSERT INTO sales (ref_id, supplier_name, item_id, gross_weight, less_weight, 
-                                         net_weight, tunch_percentage, wastage_percentage, fine_gold, sale_date)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    '''
-                    
-                    insert_data = (
-                        self.transaction_ref_id,  # Use single Ref ID for all entries
-                        supplier_name,
-                        item_id,
-                        float(gross),
-                        float(less),
-                        net_weight,
-                        float(tunch),
-                        float(wastage),
-                        fine_gold,
-                        sale_date
-                    )
-                    
-                    print(f"Inserting data: {insert_data}")
-                    try:
-                        self.db.execute_update(query, insert_data)
-                        print(f"Data inserted successfully into sales table!")
-                    except Exception as db_error:
-                        print(f"Database error inserting row {i+1}: {db_error}")
-                        print(f"Query: {query}")
-                        print(f"Data: {insert_data}")
-                        raise db_error
-                    
-                    # Update item inventory (subtract from inventory for sales)
-                    self.main_app.update_item_inventory(item_id, fine_gold, net_weight, 'subtract')
-                    
-                    # Update supplier balance (add monetary value to supplier balance for sales)
-                    self.main_app.update_supplier_balance(supplier_name, fine_gold, 'add')
-                    
-                    saved_count += 1
-                    print(f"Row {i+1}: Successfully saved!")
+                    lines.append((row_data.get('existing_sale_id'), item_id, gross, less, tunch, wastage))
+                    logger.debug("Row %s: queued", i + 1)
                 
-                print(f"\n=== SAVE RESULT (EDIT) ===")
-                print(f"Total rows processed: {len(self.sales_rows)}")
-                print(f"Successfully saved: {saved_count}")
+                logger.debug("=== SAVE RESULT (EDIT) ===")
+                logger.debug("Total rows processed: %s", len(self.sales_rows))
                 
+                # One transaction: changed lines updated, new ones inserted, removed ones deleted,
+                # stock and balance moved by the difference
+                saved_count = len(lines)
                 if saved_count > 0:
+                    self.service.update_group(self.transaction_ref_id, self.existing_lines, supplier_name, lines)
+                    logger.debug("Successfully saved: %s", saved_count)
+                    self.main_app.load_items_data()
                     self.main_app.show_toast(f"Successfully updated {saved_count} sales with Ref ID: {self.transaction_ref_id}!", success=True)
                     # Call main app's load_unified_data method to refresh the unified table
-                    print(f"Calling main_app.load_unified_data() to refresh main table...")
-                    print(f"Main app object: {self.main_app}")
-                    print(f"Main app type: {type(self.main_app)}")
+                    logger.debug("Calling main_app.load_unified_data() to refresh main table...")
+                    logger.debug("Main app object: %s", self.main_app)
+                    logger.debug("Main app type: %s", type(self.main_app))
                     
                     if hasattr(self.main_app, 'load_unified_data'):
-                        print(f"Found load_unified_data method, calling it...")
+                        logger.debug("Found load_unified_data method, calling it...")
                         self.main_app.load_unified_data()
-                        print(f"Main unified table refreshed successfully!")
+                        logger.debug("Main unified table refreshed successfully!")
                     else:
-                        print(f"Main app does not have load_unified_data method!")
-                        print(f"Available methods: {[method for method in dir(self.main_app) if not method.startswith('_')]}")
+                        logger.debug("Main app does not have load_unified_data method!")
                     modal.destroy()
                 else:
                     messagebox.showerror("Error", "No valid sales to save. Please fill all required fields.")
@@ -1595,35 +1434,35 @@ class MultipleSalesManager:
         
         def update_status():
             """Update the status label with current row count"""
-            print(f"=== UPDATE_STATUS CALLED (EDIT) ===")
-            print(f"Sales_rows length in update_status: {len(sales_rows_ref)}")
-            print(f"Sales_rows id in update_status: {id(sales_rows_ref)}")
+            logger.debug("=== UPDATE_STATUS CALLED (EDIT) ===")
+            logger.debug("Sales_rows length in update_status: %s", len(sales_rows_ref))
+            logger.debug("Sales_rows id in update_status: %s", id(sales_rows_ref))
             try:
                 if hasattr(self, 'status_label') and self.status_label.winfo_exists():
                     self.status_label.config(text=f"Rows: {len(sales_rows_ref)}")
-                    print(f"Status label updated to: Rows: {len(sales_rows_ref)}")
+                    logger.debug("Status label updated to: Rows: %s", len(sales_rows_ref))
                 else:
-                    print("Status label not available yet, skipping update")
+                    logger.debug("Status label not available yet, skipping update")
             except Exception as e:
-                print(f"Error updating status label: {e}")
-                print("Status label not available yet, skipping update")
+                logger.error("Error updating status label: %s", e)
+                logger.debug("Status label not available yet, skipping update")
         
         # Pack canvas and scrollbar first
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
         # Create rows from existing data
-        print("Creating rows from existing data...")
+        logger.debug("Creating rows from existing data...")
         for i, existing_record in enumerate(existing_records):
-            print(f"Creating row {i} with existing data: {existing_record}")
+            logger.debug("Creating row %s with existing data: %s", i, existing_record)
             create_sales_row(i, existing_record)
-        print(f"After creating rows from existing data, sales_rows length: {len(sales_rows_ref)}")
+        logger.debug("After creating rows from existing data, sales_rows length: %s", len(sales_rows_ref))
         
         # Add debugging for modal lifecycle
         def on_modal_close():
-            print(f"=== MODAL CLOSING (EDIT) ===")
-            print(f"Final sales_rows length: {len(sales_rows_ref)}")
-            print(f"Final sales_rows id: {id(sales_rows_ref)}")
+            logger.debug("=== MODAL CLOSING (EDIT) ===")
+            logger.debug("Final sales_rows length: %s", len(sales_rows_ref))
+            logger.debug("Final sales_rows id: %s", id(sales_rows_ref))
             modal.destroy()
         
         modal.protocol("WM_DELETE_WINDOW", on_modal_close)
@@ -0,0 +1,21 @@
+"""
+Headless services for the Gold Jewelry Business Management System
+Business logic that returns plain data, called by the Tk layer, the importer and the benchmarks
+"""
+
+from services.analytics import AnalyticsCache
+from services.exposure import ExposureService
+from services.home import HomeService
+from services.inventory import InventoryService
+from services.items import ItemsService
+from services.karigar import KarigarService
+from services.models import GroupLine, ItemStock, KarigarExposure, KarigarOrder, RainiOrder, SaleGroup, SaleLine, Supplier
+from services.purchases import PurchasesService
+from services.raini import RainiService
+from services.reports import ReportsService
+from services.sales import SalesService
+from services.suppliers import SuppliersService
+
+__all__ = ['AnalyticsCache', 'ExposureService', 'HomeService', 'InventoryService', 'ItemsService', 'KarigarService', 'PurchasesService', 'RainiService',
+           'ReportsService', 'SalesService', 'SuppliersService',
+           'GroupLine', 'ItemStock', 'KarigarExposure', 'KarigarOrder', 'RainiOrder', 'SaleGroup', 'SaleLine', 'Supplier']
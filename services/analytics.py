@@ -0,0 +1,264 @@
+"""
+Analytics service module for Gold Jewelry Business Management System
+In-memory columnar copy of the fact tables with running group-by totals, kept current from the
+table_changes counters, so report and dashboard summaries don't rescan SQLite
+"""
+
+import threading
+from array import array
+
+from app_logging import get_logger
+from services.base import Service
+
+logger = get_logger(__name__)
+
+# table -> (key columns, numeric columns, rollups). Rows come from the 'analytics.<table>' query:
+# the id column first, then the key columns, then the numeric ones. Key columns are dictionary
+# encoded (any value, NULL included); numeric columns are float arrays with NULL read as 0.
+# Each rollup is a tuple of key columns whose [count, sum of every numeric column] per distinct
+# key is maintained as rows are loaded.
+FACT_TABLES = {
+    'sales': (
+        ('kind', 'supplier_name', 'item_id', 'month'),
+        ('gross_weight', 'net_weight', 'fine_gold'),
+        (('kind', 'month'), ('kind', 'supplier_name'), ('kind', 'item_id')),
+    ),
+    'karigar_order_items': (
+        ('order_id', 'item_name', 'direction', 'month'),
+        ('weight',),
+        (('order_id', 'direction'), ('item_name', 'direction'), ('month', 'direction')),
+    ),
+    'work_orders': (
+        ('freelancer_id', 'status', 'month'),
+        ('gold_weight_issued', 'final_jewelry_weight', 'wastage_weight'),
+        (('status',), ('freelancer_id',), ('month', 'status'), ('month', 'freelancer_id')),
+    ),
+    'gold_inventory': (
+        ('gold_type_id', 'form', 'purity_percentage', 'month'),
+        ('weight_grams',),
+        (('gold_type_id',), ('form', 'purity_percentage'), ('month',)),
+    ),
+}
+# Small lookup tables, reloaded whole when they change: table -> {id: rest of the row}
+DIMENSION_TABLES = ('freelancers', 'gold_types')
+
+
+class KeyColumn:
+    """Dictionary-encoded column: a 4-byte code per row plus each distinct value once"""
+
+    __slots__ = ('codes', 'values', 'index')
+
+    def __init__(self):
+        self.codes = array('i')
+        self.values = []
+        self.index = {}
+
+    def extend(self, values):
+        index = self.index
+        codes = []
+        for value in values:
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(self.values)
+                self.values.append(value)
+            codes.append(code)
+        self.codes.extend(codes)
+
+
+def _fold(totals, keys, amounts):
+    """Add rows to totals: keys yields one key tuple per row, amounts holds one list per numeric column"""
+    empty = [0] + [0.0] * len(amounts)
+    for key, *row_amounts in zip(keys, *amounts):
+        acc = totals.get(key)
+        if acc is None:
+            acc = totals[key] = empty.copy()
+        acc[0] += 1
+        for i, amount in enumerate(row_amounts, 1):
+            acc[i] += amount
+
+
+class FactTable:
+    """One fact table held column by column, plus its maintained rollups"""
+
+    def __init__(self, name, key_columns, value_columns, rollups):
+        self.name = name
+        self.key_columns = key_columns
+        self.value_columns = value_columns
+        self.rollup_keys = rollups
+        self.clear()
+
+    def clear(self):
+        self.ids = array('q')
+        self.keys = {name: KeyColumn() for name in self.key_columns}
+        self.values = {name: array('d') for name in self.value_columns}
+        self.rollups = {keys: {} for keys in self.rollup_keys}
+        # (db generation, inserts, rewrites) the loaded rows correspond to
+        self.version = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def high_water(self):
+        return self.ids[-1] if self.ids else 0
+
+    def extend(self, rows):
+        """Append rows (in id order) to the columns and fold them into the rollups"""
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        self.ids.extend(columns[0])
+        batch_keys = dict(zip(self.key_columns, columns[1:]))
+        for name, values in batch_keys.items():
+            self.keys[name].extend(values)
+        amounts = [[float(value or 0) for value in values] for values in columns[1 + len(self.key_columns):]]
+        for name, values in zip(self.value_columns, amounts):
+            self.values[name].extend(values)
+        for keys, totals in self.rollups.items():
+            _fold(totals, zip(*(batch_keys[name] for name in keys)), amounts)
+
+
+class AnalyticsCache(Service):
+    """Columnar cache of the fact tables. Each summary first brings the tables it reads up to date:
+    rows appended since the last look are fetched past the highest cached id, and a table whose rows
+    were updated or deleted is reloaded. A summary over unchanged tables is a dict lookup.
+    Thread-safe; pass conn to load on a pooled read connection.
+    """
+
+    def __init__(self, db_manager):
+        super().__init__(db_manager)
+        self._lock = threading.RLock()
+        self.tables = {name: FactTable(name, *spec) for name, spec in FACT_TABLES.items()}
+        self._dimensions = {}
+
+    def _version(self, table_name, conn):
+        row = self._read_one('changes.table', (table_name,), conn)
+        return (self.db.generation,) + (tuple(row) if row else (None, None))
+
+    def table(self, name, conn=None):
+        """The FactTable for name, brought up to date with the database"""
+        with self._lock:
+            table = self.tables[name]
+            version = self._version(name, conn)
+            if version == table.version:
+                return table
+            if table.version is None or version[0] != table.version[0] or version[2] != table.version[2]:
+                table.clear()
+            rows = self._read_all(f'analytics.{name}', (table.high_water,), conn)
+            table.extend(rows)
+            table.version = version
+            logger.debug("Analytics cache: %s +%s rows (%s cached)", name, len(rows), len(table))
+            return table
+
+    def dimension(self, name, conn=None):
+        """{id: rest of row} for a lookup table (see DIMENSION_TABLES)"""
+        with self._lock:
+            version = self._version(name, conn)
+            cached = self._dimensions.get(name)
+            if cached is None or cached[0] != version:
+                rows = self._read_all(f'analytics.{name}', conn=conn)
+                cached = self._dimensions[name] = (version, {row[0]: row[1:] for row in rows})
+            return cached[1]
+
+    def rollup(self, table_name, keys, conn=None):
+        """{key tuple: [count, sum of each numeric column]} for one of the table's declared rollups.
+        The dict is live cache state; callers must not modify it.
+        """
+        with self._lock:
+            return self.table(table_name, conn).rollups[tuple(keys)]
+
+    def group_by(self, table_name, keys, conn=None):
+        """Like rollup() for any combination of key columns; undeclared ones are computed by a scan"""
+        keys = tuple(keys)
+        with self._lock:
+            table = self.table(table_name, conn)
+            if keys in table.rollups:
+                return table.rollups[keys]
+            # Group on the integer codes, then translate each distinct code tuple back to values
+            columns = [table.keys[name] for name in keys]
+            by_codes = {}
+            _fold(by_codes, zip(*(column.codes for column in columns)),
+                  [table.values[name] for name in table.value_columns])
+            return {tuple(column.values[code] for column, code in zip(columns, codes)): acc
+                    for codes, acc in by_codes.items()}
+
+    def clear(self):
+        """Drop everything; the next summary reloads from the database"""
+        with self._lock:
+            for table in self.tables.values():
+                table.clear()
+            self._dimensions.clear()
+
+    # --- Summaries -------------------------------------------------------------------------
+
+    def sales_by(self, key, kind='S', conn=None):
+        """{value: (lines, gross, net, fine gold)} of sale ('S') or purchase ('P') lines grouped by
+        'month', 'supplier_name' or 'item_id'"""
+        with self._lock:
+            return {group[1]: tuple(acc) for group, acc in self.rollup('sales', ('kind', key), conn).items()
+                    if group[0] == kind}
+
+    def karigar_balances(self, key='order_id', conn=None):
+        """{value: (issued, received)} of karigar item weights grouped by 'order_id', 'item_name' or 'month'"""
+        balances = {}
+        with self._lock:
+            for (value, direction), acc in self.rollup('karigar_order_items', (key, 'direction'), conn).items():
+                issued, received = balances.get(value, (0.0, 0.0))
+                if direction == 'issued':
+                    issued += acc[1]
+                elif direction == 'received':
+                    received += acc[1]
+                balances[value] = (issued, received)
+        return balances
+
+    def inventory_by_gold_type(self, conn=None):
+        """Rows of the 'reports.inventory' query: (gold type, total weight, items, available weight)"""
+        with self._lock:
+            names = self.dimension('gold_types', conn)
+            by_type = self.rollup('gold_inventory', ('gold_type_id',), conn)
+            return [(names[type_id][0], acc[1], acc[0], acc[1])
+                    for (type_id,), acc in sorted(item for item in by_type.items() if item[0][0] in names)]
+
+    def work_orders_by_status(self, conn=None):
+        """Rows of the 'reports.work_orders' query: (status, count, gold issued)"""
+        with self._lock:
+            by_status = self.rollup('work_orders', ('status',), conn)
+            return [(status, acc[0], acc[1]) for (status,), acc in
+                    sorted(by_status.items(), key=lambda item: (item[0][0] is not None, item[0][0] or ''))]
+
+    def freelancer_totals(self, conn=None):
+        """Rows of the 'reports.freelancers' query: (name, orders, gold issued, completed, wastage)
+        per active freelancer"""
+        with self._lock:
+            freelancers = self.dimension('freelancers', conn)
+            by_freelancer = self.rollup('work_orders', ('freelancer_id',), conn)
+            rows = []
+            for freelancer_id, (full_name, is_active) in freelancers.items():
+                if is_active != 1:
+                    continue
+                acc = by_freelancer.get((freelancer_id,))
+                rows.append((full_name, acc[0], acc[1], acc[2], acc[3]) if acc else (full_name, 0, None, None, None))
+            return rows
+
+    def completed_wastage(self, conn=None):
+        """Row of the 'reports.wastage' query: (gold issued, completed weight, wastage) of completed orders"""
+        acc = self.rollup('work_orders', ('status',), conn).get(('completed',))
+        return (acc[1], acc[2], acc[3]) if acc else (None, None, None)
+
+    def month_summary(self, month, conn=None):
+        """Rows of the three 'reports.month_*' queries for month ('YYYY-MM')"""
+        with self._lock:
+            orders = total_issued = completed = 0
+            for (order_month, status), acc in self.rollup('work_orders', ('month', 'status'), conn).items():
+                if order_month == month:
+                    orders += acc[0]
+                    total_issued += acc[1]
+                    if status == 'completed':
+                        completed += acc[0]
+            inventory = self.rollup('gold_inventory', ('month',), conn).get((month,))
+            freelancers = self.dimension('freelancers', conn)
+            active = sum(1 for order_month, freelancer_id in self.rollup('work_orders', ('month', 'freelancer_id'), conn)
+                         if order_month == month and freelancers.get(freelancer_id, (None, 0))[1] == 1)
+            return ((orders, total_issued if orders else None, completed if orders else None),
+                    (inventory[0], inventory[1]) if inventory else (0, None),
+                    (active,))
@@ -0,0 +1,28 @@
+"""
+Service base module for Gold Jewelry Business Management System
+Shared plumbing for the headless services: registered queries on the writer or a pooled read connection
+"""
+
+from database import QUERIES
+
+
+class Service:
+    """Base for the services; each wraps a DatabaseManager and returns plain data (tuples, lists, dicts)"""
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def _read_all(self, name, params=None, conn=None, model=None):
+        """Rows of a registered query, on conn (e.g. a pooled read connection) or the writer connection.
+        With a model (see services.models) each row is built as that record type while fetching.
+        """
+        row_factory = model.row_factory if model is not None else None
+        if conn is None:
+            return self.db.execute_named(name, params, row_factory)
+        return self.db.read_all(conn, QUERIES[name], params, row_factory)
+
+    def _read_one(self, name, params=None, conn=None):
+        if conn is None:
+            rows = self.db.execute_named(name, params)
+            return rows[0] if rows else None
+        return self.db.read_one(conn, QUERIES[name], params)
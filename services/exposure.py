@@ -0,0 +1,84 @@
+"""
+Exposure service module for Gold Jewelry Business Management System
+Metal each karigar currently holds: issued minus received across open orders, per item and by age
+"""
+
+from datetime import datetime
+
+from app_logging import get_logger
+from services.base import Service
+from services.models import KarigarExposure
+
+logger = get_logger(__name__)
+
+# (oldest age in days, label) per ageing bucket; an order's age is whole days since it was created
+AGE_BUCKETS = ((7, '0-7 days'), (30, '8-30 days'), (90, '31-90 days'), (None, '90+ days'))
+
+
+def _age_bucket(created_at, today):
+    try:
+        age = (today - datetime.strptime(str(created_at)[:10], '%Y-%m-%d').date()).days
+    except ValueError:
+        # Undated orders count as the oldest
+        return len(AGE_BUCKETS) - 1
+    for index, (limit, _label) in enumerate(AGE_BUCKETS):
+        if limit is None or age <= limit:
+            return index
+
+
+class ExposureService(Service):
+    """Karigar exposure, cached until a karigar order or its detail rows change (the table_changes
+    counters), the database is reopened or restored, or the date rolls over (ageing moves).
+    Per-item totals come from the detail rows; ageing uses each order's stored balance.
+    """
+
+    def __init__(self, db_manager):
+        super().__init__(db_manager)
+        self.version = 0
+        self._key = None
+        self._rows = []
+
+    def refresh(self, now=None):
+        """Bring the exposure up to date; returns its version, which changes only when it was recomputed"""
+        today = (now or datetime.now()).date()
+        key = (today, self.db.change_version(('karigar_orders', 'karigar_order_items')))
+        if key == self._key:
+            return self.version
+
+        karigars = {}
+
+        def entry(name):
+            found = karigars.get(name)
+            if found is None:
+                found = karigars[name] = [0, [0.0] * len(AGE_BUCKETS), []]
+            return found
+
+        for name, balance, created_at in self._read_all('karigar.open_order_balances'):
+            found = entry(name)
+            found[0] += 1
+            found[1][_age_bucket(created_at, today)] += balance
+        for name, _item_id, item_name, issued, received in self._read_all('karigar.open_item_exposure'):
+            entry(name)[2].append((item_name, issued, received))
+
+        rows = []
+        for name, (orders, ageing, items) in karigars.items():
+            items.sort(key=lambda item: item[1] - item[2], reverse=True)
+            issued = sum(item[1] for item in items)
+            received = sum(item[2] for item in items)
+            rows.append(KarigarExposure(name, orders, issued, received, issued - received, tuple(ageing), tuple(items)))
+        rows.sort(key=lambda row: row.outstanding, reverse=True)
+
+        self._rows = rows
+        self._key = key
+        self.version += 1
+        logger.debug("Karigar exposure: %s karigar(s) with open orders", len(rows))
+        return self.version
+
+    def by_karigar(self):
+        """[KarigarExposure, ...] largest outstanding first, as of the last refresh()"""
+        return self._rows
+
+    def totals(self):
+        """(outstanding, outstanding per ageing bucket) across all karigars, as of the last refresh()"""
+        ageing = [sum(row.ageing[index] for row in self._rows) for index in range(len(AGE_BUCKETS))]
+        return sum(row.outstanding for row in self._rows), tuple(ageing)
@@ -0,0 +1,81 @@
+"""
+Home service module for Gold Jewelry Business Management System
+Cached "today" snapshot behind the Home tab: today's sale/purchase lines and the pending Raini orders
+"""
+
+from datetime import datetime, timedelta
+
+from app_logging import get_logger
+from services.base import Service
+
+logger = get_logger(__name__)
+
+# Pending Raini orders listed on the Home tab
+PENDING_LIMIT = 15
+
+
+class HomeService(Service):
+    """Today's lines are held in memory. refresh() fetches only lines past the highest sale_id seen,
+    and reloads the day only when sales were updated or deleted (the table_changes counters), the
+    database was reopened or restored, or the date rolled over. The pending Raini list is re-read
+    only when raini_orders changed. With nothing changed a refresh is one counter lookup.
+    """
+
+    def __init__(self, db_manager):
+        super().__init__(db_manager)
+        self.version = 0
+        self._day_key = None
+        self._sales_version = None
+        self._lines = {}
+        self._high_water = 0
+        self._today = []
+        self._raini_version = None
+        self._pending = []
+
+    def refresh(self, now=None):
+        """Bring the snapshot up to date; returns its version, which changes only when a list did"""
+        now = now or datetime.now()
+        changed = False
+
+        generation, sales_counts, raini_counts = self.db.change_version(('sales', 'raini_orders'))
+        sales_version = (generation, sales_counts)
+        day = now.strftime('%Y-%m-%d')
+        # Appends are fetched past the high-water mark; anything else reloads the day
+        day_key = (day, generation, sales_counts and sales_counts[1])
+        reload = day_key != self._day_key
+        if reload:
+            self._lines.clear()
+            self._high_water = 0
+            self._day_key = day_key
+        if reload or sales_version != self._sales_version:
+            next_day = (now + timedelta(days=1)).strftime('%Y-%m-%d')
+            rows = self._read_all('home.day_lines', (day, next_day, self._high_water))
+            for row in rows:
+                self._lines[row[0]] = row[1:]
+                self._high_water = max(self._high_water, row[0])
+            self._sales_version = sales_version
+            if rows or reload:
+                # Newest first, as the table shows them
+                self._today = [line[:-1] for _sale_id, line in
+                               sorted(self._lines.items(), key=lambda item: (item[1][-1] or '', item[0]), reverse=True)]
+                changed = True
+            logger.debug("Home snapshot: +%s line(s) for %s (%s held)", len(rows), day, len(self._lines))
+
+        raini_version = (generation, raini_counts)
+        if raini_version != self._raini_version:
+            self._pending = self._read_all('raini.pending_list', (PENDING_LIMIT,))
+            self._raini_version = raini_version
+            changed = True
+
+        if changed:
+            self.version += 1
+        return self.version
+
+    def today_lines(self):
+        """Today's lines as of the last refresh(), newest first:
+        (ref_id, type, supplier, item, gross, less, net, tunch, wastage, fine gold, HH:MM)"""
+        return self._today
+
+    def pending_orders(self):
+        """[(raini_id, total_weight), ...] for the oldest pending orders, as of the last refresh()"""
+        return self._pending
@@ -0,0 +1,35 @@
+"""
+Inventory service module for Gold Jewelry Business Management System
+Gold inventory (raw metal by form and purity) summaries
+"""
+
+from services.base import Service
+
+
+def purity_label(purity):
+    """Purity as shown to users: '75' for 75.0, '91.6' for 91.6"""
+    if int(purity) == purity:
+        return f"{int(purity)}"
+    return (f"{purity:.2f}").rstrip('0').rstrip('.')
+
+
+class InventoryService(Service):
+    """Gold inventory lots"""
+
+    def breakdown(self):
+        """Count and weight of inventory per form and purity, from one GROUP BY.
+        Returns (forms, purities, cells): the forms and purity labels in stock, sorted, and
+        cells[(form, purity label)] = [count, weight]. Lots without a form get cells but are
+        left out of forms (and their purities out of purities).
+        """
+        forms, purities, cells = [], {}, {}
+        for form, purity, count, weight in self._read_all('inventory.breakdown'):
+            label = purity_label(purity)
+            cell = cells.setdefault((form, label), [0, 0.0])
+            cell[0] += count
+            cell[1] += weight or 0.0
+            if form:
+                if not forms or forms[-1] != form:
+                    forms.append(form)
+                purities.setdefault(label, purity)
+        return forms, sorted(purities, key=purities.get), cells
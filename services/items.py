@@ -0,0 +1,19 @@
+"""
+Items service module for Gold Jewelry Business Management System
+Item stock: the per-item summary behind the Items tab and signed stock adjustments
+"""
+
+from services.base import Service
+from services.models import ItemStock
+
+
+class ItemsService(Service):
+    """Item stock as derived from purchase and sale lines"""
+
+    def stock_summary(self, conn=None):
+        """[ItemStock, ...] (item_id, item_name, gross, less, net, wastage %), newest item first"""
+        return self._read_all('items.stock_summary', conn=conn, model=ItemStock)
+
+    def adjust_stock(self, item_id, fine_delta, net_delta):
+        """Add signed fine/net deltas to an item's stored weights (negative removes stock)"""
+        return self.db.update_named('items.adjust_weights', (fine_delta, net_delta, item_id))
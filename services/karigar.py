@@ -0,0 +1,163 @@
+"""
+Karigar service module for Gold Jewelry Business Management System
+Karigar (artisan) order listings, order saves with their issued/received metal, and balances
+"""
+
+from datetime import datetime
+
+from database import QUERIES
+from migrations import KARIGAR_ITEM_BALANCES_FILL
+from app_logging import get_logger
+from services.base import Service
+from services.models import KarigarOrder, iter_models
+
+logger = get_logger(__name__)
+
+# Stock moves with the detail direction: metal issued to a karigar leaves stock, received metal returns
+DIRECTION_SIGNS = {'issued': -1, 'received': 1}
+# Weights (grams) closer than this count as equal when reconciling running totals
+RECONCILE_TOLERANCE = 1e-6
+
+
+def _close(left, right):
+    return all(abs((a or 0) - (b or 0)) <= RECONCILE_TOLERANCE for a, b in zip(left, right))
+
+
+class KarigarService(Service):
+    """Karigar orders and their issued/received metal"""
+
+    def iter_open_orders(self):
+        """Lazily yield open orders as KarigarOrder (order_id, karigar, issued, received, balance, status, created_at)"""
+        return iter_models(KarigarOrder, self.db.iter_query(QUERIES['karigar.open_orders']))
+
+    @staticmethod
+    def _next_ref_id(conn, today=None):
+        """Next order ref_id for today (KO + DDMMYY + / + 3 digits), read on the saving transaction"""
+        date_str = (today or datetime.now()).strftime('%d%m%y')
+        row = conn.execute(QUERIES['karigar.last_ref_like'], (f"KO{date_str}/%",)).fetchone()
+        last_num = 0
+        if row and row[0]:
+            try:
+                last_num = int(str(row[0]).split('/')[-1])
+            except ValueError:
+                logger.warning("Unexpected karigar ref_id %s", row[0])
+        return f"KO{date_str}/{last_num + 1:03d}"
+
+    @staticmethod
+    def _prepare_lines(issued, received):
+        """Detail rows (item_id, item_name, direction, weight) for issued/received lines
+        [(item_id, item_name, weight), ...], the per-item net stock move and the two totals.
+        Lines without a positive weight are dropped."""
+        details = []
+        stock = {}
+        totals = {'issued': 0.0, 'received': 0.0}
+        for direction, lines in (('issued', issued), ('received', received)):
+            for item_id, item_name, weight in lines:
+                weight = float(weight)
+                if weight <= 0:
+                    continue
+                details.append((item_id, item_name, direction, weight))
+                stock[item_id] = stock.get(item_id, 0.0) + DIRECTION_SIGNS[direction] * weight
+                totals[direction] += weight
+        return details, stock, totals['issued'], totals['received']
+
+    @staticmethod
+    def _write_lines(conn, order_id, details, stock, created_at):
+        conn.executemany(QUERIES['karigar.insert_item'],
+                         [(order_id,) + detail + (created_at,) for detail in details])
+        conn.executemany(QUERIES['items.adjust_weights'],
+                         [(delta, delta, item_id) for item_id, delta in stock.items() if delta])
+
+    def save_order(self, karigar_id, karigar_name, issued, received, created_at=None):
+        """Create an in-progress order with issued/received lines [(item_id, item_name, weight), ...]:
+        header, detail rows and stock moves in one transaction (lines without a positive weight are
+        skipped). Returns (order_id, ref_id).
+        """
+        created_at = created_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        details, stock, issued_total, received_total = self._prepare_lines(issued, received)
+        with self.db.transaction() as conn:
+            ref_id = self._next_ref_id(conn)
+            order_id = conn.execute(QUERIES['karigar.insert_order'],
+                                    (ref_id, karigar_id, karigar_name, issued_total, received_total,
+                                     issued_total - received_total, created_at)).lastrowid
+            self._write_lines(conn, order_id, details, stock, created_at)
+        logger.debug("Saved karigar order %s (%s): %s line(s), %s issued, %s received", order_id, ref_id,
+                     len(details), issued_total, received_total)
+        return order_id, ref_id
+
+    def add_to_order(self, order_id, issued, received, created_at=None):
+        """Append issued/received lines to an order, adding them to its totals and moving stock, in one
+        transaction. Returns (issued added, received added).
+        """
+        created_at = created_at or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        details, stock, issued_total, received_total = self._prepare_lines(issued, received)
+        if not details:
+            return 0.0, 0.0
+        with self.db.transaction() as conn:
+            self._write_lines(conn, order_id, details, stock, created_at)
+            conn.execute(QUERIES['karigar.add_totals'],
+                         (issued_total, received_total, issued_total - received_total, order_id))
+        return issued_total, received_total
+
+    def delete_orders(self, order_ids):
+        """Delete orders with their detail rows in one transaction. Details go first so the
+        balance triggers still find each row's karigar. Stock is left as it is."""
+        order_ids = [(order_id,) for order_id in order_ids]
+        with self.db.transaction() as conn:
+            conn.executemany(QUERIES['karigar.delete_items'], order_ids)
+            conn.executemany(QUERIES['karigar.delete_order'], order_ids)
+        return len(order_ids)
+
+    def order_items(self, order_id, conn=None):
+        """[(item_name, direction, weight), ...] of one order in entry order"""
+        return self._read_all('karigar.order_items', (order_id,), conn)
+
+    def balances(self, conn=None):
+        """[(karigar_name, issued, received, outstanding), ...], largest outstanding first"""
+        return self._read_all('karigar.balances', conn=conn)
+
+    def item_balances(self, conn=None):
+        """{(karigar_name, item_id): (item_name, issued, received)} as maintained by the balance triggers"""
+        return {(row[0], row[1]): tuple(row[2:]) for row in self._read_all('karigar.item_balances', conn=conn)}
+
+    def reconcile(self, fix=False, conn=None):
+        """Check the stored order totals and the maintained balances against the detail rows.
+        Returns {'orders': [(order_id, stored (issued, received, balance), actual (issued, received))],
+        'balances': [((karigar_name, item_id), maintained, actual)], 'orphan_items': count}.
+        Mismatches are logged. With fix=True the order totals are reset from their detail rows and the
+        balances rebuilt, in one transaction (conn is then ignored).
+        """
+        orders = []
+        for order_id, issued, received, balance, actual_issued, actual_received in \
+                self._read_all('karigar.reconcile_orders', conn=conn):
+            stored = (issued or 0, received or 0, balance or 0)
+            actual = (actual_issued, actual_received)
+            if not _close(stored, actual + (actual_issued - actual_received,)):
+                orders.append((order_id, stored, actual))
+
+        maintained = self.item_balances(conn)
+        actual = {(row[0], row[1]): tuple(row[2:]) for row in self._read_all('karigar.item_balances_actual', conn=conn)}
+        balances = []
+        for key in maintained.keys() | actual.keys():
+            kept = maintained.get(key, (None, 0, 0))[1:]
+            found = actual.get(key, (None, 0, 0))[1:]
+            if not _close(kept, found):
+                balances.append((key, kept, found))
+
+        orphan_items = self._read_one('karigar.orphan_items', conn=conn)[0]
+        for order_id, stored, found in orders:
+            logger.warning("Karigar order %s totals %s don't match its items %s", order_id, stored, found)
+        if balances:
+            logger.warning("%s karigar item balance(s) out of step with the order items", len(balances))
+        if orphan_items:
+            logger.warning("%s karigar order item(s) belong to no order", orphan_items)
+
+        if fix and (orders or balances):
+            with self.db.transaction() as write_conn:
+                write_conn.executemany(QUERIES['karigar.set_totals'],
+                                       [(issued, received, issued - received, order_id)
+                                        for order_id, _stored, (issued, received) in orders])
+                write_conn.execute("DELETE FROM karigar_item_balances")
+                write_conn.execute(KARIGAR_ITEM_BALANCES_FILL)
+            logger.info("Reconciled %s karigar order(s) and rebuilt the item balances", len(orders))
+        return {'orders': orders, 'balances': balances, 'orphan_items': orphan_items}
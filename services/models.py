@@ -0,0 +1,220 @@
+"""
+Row models module for Gold Jewelry Business Management System
+Tuple-backed records for the rows the services hand to the views, formatted only when displayed
+"""
+
+import sys
+from collections import namedtuple
+
+
+# Builds a record from an already ordered tuple, skipping namedtuple's keyword-argument __new__
+_new_record = tuple.__new__
+_sys_intern = sys.intern
+
+
+def _intern(value):
+    """Share one string object between rows for repeated text (supplier, item, status);
+    sqlite3 otherwise builds a new str for every cell."""
+    return _sys_intern(value) if type(value) is str else value
+
+
+def iter_models(model, rows):
+    """Lazily wrap rows from an iterator (e.g. db.iter_query) in model; closing this closes rows"""
+    try:
+        for row in rows:
+            yield model.from_row(row)
+    finally:
+        if hasattr(rows, 'close'):
+            rows.close()
+
+
+def _date(value):
+    return value[:10] if value else 'N/A'
+
+
+class _Model:
+    """Mixin for the namedtuple records below; adds no per-row storage"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        return _new_record(cls, row)
+
+    @classmethod
+    def row_factory(cls, _cursor, row):
+        """sqlite3 row_factory building this record straight from the cursor"""
+        return cls.from_row(row)
+
+
+class SaleLine(_Model, namedtuple('SaleLine', 'record_type ref_id supplier_name item_name gross_weight less_weight '
+                                              'net_weight tunch_percentage wastage_percentage fine_gold sale_date sale_id')):
+    """One line of the 'sales.unified_lines' query (a sale or a purchase)"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        # Hot path for the unified view: sys.intern inlined; supplier/item may be NULL
+        supplier_name, item_name = row[2], row[3]
+        return _new_record(cls, (_sys_intern(row[0]), row[1], supplier_name and _sys_intern(supplier_name),
+                                 item_name and _sys_intern(item_name)) + row[4:])
+
+    def display_values(self):
+        """Child row values for the unified tree"""
+        return (
+            '',  # Type (empty for child items)
+            '',  # Ref ID (empty for child items)
+            '',  # Supplier (empty for child items)
+            self.item_name or 'N/A',
+            f"{self.gross_weight:.2f}",
+            f"{self.less_weight:.2f}",
+            f"{self.net_weight:.2f}",
+            f"{self.tunch_percentage:.1f}%",
+            f"{self.wastage_percentage:.1f}%",
+            f"{self.fine_gold:.2f}",
+            _date(self.sale_date),
+            self.sale_id,
+        )
+
+
+class GroupLine(_Model, namedtuple('GroupLine', 'sale_id supplier_name item_id gross_weight less_weight net_weight '
+                                                'tunch_percentage wastage_percentage fine_gold sale_date item_name')):
+    """One row of the 'sales.group_lines' query, as loaded into the group editors"""
+
+    __slots__ = ()
+
+
+class SaleGroup(_Model, namedtuple('SaleGroup', 'ref_id lines')):
+    """Lines sharing a ref_id, newest first; unpacks as (ref_id, lines)"""
+
+    __slots__ = ()
+
+    @property
+    def record_type(self):
+        return self.lines[0].record_type
+
+    def display_values(self):
+        """Summary row values for the unified tree (totals over the group's lines)"""
+        lines = self.lines
+        first = lines[0]
+        total_fine_gold = sum(line.fine_gold for line in lines)
+        return (
+            first.record_type,
+            self.ref_id,
+            first.supplier_name,
+            f"{len(lines)} items",  # Item count instead of individual item
+            f"{sum(line.gross_weight for line in lines):.2f}",
+            f"{sum(line.less_weight for line in lines):.2f}",
+            f"{sum(line.net_weight for line in lines):.2f}",
+            f"{total_fine_gold:.2f}g",  # Total Fine Gold (combined)
+            f"{len(lines)} entries",  # Wastage column used for entry count
+            f"{total_fine_gold:.2f}",  # Fine Gold (duplicate for display)
+            _date(first.sale_date),
+            '',  # Sale ID (empty for summary row)
+        )
+
+
+class ItemStock(_Model, namedtuple('ItemStock', 'item_id item_name gross_weight less_weight net_weight wastage_percentage')):
+    """One row of the 'items.stock_summary' query"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        return _new_record(cls, (row[0], row[1], float(row[2] or 0), float(row[3] or 0), float(row[4] or 0),
+                                 float(row[5] or 0)))
+
+    def display_values(self):
+        return (
+            self.item_id,
+            self.item_name,
+            f"{self.gross_weight:.3f}",
+            f"{self.less_weight:.3f}",
+            f"{self.net_weight:.3f}",
+            f"{self.wastage_percentage:.2f}",
+        )
+
+
+class Supplier(_Model, namedtuple('Supplier', 'supplier_id supplier_name contact_person phone email address '
+                                              'gst_number status')):
+    """One row of the 'suppliers.list' query"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        return _new_record(cls, row[:7] + (_intern(row[7]),))
+
+    def display_values(self):
+        return tuple(self)
+
+
+class RainiOrder(_Model, namedtuple('RainiOrder', 'raini_id purity_percentage pure_gold_weight impurities_weight '
+                                                  'copper_weight silver_weight total_weight actual_weight created_date '
+                                                  'status')):
+    """One row of the 'raini.orders' query"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        return _new_record(cls, row[:9] + (_intern(row[9]),))
+
+    def display_values(self):
+        return (
+            self.raini_id,
+            f"{self.purity_percentage:.2f}",
+            f"{self.pure_gold_weight:.3f}",
+            f"{self.impurities_weight:.3f}",
+            f"{self.copper_weight:.3f}",
+            f"{self.silver_weight:.3f}",
+            f"{self.total_weight:.3f}",
+            f"{self.actual_weight:.3f}" if self.actual_weight is not None else "N/A",
+            self.created_date,
+            self.status,
+        )
+
+
+class KarigarOrder(_Model, namedtuple('KarigarOrder', 'order_id karigar_name issued_total received_total balance_total '
+                                                      'status created_at')):
+    """One row of the 'karigar.open_orders' query"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_row(cls, row):
+        return _new_record(cls, (row[0], _intern(row[1]), row[2], row[3], row[4], _intern(row[5]), row[6]))
+
+    def display_values(self):
+        return (
+            self.order_id,
+            self.karigar_name or '',
+            f"{(self.issued_total or 0):.2f}",
+            f"{(self.received_total or 0):.2f}",
+            f"{(self.balance_total or 0):.2f}",
+            (self.status or 'pending').capitalize(),
+            self.created_at or '',
+        )
+
+
+class KarigarExposure(_Model, namedtuple('KarigarExposure', 'karigar_name orders issued received outstanding '
+                                                            'ageing items')):
+    """Metal one karigar holds across open orders. ageing is the outstanding balance per
+    exposure.AGE_BUCKETS bucket; items is ((item_name, issued, received), ...) largest balance first"""
+
+    __slots__ = ()
+
+    def display_values(self):
+        return (
+            self.karigar_name or 'N/A',
+            self.orders,
+            f"{self.issued:.2f}",
+            f"{self.received:.2f}",
+            f"{self.outstanding:.2f}",
+        ) + tuple(f"{amount:.2f}" for amount in self.ageing)
+
+    def item_values(self):
+        """Child row values for each item, lined up under display_values()"""
+        return [('', item_name or 'N/A', f"{issued:.2f}", f"{received:.2f}", f"{issued - received:.2f}")
+                + ('',) * len(self.ageing) for item_name, issued, received in self.items]
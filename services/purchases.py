@@ -0,0 +1,13 @@
+"""
+Purchases service module for Gold Jewelry Business Management System
+Purchase groups share the sales table under 'P' ref_ids; saving adds stock and reduces the supplier's balance
+"""
+
+from services.sales import LineGroupService
+
+
+class PurchasesService(LineGroupService):
+    """Purchases: 'P' ref_ids; saving adds stock and subtracts from the supplier's balance"""
+
+    PREFIX = 'P'
+    RECORD_TYPE = 'Purchase'
@@ -0,0 +1,107 @@
+"""
+Raini service module for Gold Jewelry Business Management System
+Raini (gold alloying) orders: creation, completion into Raini stock items, deletion and running totals
+"""
+
+from datetime import datetime
+
+from database import QUERIES
+from migrations import RAINI_TOTALS_FILL
+from services.base import Service
+from services.inventory import purity_label
+from services.models import RainiOrder, iter_models
+from statuses import COMPLETED, PENDING
+
+
+def raini_weights(purity, pure_gold, copper_percent, silver_percent):
+    """Total weight, impurities and the copper/silver split needed to bring pure_gold to purity %"""
+    total_weight = pure_gold / (purity / 100)
+    impurities = total_weight - pure_gold
+    copper_weight = (impurities * copper_percent) / 100 if copper_percent > 0 else 0
+    silver_weight = (impurities * silver_percent) / 100 if silver_percent > 0 else 0
+    return total_weight, impurities, copper_weight, silver_weight
+
+
+def raini_item_name(purity):
+    """Stock item a completed order is added to: 'Raini (75)' for 75.0, 'Raini (91.6)' for 91.6"""
+    label = purity_label(purity)
+    return f"Raini ({label})", label
+
+
+class RainiService(Service):
+    """Raini orders; a completed order's actual weight is added to the matching Raini item.
+    Every order write also applies its change to the raini_totals row in the same transaction.
+    """
+
+    def iter_orders(self):
+        """Lazily yield every (committed) order as a RainiOrder, newest first, from a pooled read connection"""
+        return iter_models(RainiOrder, self.db.iter_read(QUERIES['raini.orders']))
+
+    def totals(self, conn=None):
+        """(completed actual weight, pending order count, pending total weight), from the raini_totals row"""
+        row = self._read_one('raini.totals', conn=conn)
+        return tuple(row) if row else (0.0, 0, 0.0)
+
+    def rebuild_totals(self, conn=None):
+        """Recompute the raini_totals row from the orders, e.g. after rows were written around this
+        service; pass conn to join an open transaction"""
+        if conn is not None:
+            conn.execute(RAINI_TOTALS_FILL)
+            return
+        with self.db.transaction() as conn:
+            conn.execute(RAINI_TOTALS_FILL)
+
+    def create_order(self, purity, pure_gold, copper_percent, silver_percent):
+        """Insert a pending order; returns (raini_id, total_weight)"""
+        total_weight, impurities, copper_weight, silver_weight = raini_weights(
+            purity, pure_gold, copper_percent, silver_percent)
+        with self.db.transaction() as conn:
+            cursor = conn.execute(QUERIES['raini.insert'], (purity, pure_gold, impurities, total_weight,
+                                                            copper_percent, copper_weight, silver_percent, silver_weight))
+            conn.execute(QUERIES['raini.add_totals'], (0.0, 1, total_weight))
+        return cursor.lastrowid, total_weight
+
+    def complete_order(self, raini_id, actual_weight, purity):
+        """Mark an order completed and add its output to the Raini item for its purity
+        (creating the item if needed), in one transaction. Raises LookupError for an unknown order
+        and ValueError for one already completed.
+        """
+        item_name, label = raini_item_name(purity)
+        fine_to_add = actual_weight * (purity / 100.0)
+        with self.db.transaction() as conn:
+            state = conn.execute(QUERIES['raini.order_state'], (raini_id,)).fetchone()
+            if state is None:
+                raise LookupError(f"Raini order {raini_id} not found")
+            status_code, total_weight = state
+            if status_code == COMPLETED:
+                raise ValueError(f"Raini order {raini_id} is already completed")
+            if status_code == PENDING:
+                conn.execute(QUERIES['raini.add_totals'], (actual_weight, -1, -total_weight))
+            else:
+                conn.execute(QUERIES['raini.add_totals'], (actual_weight, 0, 0.0))
+            conn.execute(QUERIES['raini.complete'], (actual_weight, raini_id))
+            existing = conn.execute(QUERIES['items.id_by_name'], (item_name,)).fetchone()
+            if existing:
+                conn.execute(QUERIES['items.adjust_weights'], (fine_to_add, actual_weight, existing[0]))
+            else:
+                conn.execute(QUERIES['items.insert_raini'],
+                             (item_name, f"Raini output {label}%", fine_to_add, actual_weight,
+                              datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+
+    def delete_orders(self, raini_ids):
+        """Delete orders (and detail rows, where a detail table exists); returns the orders deleted"""
+        raini_ids = tuple(raini_ids)
+        if not raini_ids:
+            return 0
+        placeholders = ','.join('?' * len(raini_ids))
+        with self.db.transaction() as conn:
+            completed_weight, pending_count, pending_weight = conn.execute(f"""
+                SELECT COALESCE(SUM(CASE WHEN status_code = {COMPLETED} THEN actual_weight END), 0),
+                       COUNT(CASE WHEN status_code = {PENDING} THEN 1 END),
+                       COALESCE(SUM(CASE WHEN status_code = {PENDING} THEN total_weight END), 0)
+                FROM raini_orders WHERE raini_id IN ({placeholders})
+            """, raini_ids).fetchone()
+            conn.execute(QUERIES['raini.add_totals'], (-completed_weight, -pending_count, -pending_weight))
+            if self.db.table_exists('raini_order_items', conn):
+                conn.execute(f"DELETE FROM raini_order_items WHERE raini_id IN ({placeholders})", raini_ids)
+            return conn.execute(f"DELETE FROM raini_orders WHERE raini_id IN ({placeholders})", raini_ids).rowcount
@@ -0,0 +1,45 @@
+"""
+Reports service module for Gold Jewelry Business Management System
+Data behind each report, as plain rows; formatting stays with ReportsManager
+"""
+
+from datetime import datetime
+
+from services.analytics import AnalyticsCache
+from services.base import Service
+
+
+class ReportsService(Service):
+    """One method per report. Pass conn to run on a pooled read connection (background reports).
+    The summary reports are answered from the analytics cache, with the same rows as the
+    'reports.*' queries; share one cache between services with the analytics argument.
+    """
+
+    def __init__(self, db_manager, analytics=None):
+        super().__init__(db_manager)
+        self.analytics = analytics or AnalyticsCache(db_manager)
+
+    def inventory(self, conn=None):
+        """(gold type, total weight, items, available weight) per gold type"""
+        return self.analytics.inventory_by_gold_type(conn)
+
+    def work_orders(self, conn=None):
+        """(status, count, gold issued) per work order status"""
+        return self.analytics.work_orders_by_status(conn)
+
+    def freelancers(self, conn=None):
+        """(name, orders, gold issued, completed weight, wastage) per active freelancer"""
+        return self.analytics.freelancer_totals(conn)
+
+    def wastage(self, conn=None):
+        """(gold issued, completed weight, wastage) over completed work orders"""
+        return self.analytics.completed_wastage(conn)
+
+    def monthly(self, month=None, conn=None):
+        """(work orders row, inventory row, freelancers row) for month ('YYYY-MM', default this month)"""
+        month = month or datetime.now().strftime("%Y-%m")
+        return self.analytics.month_summary(month, conn)
+
+    def detailed_work_orders(self, conn=None):
+        """Every work order with its freelancer, newest first"""
+        return self._read_all('reports.detailed_work_orders', conn=conn)
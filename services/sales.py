@@ -0,0 +1,226 @@
+"""
+Sales service module for Gold Jewelry Business Management System
+Headless sale-line logic: ref_id numbering, group saves, edits and deletes, and the unified sales/purchase listing
+"""
+
+from datetime import datetime, timedelta
+
+from database import QUERIES, UNIFIED_LINE_FILTERS
+from app_logging import get_logger
+from services.base import Service
+from services.models import GroupLine, SaleGroup, SaleLine
+
+logger = get_logger(__name__)
+
+# Host parameters per `IN (...)` list; stays under SQLite's default limit of 999
+IN_CHUNK_SIZE = 500
+# Stock moves with the ref_id prefix: a purchase adds to stock, a sale removes it.
+# The supplier balance always moves the other way.
+STOCK_SIGNS = {'S': -1, 'P': 1}
+
+
+def line_weights(gross, less, tunch, wastage):
+    """Net weight and fine gold for one line, as entered in the sale/purchase editors"""
+    net_weight = float(gross) - float(less)
+    fine_gold = (net_weight / 100 * float(tunch)) + (net_weight / 100 * float(wastage))
+    return net_weight, fine_gold
+
+
+def _chunks(values, size=IN_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _parse_day(text):
+    """A YYYY-MM-DD filter as a datetime, or None when missing or not a date"""
+    try:
+        return datetime.strptime(text.strip(), '%Y-%m-%d') if text else None
+    except ValueError:
+        return None
+
+
+class LineGroupService(Service):
+    """Lines sharing one ref_id in the sales table; subclasses set the ref_id prefix"""
+
+    PREFIX = None
+    RECORD_TYPE = None
+
+    def next_ref_id(self, session_counter=0, today=None):
+        """Next free ref_id for today (PREFIX + DDMMYY + / + 3 digits) and its number.
+        session_counter is the last number handed out by the caller; numbering continues
+        from whichever is higher, so an editor opened twice doesn't reuse a number.
+        """
+        date_str = (today or datetime.now()).strftime('%d%m%y')
+        max_db_num = 0
+        try:
+            row = self._read_one('sales.last_ref_like', (f"{self.PREFIX}{date_str}/%",))
+            if row and row[0]:
+                max_db_num = int(row[0].split('/')[-1])
+        except Exception as e:
+            logger.error("Error generating ref ID: %s", e)
+        next_num = max(max_db_num, session_counter) + 1
+        ref_id = f"{self.PREFIX}{date_str}/{next_num:03d}"
+
+        # Double-check that this Ref ID doesn't already exist
+        try:
+            if self._read_one('sales.ref_count', (ref_id,))[0] > 0:
+                logger.warning("Ref ID %s already exists! Incrementing...", ref_id)
+                next_num += 1
+                ref_id = f"{self.PREFIX}{date_str}/{next_num:03d}"
+        except Exception as e:
+            logger.error("Error checking Ref ID uniqueness: %s", e)
+        return ref_id, next_num
+
+    def save_group(self, ref_id, supplier_name, lines, line_date=None):
+        """Insert lines [(item_id, gross, less, tunch, wastage), ...] under ref_id and move item
+        stock and the supplier balance, all in one transaction. Returns the number of lines saved.
+        """
+        line_date = line_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        sign = STOCK_SIGNS[self.PREFIX]
+        rows = []
+        stock = {}
+        balance = 0.0
+        for item_id, gross, less, tunch, wastage in lines:
+            net_weight, fine_gold = line_weights(gross, less, tunch, wastage)
+            rows.append((ref_id, supplier_name, item_id, float(gross), float(less), net_weight,
+                         float(tunch), float(wastage), fine_gold, line_date))
+            item_delta = stock.setdefault(item_id, [0.0, 0.0])
+            item_delta[0] += sign * fine_gold
+            item_delta[1] += sign * net_weight
+            balance -= sign * fine_gold
+        if not rows:
+            return 0
+        with self.db.transaction() as conn:
+            conn.executemany(QUERIES['sales.insert_line'], rows)
+            conn.executemany(QUERIES['items.adjust_weights'],
+                             [(fine, net, item_id) for item_id, (fine, net) in stock.items()])
+            conn.execute(QUERIES['suppliers.adjust_balance'], (balance, supplier_name))
+        logger.debug("Saved %s line(s) under %s for %s", len(rows), ref_id, supplier_name)
+        return len(rows)
+
+    def load_group(self, ref_id, conn=None):
+        """Every line of ref_id as {sale_id: GroupLine} in sale_id order, in one read; empty if there is no such group"""
+        return {line.sale_id: line for line in self._read_all('sales.group_lines', (ref_id,), conn, model=GroupLine)}
+
+    def update_group(self, ref_id, original, supplier_name, lines, line_date=None):
+        """Make ref_id hold lines [(sale_id, item_id, gross, less, tunch, wastage), ...] under supplier_name,
+        applied as one delta against original (what load_group returned): lines with a sale_id are
+        updated where they changed, lines with sale_id None are inserted (dated line_date) and original
+        lines left out are deleted. Item stock and supplier balances move by the net difference only,
+        in the same transaction. Returns (updated, inserted, deleted) line counts.
+        """
+        line_date = line_date or datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        sign = STOCK_SIGNS[self.PREFIX]
+        stock = {}
+        balances = {}
+
+        def move(item_id, line_supplier, fine_gold, net_weight, direction):
+            # direction 1 applies a line, -1 reverses it
+            item_delta = stock.setdefault(item_id, [0.0, 0.0])
+            item_delta[0] += direction * sign * (fine_gold or 0)
+            item_delta[1] += direction * sign * (net_weight or 0)
+            balances[line_supplier] = balances.get(line_supplier, 0.0) - direction * sign * (fine_gold or 0)
+
+        updates, inserts, kept = [], [], set()
+        for sale_id, item_id, gross, less, tunch, wastage in lines:
+            net_weight, fine_gold = line_weights(gross, less, tunch, wastage)
+            values = (supplier_name, item_id, float(gross), float(less), net_weight, float(tunch), float(wastage),
+                      fine_gold)
+            if sale_id is None:
+                inserts.append((ref_id,) + values + (line_date,))
+            else:
+                old = original.get(sale_id)
+                if old is None or sale_id in kept:
+                    raise ValueError(f"Line {sale_id} is not in {ref_id} or is listed twice")
+                kept.add(sale_id)
+                if values == tuple(old[1:9]):
+                    continue
+                updates.append(values + (sale_id,))
+                move(old.item_id, old.supplier_name, old.fine_gold, old.net_weight, -1)
+            move(item_id, supplier_name, fine_gold, net_weight, 1)
+        deletes = [(sale_id,) for sale_id in original if sale_id not in kept]
+        for (sale_id,) in deletes:
+            old = original[sale_id]
+            move(old.item_id, old.supplier_name, old.fine_gold, old.net_weight, -1)
+
+        if updates or inserts or deletes:
+            with self.db.transaction() as conn:
+                conn.executemany(QUERIES['sales.update_line'], updates)
+                conn.executemany(QUERIES['sales.insert_line'], inserts)
+                conn.executemany(QUERIES['sales.delete_line'], deletes)
+                conn.executemany(QUERIES['items.adjust_weights'],
+                                 [(fine, net, item_id) for item_id, (fine, net) in stock.items()
+                                  if item_id is not None and (fine or net)])
+                conn.executemany(QUERIES['suppliers.adjust_balance'],
+                                 [(amount, name) for name, amount in balances.items() if amount])
+        logger.debug("Updated %s: %s changed, %s added, %s removed line(s)", ref_id, len(updates), len(inserts),
+                     len(deletes))
+        return len(updates), len(inserts), len(deletes)
+
+    def delete_groups(self, ref_ids):
+        """Delete every line of the given ref_ids (sales or purchases, whatever the subclass) and
+        reverse their effect on item stock and supplier balances, in one transaction.
+        Returns the number of lines deleted.
+        """
+        ref_ids = list(dict.fromkeys(ref_ids))
+        stock = {}
+        balances = {}
+        deleted = 0
+        with self.db.transaction() as conn:
+            for chunk in _chunks(ref_ids):
+                placeholders = ','.join('?' * len(chunk))
+                lines = conn.execute(
+                    f"SELECT ref_id, item_id, fine_gold, net_weight, supplier_name FROM sales WHERE ref_id IN ({placeholders})",
+                    chunk).fetchall()
+                for ref_id, item_id, fine_gold, net_weight, supplier_name in lines:
+                    # Reversing a line moves stock and balance opposite to how saving it did
+                    sign = -STOCK_SIGNS.get(str(ref_id)[:1], 1)
+                    item_delta = stock.setdefault(item_id, [0.0, 0.0])
+                    item_delta[0] += sign * fine_gold
+                    item_delta[1] += sign * net_weight
+                    balances[supplier_name] = balances.get(supplier_name, 0.0) - sign * fine_gold
+                conn.execute(f"DELETE FROM sales WHERE ref_id IN ({placeholders})", chunk)
+                deleted += len(lines)
+            conn.executemany(QUERIES['items.adjust_weights'],
+                             [(fine, net, item_id) for item_id, (fine, net) in stock.items() if item_id is not None])
+            conn.executemany(QUERIES['suppliers.adjust_balance'],
+                             [(amount, name) for name, amount in balances.items()])
+        return deleted
+
+
+class SalesService(LineGroupService):
+    """Sales: 'S' ref_ids; saving removes stock and adds to the supplier's balance"""
+
+    PREFIX = 'S'
+    RECORD_TYPE = 'Sale'
+
+    def unified_groups(self, conn=None, supplier=None, from_date=None, to_date=None):
+        """Sale and purchase lines grouped by ref_id, newest group first: [SaleGroup(ref_id, [SaleLine, ...]), ...].
+        Lines are newest first within a group. Dates are inclusive YYYY-MM-DD days; None filters,
+        and dates that are not YYYY-MM-DD (e.g. an entry's placeholder text), are ignored.
+        """
+        from_day = _parse_day(from_date)
+        to_day = _parse_day(to_date)
+        filters = {
+            'supplier': supplier,
+            'from_date': from_day and from_day.strftime('%Y-%m-%d'),
+            'to_date_next': to_day and (to_day + timedelta(days=1)).strftime('%Y-%m-%d'),
+        }
+        filters = {key: value for key, value in filters.items() if value is not None}
+        query = ' AND '.join([QUERIES['sales.unified_lines'], *(UNIFIED_LINE_FILTERS[key] for key in filters)])
+        grouped_records = {}
+        for record_type, ref_pattern in (('Sale', 'S%'), ('Purchase', 'P%')):
+            params = dict(filters, record_type=record_type, ref_pattern=ref_pattern)
+            if conn is None:
+                lines = self.db.execute_query(query, params, SaleLine.row_factory)
+            else:
+                lines = self.db.read_all(conn, query, params, SaleLine.row_factory)
+            for line in lines:
+                grouped_records.setdefault(line.ref_id, []).append(line)
+        # Newest group first, ties by ref_id (descending)
+        sorted_groups = sorted(grouped_records.items(),
+                               key=lambda x: (max(line.sale_date or '' for line in x[1]), x[0]),
+                               reverse=True)
+        for _ref_id, lines in sorted_groups:
+            lines.sort(key=lambda line: line.sale_date or '', reverse=True)
+        return [SaleGroup(ref_id, lines) for ref_id, lines in sorted_groups]
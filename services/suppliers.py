@@ -0,0 +1,42 @@
+"""
+Suppliers service module for Gold Jewelry Business Management System
+Supplier balances in fine gold grams
+"""
+
+from database import QUERIES
+from services.base import Service
+from services.models import Supplier, iter_models
+
+
+class SuppliersService(Service):
+    """Supplier balances: sales add grams owed to the supplier, purchases subtract them"""
+
+    def iter_suppliers(self):
+        """Lazily yield every supplier as a Supplier, by name"""
+        return iter_models(Supplier, self.db.iter_query(QUERIES['suppliers.list']))
+
+    def balance(self, supplier_name):
+        """Current balance of a supplier (0.0 when unknown)"""
+        row = self._read_one('suppliers.balance', (supplier_name,))
+        return row[0] if row else 0.0
+
+    def line_counts(self, supplier_name):
+        """(sale lines, purchase lines) recorded against a supplier"""
+        return tuple(self._read_one('suppliers.line_counts', (supplier_name,)))
+
+    def delete_with_lines(self, supplier_id, supplier_name):
+        """Delete a supplier with all of its sale and purchase lines, taking their stock back out of
+        (or returning it to) the items, in one transaction. Returns (sales deleted, purchases deleted).
+        """
+        with self.db.transaction() as conn:
+            totals = conn.execute(QUERIES['suppliers.line_totals'], (supplier_name,)).fetchall()
+            # Deleting a line undoes its stock move: subtract what it added
+            conn.executemany(QUERIES['items.adjust_weights'],
+                             [(-fine, -net, item_id) for item_id, fine, net, _, _ in totals if item_id is not None])
+            conn.execute(QUERIES['suppliers.delete_lines'], (supplier_name,))
+            conn.execute(QUERIES['suppliers.delete'], (supplier_id,))
+        return (sum(row[3] for row in totals), sum(row[4] for row in totals))
+
+    def adjust_balance(self, supplier_name, amount):
+        """Add a signed amount of grams to a supplier's balance"""
+        return self.db.update_named('suppliers.adjust_balance', (amount, supplier_name))
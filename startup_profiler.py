@@ -0,0 +1,175 @@
+"""
+Startup profiler module for Gold Jewelry Business Management System
+Records per-module import time and per-phase wall time for `main.py --profile-startup`
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+PROFILE_FLAG = '--profile-startup'
+# Report file written next to the database; each run is appended to its history
+PROFILE_REPORT_NAME = 'startup_profile.json'
+# Runs kept in the report (oldest dropped first)
+PROFILE_HISTORY_LIMIT = 50
+
+
+class _TimedLoader:
+    """Wraps a module loader so exec_module (the module body) is timed"""
+
+    def __init__(self, loader, finder):
+        self._loader = loader
+        self._finder = finder
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._finder.enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._finder.exit(module.__name__)
+
+
+class ImportTimer:
+    """Meta path finder that times every module imported while it is installed.
+    Records inclusive time (the module and everything it imported) and self time.
+    """
+
+    def __init__(self):
+        self.timings = {}  # module -> {'total_ms': ..., 'self_ms': ...}
+        self._stack = []   # [name, start, child_seconds]
+        self._finding = False
+
+    def find_spec(self, fullname, path=None, target=None):
+        if self._finding:
+            return None
+        self._finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, 'find_spec'):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding = False
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def enter(self, name):
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def exit(self, name):
+        _, start, children = self._stack.pop()
+        elapsed = time.perf_counter() - start
+        if self._stack:
+            self._stack[-1][2] += elapsed
+        self.timings[name] = {'total_ms': round(elapsed * 1000, 3),
+                              'self_ms': round((elapsed - children) * 1000, 3)}
+
+    def install(self):
+        sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+class StartupProfiler:
+    """Collects startup phase timings. When disabled every method is a cheap no-op,
+    so call sites don't need to check whether profiling is on.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.phases = []
+        self.import_timer = ImportTimer() if enabled else None
+        self._finished = False
+        if self.import_timer:
+            self.import_timer.install()
+
+    @classmethod
+    def from_argv(cls, argv):
+        """Enable profiling when --profile-startup is on the command line (and strip the flag)"""
+        enabled = PROFILE_FLAG in argv
+        if enabled:
+            argv[:] = [arg for arg in argv if arg != PROFILE_FLAG]
+        return cls(enabled)
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.started) * 1000
+
+    @contextmanager
+    def phase(self, name):
+        """Time a named startup phase"""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.mark(name, start)
+
+    def mark(self, name, start):
+        """Record a phase that began at start (a time.perf_counter() value) and ends now"""
+        if not self.enabled:
+            return
+        end = time.perf_counter()
+        self.phases.append({
+            'phase': name,
+            'start_ms': round((start - self.started) * 1000, 3),
+            'duration_ms': round((end - start) * 1000, 3),
+        })
+
+    def build_report(self):
+        imports = self.import_timer.timings if self.import_timer else {}
+        slowest = sorted(imports.items(), key=lambda kv: kv[1]['total_ms'], reverse=True)
+        return {
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'python': sys.version.split()[0],
+            'platform': sys.platform,
+            'time_to_interactive_ms': round(self.elapsed_ms(), 3),
+            'phases': self.phases,
+            'imports': [dict(module=name, **timing) for name, timing in slowest],
+        }
+
+    def finish(self, db_path):
+        """Stop import timing and append this run's report next to the database.
+        Returns the report path, or None when profiling is off or already finished.
+        """
+        if not self.enabled or self._finished:
+            return None
+        self._finished = True
+        self.import_timer.uninstall()
+        report = self.build_report()
+        report_path = os.path.join(os.path.dirname(os.path.abspath(db_path)), PROFILE_REPORT_NAME)
+        history = []
+        try:
+            with open(report_path, 'r', encoding='utf-8') as f:
+                history = json.load(f).get('runs', [])
+        except (OSError, ValueError):
+            history = []
+        history.append(report)
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump({'runs': history[-PROFILE_HISTORY_LIMIT:]}, f, indent=2)
+
+        print(f"Startup profile: interactive after {report['time_to_interactive_ms']:.1f} ms")
+        for phase in self.phases:
+            print(f"  {phase['phase']:<24}{phase['duration_ms']:>10.1f} ms")
+        for entry in report['imports'][:10]:
+            print(f"  import {entry['module']:<32}{entry['total_ms']:>10.1f} ms")
+        print(f"Startup profile written to: {report_path}")
+        return report_path
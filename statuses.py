@@ -0,0 +1,25 @@
+"""
+Status codes module for Gold Jewelry Business Management System
+Small-integer codes behind the order tables' status text, held in each table's status_code column
+"""
+
+# Codes shared by the order tables
+PENDING = 0
+IN_PROGRESS = 1
+COMPLETED = 2
+CANCELLED = 3
+# raini_orders only: the column default 'Active' (or no status), which the app never writes.
+# Such orders are neither pending nor completed, as when the totals matched 'Pending' exactly
+ACTIVE = 4
+
+# table -> {status text, trimmed and lower-cased: code}; '' stands for NULL. Migration 8 compiles
+# each map into the table's generated status_code column, so writing a status missing from its
+# map fails the column's NOT NULL constraint. Changing a map needs a new migration.
+STATUS_CODES = {
+    'raini_orders': {'': ACTIVE, 'active': ACTIVE, 'pending': PENDING, 'completed': COMPLETED},
+    'karigar_orders': {'': PENDING, 'pending': PENDING, 'in progress': IN_PROGRESS, 'completed': COMPLETED},
+    'work_orders': {'': PENDING, 'issued': PENDING, 'in_progress': IN_PROGRESS, 'completed': COMPLETED,
+                    'cancelled': CANCELLED},
+}
+# Primary key of each table in STATUS_CODES, for reporting rows the maps don't cover
+STATUS_TABLE_IDS = {'raini_orders': 'raini_id', 'karigar_orders': 'order_id', 'work_orders': 'work_order_id'}
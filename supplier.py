@@ -7,6 +7,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from database import DatabaseManager
+from app_logging import get_logger
+
+logger = get_logger(__name__)
 
 class SupplierManager:
     def __init__(self, db_manager, main_app=None):
@@ -36,7 +39,7 @@ class SupplierManager:
                 ORDER BY supplier_name
             '''
             rows = self.db.execute_query(query)
-            print(f"Loaded {len(rows)} suppliers from database")
+            logger.debug("Loaded %s suppliers from database", len(rows))
             
             for row in rows:
                 active = "Yes" if row[7] else "No"
@@ -54,7 +57,7 @@ class SupplierManager:
                 self.suppliers_tree.insert('', 'end', values=values)
                 
         except Exception as e:
-            print(f"Error loading suppliers: {e}")
+            logger.error("Error loading suppliers: %s", e)
             messagebox.showerror("Database Error", f"Error loading suppliers: {str(e)}")
     
     def add_supplier(self, parent_window):
@@ -152,7 +155,7 @@ class SupplierManager:
             address = address_text.get(1.0, tk.END).strip()
             gst_number = gst_entry.get().strip()
             
-            print(f"Attempting to save supplier: {supplier_name}")
+            logger.debug("Attempting to save supplier: %s", supplier_name)
             
             # Validation - only name is required
             if not supplier_name:
@@ -174,23 +177,23 @@ class SupplierManager:
                 '''
                 self.db.execute_update(query, (supplier_name, contact_person, phone, email, address, gst_number))
                 
-                print(f"Supplier '{supplier_name}' saved to database successfully")
+                logger.info("Supplier '%s' saved to database successfully", supplier_name)
                 
                 # Show success message using main app toast
                 if self.main_app:
                     self.main_app.show_toast(f"Supplier '{supplier_name}' added successfully!", success=True)
                 else:
-                    print(f"Supplier '{supplier_name}' added successfully!")
+                    logger.info("Supplier '%s' added successfully!", supplier_name)
                 
                 # Refresh the suppliers list
-                print("Refreshing suppliers list...")
+                logger.debug("Refreshing suppliers list...")
                 self.load_suppliers()
                 
                 # Close the window
                 add_window.destroy()
                 
             except Exception as e:
-                print(f"Database error saving supplier: {e}")
+                logger.error("Database error saving supplier: %s", e)
                 messagebox.showerror("Database Error", f"Error saving supplier: {str(e)}")
         
         def cancel():
@@ -399,7 +402,7 @@ class SupplierManager:
                 if self.main_app:
                     self.main_app.show_toast(f"Supplier '{supplier_name}' updated successfully!", success=True)
                 else:
-                    print(f"Supplier '{supplier_name}' updated successfully!")
+                    logger.info("Supplier '%s' updated successfully!", supplier_name)
                 
                 # Refresh the suppliers list
                 self.load_suppliers()
@@ -433,7 +436,7 @@ class SupplierManager:
                     if self.main_app:
                         self.main_app.show_toast(f"Supplier '{supplier_data[1]}' deleted successfully!", success=True)
                     else:
-                        print(f"Supplier '{supplier_data[1]}' deleted successfully!")
+                        logger.info("Supplier '%s' deleted successfully!", supplier_data[1])
                     
                     # Refresh the suppliers list
                     self.load_suppliers()
@@ -7,6 +7,9 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from database import DatabaseManager
+from app_logging import get_logger
+
+logger = get_logger(__name__)
 
 class WorkOrderManager:
     def __init__(self, db_manager, main_app=None):
@@ -47,7 +50,7 @@ class WorkOrderManager:
                     row[6], row[7], completion_date
                 ))
         except Exception as e:
-            print(f"Error loading work orders: {e}")
+            logger.error("Error loading work orders: %s", e)
             messagebox.showerror("Database Error", f"Error loading work orders: {str(e)}")
     
     def new_work_order(self, parent_window):
@@ -77,8 +80,8 @@ class WorkOrderManager:
         GoldJewelryApp.center_modal(work_window, 600, 750)
         
         # Debug: Print window info
-        print(f"Work order window created: {work_window.winfo_name()}")
-        print(f"Window geometry: {work_window.geometry()}")
+        logger.debug("Work order window created: %s", work_window.winfo_name())
+        logger.debug("Window geometry: %s", work_window.geometry())
         
         # Center the window
         work_window.geometry("+%d+%d" % (parent_window.winfo_rootx() + 50, parent_window.winfo_rooty() + 50))
@@ -88,7 +91,7 @@ class WorkOrderManager:
         main_frame.pack(fill='both', expand=True)
         
         # Debug: Print main frame info
-        print(f"Main frame created and packed")
+        logger.debug("Main frame created and packed")
         
         # Create header frame for title and buttons
         header_frame = ttk.Frame(main_frame)
@@ -104,7 +107,7 @@ class WorkOrderManager:
         button_frame.pack(side='right')
         
         # Debug: Print button frame info
-        print(f"Button frame created and packed")
+        logger.debug("Button frame created and packed")
         
         # Button frame is now in the header
         
@@ -343,7 +346,7 @@ class WorkOrderManager:
                 if self.main_app:
                     self.main_app.show_toast(f"Work order created successfully! • Freelancer: {freelancer_name} • Design: {jewelry_design} • Total Metal: {total_weight:.2f}g • Gold Weight: {required_gold:.2f}g", success=True)
                 else:
-                    print(f"Work order created successfully! Freelancer: {freelancer_name}, Design: {jewelry_design}, Total Metal: {total_weight:.2f} grams, Gold Weight: {required_gold:.2f} grams")
+                    logger.info("Work order created successfully! Freelancer: %s, Design: %s, Total Metal: %.2f grams, Gold Weight: %.2f grams", freelancer_name, jewelry_design, total_weight, required_gold)
                 
                 # Refresh data
                 self.load_work_orders()
@@ -359,23 +362,23 @@ class WorkOrderManager:
             work_window.destroy()
         
         # Create and Cancel buttons in header
-        print("Creating SAVE button...")
+        logger.debug("Creating SAVE button...")
         create_btn = tk.Button(button_frame, text="💾 SAVE", command=create_work_order, 
                              bg="#27ae60", fg="white", font=("Segoe UI", 10, "bold"), 
                              height=2, width=18, relief="raised", bd=2, cursor="hand2")
         create_btn.pack(side='right', padx=(10, 0))
-        print("SAVE button created and packed")
+        logger.debug("SAVE button created and packed")
         
-        print("Creating CANCEL button...")
+        logger.debug("Creating CANCEL button...")
         cancel_btn = tk.Button(button_frame, text="❌ CANCEL", command=cancel, 
                              bg="#e74c3c", fg="white", font=("Segoe UI", 10, "bold"), 
                              height=2, width=18, relief="raised", bd=2, cursor="hand2")
         cancel_btn.pack(side='right')
-        print("CANCEL button created and packed")
+        logger.debug("CANCEL button created and packed")
         
         # Force update the window
         work_window.update()
-        print("Window updated")
+        logger.debug("Window updated")
         
         # Add hover effects
         def on_enter_create(e):
@@ -403,9 +406,9 @@ class WorkOrderManager:
         work_window.bind('<Escape>', lambda e: cancel())
         
         # Final debug and window configuration
-        print("Work order window setup complete")
-        print(f"Button frame children count: {len(button_frame.winfo_children())}")
-        print(f"Main frame children count: {len(main_frame.winfo_children())}")
+        logger.debug("Work order window setup complete")
+        logger.debug("Button frame children count: %s", len(button_frame.winfo_children()))
+        logger.debug("Main frame children count: %s", len(main_frame.winfo_children()))
         
         # Ensure window is visible and properly configured
         work_window.deiconify()
@@ -523,7 +526,7 @@ class WorkOrderManager:
                     if self.main_app:
                         self.main_app.show_toast(f"Work order status updated to: {new_status} • Completion date: {completion_date}", success=True)
                     else:
-                        print(f"Work order status updated to: {new_status}, Completion date: {completion_date}")
+                        logger.debug("Work order status updated to: %s, Completion date: %s", new_status, completion_date)
                 else:
                     # For other statuses, don't set completion date
                     query = '''
@@ -535,7 +538,7 @@ class WorkOrderManager:
                     if self.main_app:
                         self.main_app.show_toast(f"Work order status updated to: {new_status}", success=True)
                     else:
-                        print(f"Work order status updated to: {new_status}")
+                        logger.debug("Work order status updated to: %s", new_status)
                 
                 # Refresh data
                 self.load_work_orders()
@@ -607,7 +610,7 @@ class WorkOrderManager:
             if self.main_app:
                 self.main_app.show_toast("This work order is already completed!", success=False)
             else:
-                print("This work order is already completed!")
+                logger.debug("This work order is already completed!")
             return
         
         # Create completion window
@@ -738,7 +741,7 @@ class WorkOrderManager:
                 if self.main_app:
                     self.main_app.show_toast(f"Work order completed successfully! • Final Weight: {final_weight:.2f}g • Wastage: {wastage_weight:.2f}g • Efficiency: {(final_weight/issued_weight)*100:.1f}%", success=True)
                 else:
-                    print(f"Work order completed successfully! Final Weight: {final_weight:.2f} grams, Wastage: {wastage_weight:.2f} grams, Efficiency: {(final_weight/issued_weight)*100:.1f}%")
+                    logger.info("Work order completed successfully! Final Weight: %.2f grams, Wastage: %.2f grams, Efficiency: %.1f%%", final_weight, wastage_weight, final_weight / issued_weight * 100)
                 
                 # Refresh data
                 self.load_work_orders()
@@ -1098,7 +1101,7 @@ class WorkOrderManager:
                 if self.main_app:
                     self.main_app.show_toast(f"Work order #{work_order_data[0]} deleted successfully!", success=True)
                 else:
-                    print(f"Work order #{work_order_data[0]} deleted successfully!")
+                    logger.info("Work order #%s deleted successfully!", work_order_data[0])
                 
                 # Refresh the work orders list
                 self.load_work_orders()
@@ -1118,19 +1121,19 @@ class WorkOrderManager:
         button_frame.pack(fill='x', pady=(20, 20))
         
         # Delete and Cancel buttons - centered
-        print("Creating DELETE button...")  # Debug print
+        logger.debug("Creating DELETE button...")
         delete_btn = tk.Button(button_frame, text="🗑️ DELETE", command=confirm_delete, 
                              bg="#e74c3c", fg="white", font=("Segoe UI", 10, "bold"), 
                              height=2, width=18, relief="raised", bd=2, cursor="hand2")
         delete_btn.pack(side='left', padx=(0, 10))
-        print("DELETE button created and packed")  # Debug print
+        logger.debug("DELETE button created and packed")
         
-        print("Creating CANCEL button...")  # Debug print
+        logger.debug("Creating CANCEL button...")
         cancel_btn = tk.Button(button_frame, text="❌ CANCEL", command=cancel_delete, 
                              bg="#95a5a6", fg="white", font=("Segoe UI", 10, "bold"), 
                              height=2, width=18, relief="raised", bd=2, cursor="hand2")
         cancel_btn.pack(side='left')
-        print("CANCEL button created and packed")  # Debug print
+        logger.debug("CANCEL button created and packed")
         
         # Center the buttons
         button_frame.pack_configure(anchor='center')
@@ -1160,7 +1163,7 @@ class WorkOrderManager:
         
         # Force update the window to ensure buttons are visible
         confirm_window.update()
-        print("Window updated, buttons should be visible now")  # Debug print
+        logger.debug("Window updated, buttons should be visible now")
         
         # Ensure window is visible and properly configured
         confirm_window.deiconify()